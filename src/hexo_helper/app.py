@@ -1,9 +1,16 @@
 import logging
+from pathlib import Path
 
 import ttkbootstrap as ttkb
 
 import src.hexo_helper.service.modules  # noqa
+from src.hexo_helper.common.component import ServiceRequestProducer, command_bus
+from src.hexo_helper.core.aio import TkAsyncioPump
+from src.hexo_helper.core.event import EventBus
 from src.hexo_helper.core.log import LoggingManager
+from src.hexo_helper.core.metrics import CallTracer
+from src.hexo_helper.core.recorder import EventRecorder
+from src.hexo_helper.core.tk_dispatch import TkDispatcher
 from src.hexo_helper.service.services.blackboard import BlackboardService
 from src.hexo_helper.service.services.command import CommandService
 from src.hexo_helper.service.services.config import ConfigService
@@ -13,10 +20,21 @@ from src.hexo_helper.service.services.resource import ResourceService
 from src.hexo_helper.services_manager import ServiceManager
 from src.hexo_helper.settings import (
     APP_NAME,
+    ASYNCIO_PUMP_INTERVAL_MS,
     CONSOLE_HANDLER_LEVEL,
+    EVENT_RECORD_PATH,
     FILE_HANDLER_LEVEL,
     LOG_FILE_PATH,
+    LOG_MAX_BYTES,
+    LOG_RETENTION_BYTES,
+    LOG_RETENTION_DAYS,
+    LOG_ROLLOVER,
+    LOG_USE_QUEUE,
+    MAIN_THREAD_BATCH_SIZE,
+    MAIN_THREAD_INTERVAL_MS,
     ROOT_LOGGER_LEVEL,
+    SERVICE_TRACING,
+    SERVICE_WORKER_COUNT,
 )
 
 
@@ -27,8 +45,14 @@ class Application:
             ROOT_LOGGER_LEVEL,
             CONSOLE_HANDLER_LEVEL,
             FILE_HANDLER_LEVEL,
+            LOG_USE_QUEUE,
+            rollover=LOG_ROLLOVER,
+            max_bytes=LOG_MAX_BYTES,
+            retention_bytes=LOG_RETENTION_BYTES,
+            retention_days=LOG_RETENTION_DAYS,
         )
         logging_manager.setup()
+        self.logging_manager = logging_manager
         logging.info("Application starting up...")
 
         # create root window
@@ -37,31 +61,51 @@ class Application:
         self.root.minsize(800, 600)
         self.root.title(APP_NAME)
 
-        # build services
-        blackboard_service = BlackboardService()
-        resource_service = ResourceService()
-        log_service = LogService(logging_manager)
-        config_service = ConfigService()
-        module_service = ModuleService(self.root)
-        command_service = CommandService()
+        # asyncio loop, stepped by the Tk mainloop
+        self.async_pump = TkAsyncioPump(self.root, ASYNCIO_PUMP_INTERVAL_MS)
+        command_bus.set_loop(self.async_pump.loop)
+        # coalesced commands are flushed on the Tk loop
+        command_bus.set_scheduler(self.root)
+
+        # events and service results from worker threads are marshalled onto the Tk thread
+        self.main_thread = TkDispatcher(self.root, MAIN_THREAD_BATCH_SIZE, MAIN_THREAD_INTERVAL_MS)
+        EventBus.bind_main_thread(self.main_thread)
+        # opt-in capture of the session's events, for replay in performance tests
+        self.event_recorder = EventRecorder.open(Path(EVENT_RECORD_PATH)) if EVENT_RECORD_PATH else None
+        EventBus.set_recorder(self.event_recorder)
 
         # set services
-        self.service_manager = ServiceManager()
+        tracer = CallTracer() if SERVICE_TRACING else None
+        self.service_manager = ServiceManager(self.main_thread, SERVICE_WORKER_COUNT, tracer)
+        # client calls resolve services through the manager directly
+        ServiceRequestProducer.bind_dispatcher(self.service_manager)
         # register all services to service manager
-        self.service_manager.register(blackboard_service)
-        self.service_manager.register(resource_service)
-        self.service_manager.register(log_service)
-        self.service_manager.register(config_service)
-        self.service_manager.register(module_service)
-        self.service_manager.register(command_service)
+        # eager services are built now, the others are built and started on first request
+        self.service_manager.register_factory(BlackboardService.get_name(), BlackboardService, eager=True)
+        self.service_manager.register_factory(ResourceService.get_name(), ResourceService)
+        self.service_manager.register_factory(
+            LogService.get_name(), lambda: LogService(logging_manager, tracer), eager=True
+        )
+        self.service_manager.register_factory(ConfigService.get_name(), ConfigService, eager=True)
+        self.service_manager.register_factory(ModuleService.get_name(), lambda: ModuleService(self.root), eager=True)
+        self.service_manager.register_factory(CommandService.get_name(), CommandService)
 
         logging.info("Application UI is ready.")
 
     def run(self):
+        self.async_pump.start()
+        self.main_thread.start()
         # start services
         self.service_manager.start_up()
         # run main loop
         self.root.mainloop()
 
         self.service_manager.shutdown()
+        ServiceRequestProducer.unbind_dispatcher(self.service_manager)
+        self.main_thread.stop()
+        self.async_pump.stop()
+        if self.event_recorder is not None:
+            EventBus.set_recorder(None)
+            self.event_recorder.close()
         logging.info("Application shutting down.")
+        self.logging_manager.shutdown()
@@ -1,10 +1,12 @@
-from typing import Any, List
+from concurrent.futures import Future
+from typing import Any, Callable, Iterable, List, NamedTuple, Tuple
 
 from src.hexo_helper.common.constants import EVENT_REQUEST_SERVICE
-from src.hexo_helper.core.event import Consumer, EventBus, Producer
+from src.hexo_helper.core.event import AsyncEventBus, Consumer, EventBus, Producer
 
-service_request_bus = EventBus()
-command_bus = EventBus()
+service_request_bus = EventBus("service")
+# command handlers may be coroutines, run on the asyncio loop pumped by the Tk mainloop
+command_bus = AsyncEventBus(name="command")
 
 
 class ServiceConsumer(Consumer):
@@ -12,15 +14,155 @@ class ServiceConsumer(Consumer):
         super().__init__(service_request_bus)
 
 
+class ServiceResult(NamedTuple):
+    """
+    Result of one request in a batch, either a value or the exception it raised.
+    """
+
+    value: Any = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> Any:
+        """Return the value, or re-raise the captured exception."""
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class OperationHandle:
+    """
+    A service operation resolved once and then called like a plain function.
+    The handle re-resolves itself when the service manager's registrations change.
+    """
+
+    __slots__ = ("service_name", "operation", "_producer", "_dispatcher", "_revision", "_func")
+
+    def __init__(self, producer: "ServiceRequestProducer", service_name: str, operation: str):
+        self.service_name = service_name
+        self.operation = operation
+        self._producer = producer
+        self._dispatcher = None
+        self._revision = None
+        self._func = None
+
+    def __call__(self, **kwargs: Any) -> Any:
+        dispatcher = self._producer._dispatcher
+        if dispatcher is None:
+            # no service manager bound, go through the service request bus
+            return self._producer.call(self.service_name, self.operation, unique_response=True, **kwargs)
+        if dispatcher is not self._dispatcher or dispatcher.revision != self._revision:
+            self._resolve(dispatcher)
+        return self._func(**kwargs)
+
+    def _resolve(self, dispatcher) -> None:
+        self._func = dispatcher.resolve(self.service_name, self.operation)
+        self._dispatcher = dispatcher
+        self._revision = dispatcher.revision
+
+    def invalidate(self) -> None:
+        """Force the handle to resolve again on its next call."""
+        self._dispatcher = None
+        self._func = None
+
+
 class ServiceRequestProducer(Producer):
+    # service manager used for direct dispatch, bound by the application
+    _dispatcher = None
+
     def __init__(self):
         super().__init__(service_request_bus)
 
+    @classmethod
+    def bind_dispatcher(cls, dispatcher) -> None:
+        """
+        Bind the object resolving service names, it must provide `dispatch(name, operation, args)`.
+        """
+        cls._dispatcher = dispatcher
+
+    @classmethod
+    def unbind_dispatcher(cls, dispatcher=None) -> None:
+        """
+        Go back to the service request bus.
+        With a dispatcher, only unbind it if it is still the bound one.
+        """
+        if dispatcher is None or cls._dispatcher is dispatcher:
+            cls._dispatcher = None
+
+    def call_many(self, requests: Iterable[Tuple[str, str, dict | None]]) -> List[ServiceResult]:
+        """
+        Calls several service operations in one dispatch.
+
+        Args:
+            requests: (service_name, operation, args) tuples, args may be None.
+
+        Returns:
+            One ServiceResult per request, in order. A failing request does not stop the others.
+        """
+        dispatcher = self._dispatcher
+        if dispatcher is not None:
+            return dispatcher.dispatch_many(requests)
+
+        results = []
+        for service_name, operation, args in requests:
+            try:
+                results.append(ServiceResult(self._broadcast(service_name, operation, True, args or {})))
+            except Exception as e:
+                results.append(ServiceResult(error=e))
+        return results
+
+    def call_async(
+        self,
+        service_name: str,
+        operation: str,
+        callback: Callable[[Future], Any] | None = None,
+        **kwargs: Any,
+    ) -> Future:
+        """
+        Calls a service operation without blocking the caller.
+
+        Args:
+            service_name: service to call.
+            operation (str): The name of the operation to execute.
+            callback: Called with the finished future on the Tk thread.
+            **kwargs: The arguments for the operation.
+
+        Returns:
+            A future holding the result of the operation.
+        """
+        dispatcher = self._dispatcher
+        if dispatcher is not None:
+            return dispatcher.submit(service_name, operation, kwargs, callback)
+
+        # no service manager bound, run synchronously through the service request bus
+        future = Future()
+        try:
+            future.set_result(self._broadcast(service_name, operation, True, kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        if callback is not None:
+            callback(future)
+        return future
+
+    def handle(self, service_name: str, operation: str) -> OperationHandle:
+        """
+        Resolve a service operation into a callable that can be cached and called with keyword arguments.
+
+        e.g.
+            read = client_api.handle("blackboard", "read")
+            read(key="language")
+        """
+        return OperationHandle(self, service_name, operation)
+
     def call(
         self,
         service_name: str,
         operation: str,
         unique_response: bool = False,
+        broadcast: bool = False,
         **kwargs: Any,
     ) -> Any | List[Any] | None:
         """
@@ -31,12 +173,23 @@ class ServiceRequestProducer(Producer):
             operation (str): The name of the operation to execute.
             unique_response (bool): If True, expects a single result and returns it directly.
                                      Otherwise, returns a list of results.
+            broadcast (bool): If True, emit the request on the service request bus to every subscriber
+                              instead of dispatching it directly to the bound service manager.
             **kwargs: The arguments for the operation.
 
         Returns:
             The result from the service. Can be a single value, a list, or None.
         """
-        # The _send method now directly uses the operation and kwargs
+        dispatcher = self._dispatcher
+        if not broadcast and dispatcher is not None:
+            result = dispatcher.dispatch(service_name, operation, kwargs)
+            if unique_response:
+                return result
+            return [result]
+
+        return self._broadcast(service_name, operation, unique_response, kwargs)
+
+    def _broadcast(self, service_name: str, operation: str, unique_response: bool, kwargs: dict):
         context = {
             "name": service_name,
             "action": {
@@ -69,5 +222,5 @@ class CommandProducer(Producer):
 
 
 class CommandConsumer(Consumer):
-    def __init__(self):
-        super().__init__(command_bus)
+    def __init__(self, weak: bool = False):
+        super().__init__(command_bus, weak)
@@ -9,7 +9,8 @@ from src.hexo_helper.core.mvc.view import View
 class ServiceRequestController(Controller):
     def __init__(self, model: Model | None, view: View | None):
         super().__init__(model, view)
-        self.command_consumer = CommandConsumer()
+        # the command bus is global, weak subscriptions don't keep a closed module alive
+        self.command_consumer = CommandConsumer(weak=True)
 
     @abstractmethod
     def setup_handlers(self):
@@ -3,7 +3,7 @@ from typing import Dict, Optional, Type
 
 from src.hexo_helper.common.constants import ModuleRegistryKey
 from src.hexo_helper.common.controller import ServiceRequestController
-from src.hexo_helper.core.event import EventBus
+from src.hexo_helper.core.event import CoalescePolicy, EventBus
 from src.hexo_helper.core.mvc.controller import Controller
 from src.hexo_helper.core.mvc.model import Model
 from src.hexo_helper.core.mvc.view import View
@@ -60,6 +60,8 @@ class Module:
         self.view: View | None = None
         # C
         self.controller: ServiceRequestController | None = None
+        # V->C
+        self.internal_bus: EventBus | None = None
 
         # tree structure
         self.instance_id = instance_id
@@ -76,6 +78,13 @@ class Module:
         """
         pass
 
+    @classmethod
+    def get_coalesce_policies(cls) -> Dict[str, CoalescePolicy]:
+        """
+        coalescing of bursty UI events on the internal bus, event name -> policy
+        """
+        return {}
+
     @classmethod
     def get_id(cls):
         """
@@ -107,7 +116,13 @@ class Module:
         controller_class: type[ServiceRequestController]
 
         # internal event bus V->C for UI events
-        internal_bus = EventBus()
+        internal_bus = EventBus(self.instance_id)
+        self.internal_bus = internal_bus
+        policies = self.get_coalesce_policies()
+        if policies:
+            internal_bus.set_scheduler(self.master)
+            for event_name, policy in policies.items():
+                internal_bus.set_coalesce_policy(event_name, policy)
 
         # init MVC
         if model_class:
@@ -131,6 +146,10 @@ class Module:
         """
         cleanup module
         """
+        # pending UI events must not reach a destroyed view
+        if self.internal_bus is not None:
+            self.internal_bus.cancel_pending()
+
         # cleanup components
         if self.model is not None:
             self.model.cleanup()
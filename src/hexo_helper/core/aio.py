@@ -0,0 +1,50 @@
+import asyncio
+import logging
+import tkinter as tk
+
+logger = logging.getLogger(__name__)
+
+
+class TkAsyncioPump:
+    """
+    Runs an asyncio event loop inside the Tk mainloop.
+    Every `interval_ms` the loop processes what is ready and gives control back to Tk,
+    so coroutines and Tk callbacks share the main thread.
+    """
+
+    def __init__(self, root: tk.Misc, interval_ms: int = 10, loop: asyncio.AbstractEventLoop | None = None):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.loop = loop or asyncio.new_event_loop()
+        self._after_id = None
+
+    def start(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def _tick(self) -> None:
+        # run one iteration: everything already scheduled, then stop
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self) -> None:
+        """cancel pending tasks and close the loop, call after the Tk mainloop has returned"""
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except tk.TclError:
+                # root already destroyed
+                pass
+            self._after_id = None
+        if self.loop.is_closed():
+            return
+
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        self.loop.close()
+        logger.debug(f"Asyncio loop closed, {len(tasks)} pending tasks cancelled.")
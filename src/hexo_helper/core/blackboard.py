@@ -1,19 +1,108 @@
+import itertools
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from src.hexo_helper.core.utils.compare import deep_equals
+
+logger = logging.getLogger(__name__)
+
+# marks a key that did not exist before a transaction
+_MISSING = object()
+
+
 class Blackboard:
     """
     Blackboard for global configuration
+    Watchers are notified once per `set` / `update`, or once per transaction,
+    with the keys whose value actually changed.
     """
 
     def __init__(self):
         self.data = {}
+        self._lock = threading.RLock()
+        # watch id -> (watched keys or None for all, callback)
+        self._watchers: Dict[int, Tuple[frozenset | None, Callable[[dict], Any]]] = {}
+        self._watch_ids = itertools.count(1)
+        # per thread: key -> value before the current transaction
+        self._local = threading.local()
 
     def get(self, key):
         return self.data.get(key, None)
 
     def set(self, key, value):
-        self.data[key] = value
+        self.update({key: value})
 
     def update(self, data):
-        self.data.update(data)
+        with self._lock:
+            origins = {key: self.data.get(key, _MISSING) for key in data}
+            self.data.update(data)
+
+        transaction = getattr(self._local, "origins", None)
+        if transaction is not None:
+            for key, value in origins.items():
+                transaction.setdefault(key, value)
+            return
+        self._notify(origins)
 
     def clear(self):
+        # not a change of settings, watchers are not notified
         self.data.clear()
+
+    @contextmanager
+    def transaction(self):
+        """
+        batch the notifications of several writes, nested transactions join the outer one
+        """
+        if getattr(self._local, "origins", None) is not None:
+            yield
+            return
+        self._local.origins = {}
+        try:
+            yield
+        finally:
+            origins = self._local.origins
+            self._local.origins = None
+            self._notify(origins)
+
+    def watch(self, keys: Iterable[str] | None, callback: Callable[[dict], Any]) -> int:
+        """
+        @param keys:
+            keys to watch, None for all
+        @param callback:
+            receives {key: new value} of the watched keys that changed
+        @return:
+            watch id, to unwatch
+        """
+        watch_id = next(self._watch_ids)
+        with self._lock:
+            self._watchers[watch_id] = (None if keys is None else frozenset(keys), callback)
+        return watch_id
+
+    def unwatch(self, watch_id: int) -> None:
+        with self._lock:
+            self._watchers.pop(watch_id, None)
+
+    def _notify(self, origins: dict) -> None:
+        if not self._watchers or not origins:
+            return
+        with self._lock:
+            changes = {
+                key: self.data.get(key)
+                for key, origin in origins.items()
+                if origin is _MISSING or not deep_equals(origin, self.data.get(key))
+            }
+            watchers = list(self._watchers.values())
+        if not changes:
+            return
+
+        # callbacks run outside the lock, they may read or write the blackboard
+        for keys, callback in watchers:
+            watched = changes if keys is None else {key: value for key, value in changes.items() if key in keys}
+            if not watched:
+                continue
+            try:
+                callback(watched)
+            except Exception:
+                logger.exception(f"Blackboard watcher {getattr(callback, '__qualname__', callback)!r} failed.")
@@ -0,0 +1,242 @@
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Iterable, Set, Tuple
+
+
+class CachePolicy:
+    def __init__(self, ttl: float | None = None, keys: Callable[..., Iterable[Hashable]] | None = None):
+        """
+        @param ttl:
+            seconds a result stays valid.
+            None keeps it until invalidated, 0 only coalesces concurrent identical calls.
+        @param keys:
+            maps the operation arguments to the invalidation keys of the result
+            e.g. lambda key: (key,)
+        """
+        self.ttl = ttl
+        self.keys = keys
+
+
+def make_cache_key(operation: str, args: dict) -> Hashable | None:
+    """
+    Build a hashable key from an operation and its arguments, None if an argument can't be hashed.
+    """
+    try:
+        key = (operation, tuple(sorted((name, _freeze(value)) for name, value in args.items())))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+class OperationCache:
+    """
+    Result cache with single-flight: concurrent calls with the same key wait for one execution.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> (value, expires at or None)
+        self._entries: Dict[Hashable, Tuple[Any, float | None]] = {}
+        self._in_flight: Dict[Hashable, Future] = {}
+        # invalidation key -> cache keys, of the stored results and of the calls in flight
+        self._by_tag: Dict[Hashable, Set[Hashable]] = defaultdict(set)
+        self._in_flight_by_tag: Dict[Hashable, Set[Hashable]] = defaultdict(set)
+        # bumped on invalidation, results computed across an invalidation are not stored
+        self._generation = 0
+
+    def get_or_call(self, key: Hashable, func: Callable[[], Any], ttl: float | None, tags: Iterable[Hashable] = ()):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    return value
+                del self._entries[key]
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                leader = False
+            else:
+                leader = True
+                future = Future()
+                self._in_flight[key] = future
+                tags = tuple(tags)
+                for tag in tags:
+                    self._in_flight_by_tag[tag].add(key)
+                generation = self._generation
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = func()
+        except BaseException as e:
+            with self._lock:
+                self._release(key, future, tags)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._release(key, future, tags)
+            if ttl != 0 and generation == self._generation:
+                self._entries[key] = (value, None if ttl is None else time.monotonic() + ttl)
+                for tag in tags:
+                    self._by_tag[tag].add(key)
+        future.set_result(value)
+        return value
+
+    def _release(self, key: Hashable, future: Future, tags: Tuple[Hashable, ...]) -> None:
+        """forget a finished call, unless an invalidation detached it already"""
+        if self._in_flight.get(key) is not future:
+            return
+        del self._in_flight[key]
+        for tag in tags:
+            keys = self._in_flight_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._in_flight_by_tag[tag]
+
+    def invalidate(self, tags: Iterable[Hashable]) -> None:
+        """
+        drop the results registered under any of the invalidation keys,
+        calls started before are detached, later callers don't join them
+        """
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in self._by_tag.pop(tag, ()):
+                    self._entries.pop(key, None)
+                for key in self._in_flight_by_tag.pop(tag, ()):
+                    self._in_flight.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_tag.clear()
+            self._in_flight.clear()
+            self._in_flight_by_tag.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class LRUCache:
+    """
+    Least recently used cache bounded by the total size of its values, as measured by `sizeof`.
+    Pinned keys are never evicted and don't count against the budget.
+    """
+
+    def __init__(self, max_bytes: int | None = None, sizeof: Callable[[Any], int] = lambda value: 0):
+        """
+        @param max_bytes:
+            least recently used values are evicted past this total size, None for no bound
+        """
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._lock = threading.Lock()
+        # key -> (value, size), least recently used first
+        self._entries: OrderedDict[Hashable, Tuple[Any, int]] = OrderedDict()
+        self._pinned: Dict[Hashable, Tuple[Any, int]] = {}
+        self._pinned_keys: Set[Hashable] = set()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._pinned.get(key)
+            if entry is None:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._pinned_keys:
+                self._pinned[key] = (value, size)
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                # would evict everything else and still not fit
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self) -> None:
+        if self.max_bytes is None:
+            return
+        while self._bytes > self.max_bytes:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def pin(self, key: Hashable) -> None:
+        """never evict the value of key, cached already or once put"""
+        with self._lock:
+            self._pinned_keys.add(key)
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+                self._pinned[key] = entry
+
+    def unpin(self, key: Hashable) -> None:
+        with self._lock:
+            self._pinned_keys.discard(key)
+            entry = self._pinned.pop(key, None)
+            if entry is not None:
+                # evicted first, an unpinned value is no longer needed
+                self._entries[key] = entry
+                self._entries.move_to_end(key, last=False)
+                self._bytes += entry[1]
+                self._evict()
+
+    def clear(self) -> None:
+        """drop every value, pinned keys stay pinned"""
+        with self._lock:
+            self._entries.clear()
+            self._pinned.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries) + len(self._pinned),
+                "bytes": self._bytes,
+                "pinned_bytes": sum(size for _, size in self._pinned.values()),
+                "max_bytes": self.max_bytes,
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._pinned or key in self._entries
+
+    def __len__(self):
+        return len(self._entries) + len(self._pinned)
@@ -1,35 +1,463 @@
-from collections import defaultdict
-from typing import Any, Callable, List, Tuple
+import asyncio
+import functools
+import inspect
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Callable, Dict, List, Tuple
 
+# returned by a weak callback whose target has been garbage collected
+_DEAD = object()
+# snapshots kept for topics only reached by wildcards, such topics may be dynamic like "worker.progress.<id>"
+_WILDCARD_SNAPSHOT_CACHE_SIZE = 256
+
+
+def _is_bound_method(callback: Callable[..., Any]) -> bool:
+    return hasattr(callback, "__self__") and hasattr(callback, "__func__")
+
+
+def _hold(callback: Callable[..., Any], weak: bool) -> Callable[..., Any]:
+    """
+    Only bound methods are held weakly, their object is owned elsewhere.
+    A lambda, partial or closure is usually only referenced by the bus, held weakly it would be collected at once.
+    """
+    return _WeakCallback(callback) if weak and _is_bound_method(callback) else callback
+
+
+class _WeakCallback:
+    """
+    Holds a bound method weakly through WeakMethod.
+    Compares and hashes like the callback it was created from, so it can be found and unregistered with it.
+    """
+
+    __slots__ = ("_ref", "_hash")
+
+    def __init__(self, callback: Callable[..., Any]):
+        self._ref = weakref.WeakMethod(callback)
+        self._hash = hash(callback)
+
+    def __call__(self, *args, **kwargs):
+        callback = self._ref()
+        if callback is None:
+            return _DEAD
+        return callback(*args, **kwargs)
+
+    def get(self) -> Callable[..., Any] | None:
+        return self._ref()
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if isinstance(other, _WeakCallback):
+            return self._ref == other._ref
+        callback = self._ref()
+        return callback is not None and callback == other
+
+
+class CoalesceMode(Enum):
+    # handlers run once on idle with the arguments of the last emit
+    LATEST = "latest"
+    # handlers run once, delay_ms after the last emit, with its arguments
+    DEBOUNCE = "debounce"
+    # handlers run once on idle with the arguments of the first emit
+    IDLE = "idle"
+
+
+class CoalescePolicy:
+    def __init__(self, mode: CoalesceMode, delay_ms: int = 0):
+        self.mode = mode
+        self.delay_ms = delay_ms
+
+
+def handler_name(callback: Callable[..., Any]) -> str:
+    """readable name of a handler, weak handlers are resolved to their target"""
+    if isinstance(callback, _WeakCallback):
+        callback = callback.get()
+        if callback is None:
+            return "<dead>"
+    return getattr(callback, "__qualname__", repr(callback))
+
+
+class _TopicNode:
+    """node of the wildcard subscription trie, one level per topic segment"""
+
+    __slots__ = ("children", "callbacks")
 
-class EventBus:
     def __init__(self):
-        self._subscribers = defaultdict(list)
+        self.children: Dict[str, "_TopicNode"] = {}
+        # a dict is used as an ordered set
+        self.callbacks: Dict[Callable[..., Any], None] = {}
+
+
+def is_topic_pattern(topic: str) -> bool:
+    """whether a topic contains a `*` (one segment) or `#` (any number of segments) wildcard"""
+    return any(segment in ("*", "#") for segment in topic.split("."))
+
+
+class EventBus:
+    # shared TkDispatcher, emit_threadsafe marshals worker thread events through it
+    _main_thread = None
+    # shared EventRecorder, captures every dispatch of every bus when set
+    _recorder = None
+
+    def __init__(self, name: str | None = None):
+        """
+        @param name:
+            identifies the bus in recordings, so they can be replayed on the same bus
+        """
+        self.name = name
+        # event name -> callbacks, a dict is used as an ordered set
+        self._subscribers: Dict[str, Dict[Callable[..., Any], None]] = {}
+        # wildcard subscriptions, a trie over the dotted topic segments
+        self._trie = _TopicNode()
+        self._patterns: Dict[str, _TopicNode] = {}
+        # event name -> immutable snapshot of the exact and matching wildcard callbacks,
+        # rebuilt on (un)register only
+        self._snapshots: Dict[str, Tuple[Callable[..., Any], ...]] = {}
+        # least recently used snapshots of topics without exact callbacks, compiled on emit
+        self._wildcard_snapshots: OrderedDict[str, Tuple[Callable[..., Any], ...]] = OrderedDict()
+        self._lock = threading.Lock()
+        # coalescing, see set_coalesce_policy
+        self._scheduler = None
+        self._policies: Dict[str, CoalescePolicy] = {}
+        # event name -> (args, kwargs) waiting to be flushed
+        self._pending: Dict[str, Tuple[tuple, dict]] = {}
+        # event name -> after id of the scheduled flush
+        self._scheduled: Dict[str, str] = {}
+
+    @classmethod
+    def bind_main_thread(cls, dispatcher) -> None:
+        """
+        @param dispatcher:
+            a TkDispatcher, or None to emit in the calling thread
+        """
+        EventBus._main_thread = dispatcher
+
+    @classmethod
+    def get_main_thread(cls):
+        """the bound TkDispatcher, None if calls stay in the calling thread"""
+        return EventBus._main_thread
+
+    @classmethod
+    def set_recorder(cls, recorder) -> None:
+        """
+        @param recorder:
+            an EventRecorder, or None to stop recording
+        """
+        EventBus._recorder = recorder
+
+    def set_scheduler(self, scheduler) -> None:
+        """
+        @param scheduler:
+            a Tk widget, coalesced events are flushed through its `after_idle` / `after`
+        """
+        self._scheduler = scheduler
 
-    def register(self, event_name: str, callback: Callable[..., Any]):
-        """Register an event handler for a consumer."""
-        if callback not in self._subscribers[event_name]:
-            self._subscribers[event_name].append(callback)
+    def set_coalesce_policy(self, event_name: str, policy: CoalescePolicy | None) -> None:
+        """
+        Coalesce bursts of an event so the handlers run once per flush, None removes the policy.
+        Needs a scheduler, without one events are emitted immediately.
+        """
+        if policy is None:
+            self._policies.pop(event_name, None)
+            return
+        self._policies[event_name] = policy
+
+    def register(self, event_name: str, callback: Callable[..., Any], weak: bool = False):
+        """
+        Register an event handler for a consumer.
+        Topics are dotted, `*` matches one segment and `#` any number of segments,
+        e.g. "command.#" receives "command.refresh_i18n".
+        A weak registration of a bound method does not keep its object alive,
+        it is dropped once the object has been garbage collected. Other callables are always held strongly.
+        """
+        with self._lock:
+            pattern = is_topic_pattern(event_name)
+            if pattern:
+                callbacks = self._get_pattern_node(event_name).callbacks
+            else:
+                callbacks = self._subscribers.setdefault(event_name, {})
+            if callback in callbacks:
+                return
+            callbacks[_hold(callback, weak)] = None
+            self._rebuild_snapshots(event_name, pattern)
 
     def unregister(self, event_name: str, callback: Callable[..., Any]):
         """Unregister an event handler."""
-        # Use a try-except block to avoid an error if the callback does not exist.
-        try:
-            self._subscribers[event_name].remove(callback)
-        except ValueError:
-            # Optionally, log a warning here that an attempt was made
-            # to unregister a non-existent callback.
-            pass
+        with self._lock:
+            pattern = is_topic_pattern(event_name)
+            if pattern:
+                node = self._patterns.get(event_name)
+                callbacks = node.callbacks if node else None
+            else:
+                callbacks = self._subscribers.get(event_name)
+            if not callbacks or callback not in callbacks:
+                # unregistering a non-existent callback is a no-op
+                return
+            del callbacks[callback]
+            if not callbacks:
+                if pattern:
+                    self._remove_pattern(event_name)
+                else:
+                    del self._subscribers[event_name]
+            self._rebuild_snapshots(event_name, pattern)
+
+    def _get_pattern_node(self, pattern: str) -> _TopicNode:
+        node = self._patterns.get(pattern)
+        if node is not None:
+            return node
+        node = self._trie
+        for segment in pattern.split("."):
+            node = node.children.setdefault(segment, _TopicNode())
+        self._patterns[pattern] = node
+        return node
+
+    def _remove_pattern(self, pattern: str) -> None:
+        """forget a pattern without callbacks and prune the trie nodes left empty"""
+        del self._patterns[pattern]
+        path = [self._trie]
+        segments = pattern.split(".")
+        for segment in segments:
+            path.append(path[-1].children[segment])
+        for index in range(len(segments) - 1, -1, -1):
+            node = path[index + 1]
+            if node.callbacks or node.children:
+                break
+            del path[index].children[segments[index]]
+
+    def _rebuild_snapshots(self, event_name: str, pattern: bool) -> None:
+        if not pattern:
+            self._wildcard_snapshots.pop(event_name, None)
+            if event_name in self._subscribers:
+                self._snapshots[event_name] = self._compile(event_name)
+            else:
+                # only reached by wildcards now, left to the bounded cache
+                self._snapshots.pop(event_name, None)
+            return
+        # a wildcard may match any topic, drop the cached snapshots and rebuild the exact topics
+        snapshots = {}
+        for topic in self._subscribers:
+            snapshots[topic] = self._compile(topic)
+        self._snapshots = snapshots
+        self._wildcard_snapshots.clear()
+
+    def _compile(self, topic: str) -> Tuple[Callable[..., Any], ...]:
+        """exact callbacks first, then the wildcard callbacks matching the topic"""
+        callbacks = dict(self._subscribers.get(topic, {}))
+        if self._patterns:
+            self._match(self._trie, topic.split("."), 0, callbacks)
+        return tuple(callbacks)
+
+    def _match(self, node: _TopicNode, segments: List[str], index: int, out: Dict) -> None:
+        hash_node = node.children.get("#")
+        if hash_node is not None:
+            # "#" consumes zero or more segments
+            for next_index in range(index, len(segments) + 1):
+                self._match(hash_node, segments, next_index, out)
+        if index == len(segments):
+            out.update(node.callbacks)
+            return
+        for key in (segments[index], "*"):
+            child = node.children.get(key)
+            if child is not None:
+                self._match(child, segments, index + 1, out)
+
+    def _lookup(self, event_name: str) -> Tuple[Callable[..., Any], ...]:
+        snapshot = self._snapshots.get(event_name)
+        if snapshot is not None:
+            return snapshot
+        if not self._patterns:
+            return ()
+        # a topic only reached by wildcards, compiled on its first emit and cached within a bound
+        with self._lock:
+            cache = self._wildcard_snapshots
+            snapshot = cache.get(event_name)
+            if snapshot is not None:
+                cache.move_to_end(event_name)
+                return snapshot
+            snapshot = self._compile(event_name)
+            cache[event_name] = snapshot
+            if len(cache) > _WILDCARD_SNAPSHOT_CACHE_SIZE:
+                cache.popitem(last=False)
+        return snapshot
 
     def emit(self, event_name: str, *args, **kwargs):
-        """Producer triggers an event."""
-        # Iterate over a copy of the list to allow unsubscribing within a callback.
+        """
+        Producer triggers an event.
+        Coalesced events are deferred to the next flush and return no results.
+        """
+        if self._policies and self._scheduler is not None and event_name in self._policies:
+            self._coalesce(event_name, args, kwargs)
+            return []
+        return self._dispatch(event_name, args, kwargs)
+
+    def emit_threadsafe(self, event_name: str, *args, **kwargs):
+        """
+        Emit from any thread.
+        Off the Tk thread the event is queued and emitted on the Tk thread later, returning no results.
+        """
+        main_thread = EventBus._main_thread
+        if main_thread is None or main_thread.in_main_thread():
+            return self.emit(event_name, *args, **kwargs)
+        main_thread.post(functools.partial(self.emit, event_name, *args, **kwargs))
+        return []
+
+    def _dispatch(self, event_name: str, args: tuple, kwargs: dict) -> list:
+        recorder = EventBus._recorder
+        if recorder is not None:
+            return recorder.record(self, event_name, args, kwargs, self._run_handlers)
+        return self._run_handlers(event_name, args, kwargs)
+
+    def _run_handlers(self, event_name: str, args: tuple, kwargs: dict, timings: list | None = None) -> list:
+        """
+        @param timings:
+            when given, receives (callback, elapsed seconds) of every handler
+        """
+        # The snapshot is never mutated, so handlers may (un)subscribe while it is iterated.
         results = []
-        for callback in self._subscribers.get(event_name, []):
-            result = callback(*args, **kwargs)
-            if result is not None:
+        has_dead = False
+        for callback in self._lookup(event_name):
+            if timings is None:
+                result = callback(*args, **kwargs)
+            else:
+                begin = time.perf_counter()
+                result = callback(*args, **kwargs)
+                timings.append((callback, time.perf_counter() - begin))
+            if result is None:
                 # if this service do not respond anything, just skip
-                results.append(result)
+                continue
+            if result is _DEAD:
+                has_dead = True
+                continue
+            results.append(result)
+        if has_dead:
+            self._prune(event_name)
+        return results
+
+    def _coalesce(self, event_name: str, args: tuple, kwargs: dict) -> None:
+        policy = self._policies[event_name]
+        scheduled = event_name in self._scheduled
+
+        if policy.mode == CoalesceMode.IDLE:
+            if scheduled:
+                return
+            self._pending[event_name] = (args, kwargs)
+            self._scheduled[event_name] = self._scheduler.after_idle(self._flush, event_name)
+            return
+
+        self._pending[event_name] = (args, kwargs)
+        if policy.mode == CoalesceMode.LATEST:
+            if not scheduled:
+                self._scheduled[event_name] = self._scheduler.after_idle(self._flush, event_name)
+            return
+
+        # debounce: restart the timer
+        if scheduled:
+            self._scheduler.after_cancel(self._scheduled[event_name])
+        self._scheduled[event_name] = self._scheduler.after(policy.delay_ms, self._flush, event_name)
+
+    def _flush(self, event_name: str) -> None:
+        self._scheduled.pop(event_name, None)
+        pending = self._pending.pop(event_name, None)
+        if pending is None:
+            return
+        args, kwargs = pending
+        self._dispatch(event_name, args, kwargs)
+
+    def cancel_pending(self) -> None:
+        """drop coalesced events not flushed yet, call before the scheduler widget is destroyed"""
+        for after_id in self._scheduled.values():
+            self._scheduler.after_cancel(after_id)
+        self._scheduled.clear()
+        self._pending.clear()
+
+    def _prune(self, event_name: str) -> None:
+        """drop weak callbacks whose target has been garbage collected"""
+        with self._lock:
+            exact = self._subscribers.get(event_name)
+            if exact:
+                self._drop_dead(exact)
+                if not exact:
+                    del self._subscribers[event_name]
+            pruned_pattern = False
+            for pattern, node in list(self._patterns.items()):
+                if self._drop_dead(node.callbacks):
+                    pruned_pattern = True
+                    if not node.callbacks:
+                        self._remove_pattern(pattern)
+            self._rebuild_snapshots(event_name, pruned_pattern)
+
+    @staticmethod
+    def _drop_dead(callbacks: Dict) -> bool:
+        dead = [c for c in callbacks if isinstance(c, _WeakCallback) and c.get() is None]
+        for callback in dead:
+            del callbacks[callback]
+        return bool(dead)
+
+    def has_subscribers(self, event_name: str) -> bool:
+        return bool(self._lookup(event_name))
+
+    def subscription_report(self) -> Dict[str, List[str]]:
+        """
+        Live handlers per event, for debugging leaks. Weak handlers are marked with "(weak)".
+        """
+        report = {}
+        subscriptions = list(self._subscribers.items())
+        subscriptions += [(pattern, node.callbacks) for pattern, node in list(self._patterns.items())]
+        for event_name, callbacks in subscriptions:
+            handlers = []
+            for callback in list(callbacks):
+                weak = isinstance(callback, _WeakCallback)
+                target = callback.get() if weak else callback
+                if target is None:
+                    continue
+                name = handler_name(target)
+                handlers.append(f"{name} (weak)" if weak else name)
+            if handlers:
+                report[event_name] = handlers
+        return report
+
+
+class AsyncEventBus(EventBus):
+    """
+    EventBus accepting coroutine handlers.
+    `emit_async` runs sync handlers inline and awaits the coroutine handlers concurrently,
+    `emit` schedules them on the event loop without waiting.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop | None = None, name: str | None = None):
+        super().__init__(name)
+        self.loop = loop
+
+    def set_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+
+    def _dispatch(self, event_name: str, args: tuple, kwargs: dict) -> list:
+        results = []
+        for result in super()._dispatch(event_name, args, kwargs):
+            if inspect.isawaitable(result):
+                asyncio.ensure_future(result, loop=self.loop or asyncio.get_event_loop())
+                continue
+            results.append(result)
+        return results
+
+    async def emit_async(self, event_name: str, *args, **kwargs):
+        """
+        Trigger an event and wait for its coroutine handlers, results of sync handlers come first.
+        The event is never coalesced.
+        """
+        results = []
+        awaitables = []
+        for result in super()._dispatch(event_name, args, kwargs):
+            if inspect.isawaitable(result):
+                awaitables.append(result)
+                continue
+            results.append(result)
+        if awaitables:
+            results.extend(result for result in await asyncio.gather(*awaitables) if result is not None)
         return results
 
 
@@ -40,6 +468,13 @@ class Producer:
     def send_event(self, event_name: str, *args, **kwargs):
         return self.bus.emit(event_name, *args, **kwargs)
 
+    def send_event_threadsafe(self, event_name: str, *args, **kwargs):
+        return self.bus.emit_threadsafe(event_name, *args, **kwargs)
+
+    async def send_event_async(self, event_name: str, *args, **kwargs):
+        """only available on an AsyncEventBus"""
+        return await self.bus.emit_async(event_name, *args, **kwargs)
+
 
 class Consumer:
     """
@@ -48,22 +483,27 @@ class Consumer:
     to unsubscribe from all at once.
     """
 
-    def __init__(self, bus: EventBus):
+    def __init__(self, bus: EventBus, weak: bool = False):
+        """
+        @param weak:
+            subscribe bound methods weakly, the bus will not keep the handlers' owner alive
+            if unsubscribe_all is never called. Other callables are subscribed strongly.
+        """
         self.bus = bus
-        self._subscriptions: List[Tuple[str, Callable]] = []
+        self.weak = weak
+        # (event name, handler) pairs, a dict is used as an ordered set.
+        # Weak handlers are recorded weakly too, a bound method of the owner would form a cycle with it.
+        self._subscriptions: Dict[Tuple[str, Callable], None] = {}
 
     def subscribe(self, event_name: str, handler: Callable[..., Any]):
         """Subscribe to an event and record the subscription."""
-        self.bus.register(event_name, handler)
-        self._subscriptions.append((event_name, handler))
+        self.bus.register(event_name, handler, self.weak)
+        self._subscriptions[(event_name, _hold(handler, self.weak))] = None
 
     def unsubscribe(self, event_name: str, handler: Callable[..., Any]):
         """Unsubscribe from a single event and remove it from the records."""
         self.bus.unregister(event_name, handler)
-        try:
-            self._subscriptions.remove((event_name, handler))
-        except ValueError:
-            pass
+        self._subscriptions.pop((event_name, handler), None)
 
     def unsubscribe_all(self):
         """
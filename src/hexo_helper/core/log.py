@@ -1,7 +1,16 @@
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import List
+
+from src.hexo_helper.core.log_rotation import (
+    ROLLOVER_SIZE,
+    LogRotator,
+    RotatingLogFileHandler,
+)
 
 
 class LoggingManager:
@@ -11,13 +20,38 @@ class LoggingManager:
         root_logger_level: int = logging.DEBUG,
         console_handler_level: int = logging.INFO,
         file_handler_level: int = logging.DEBUG,
+        use_queue: bool = False,
+        rollover: str = ROLLOVER_SIZE,
+        max_bytes: int = 5 * 1024 * 1024,
+        retention_bytes: int | None = 50 * 1024 * 1024,
+        retention_days: float | None = 14,
     ):
+        """
+        @param use_queue:
+            the root logger only enqueues records, console and file handlers run on a listener thread
+        @param rollover:
+            "size" rolls the log file over past max_bytes, "daily" at midnight
+        @param retention_bytes:
+            total size of the compressed rotated logs to keep, None for no limit
+        @param retention_days:
+            age of the rotated logs to keep, None for no limit
+        """
         self.root_logger_level = root_logger_level
         self.console_handler_level = console_handler_level
         self.file_handler_level = file_handler_level
         self.log_file_path = log_file_path
+        self.use_queue = use_queue
+        self.rollover = rollover
+        self.max_bytes = max_bytes
+        self.retention_bytes = retention_bytes
+        self.retention_days = retention_days
         self.log_format = None
         self.root_logger = None
+        # handlers writing the records, attached to the root logger or run by the queue listener
+        self.handlers: List[logging.Handler] = []
+        self.queue_handler: QueueHandler | None = None
+        self.queue_listener: QueueListener | None = None
+        self._listener_lock = threading.Lock()
 
     def setup(self):
         self.log_format = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
@@ -28,6 +62,7 @@ class LoggingManager:
         self._configure_root_logger()
         self._setup_console_handler()
         self._setup_file_handler()
+        self._install_handlers()
         self._setup_exception_hook()
 
     def _configure_root_logger(self):
@@ -37,7 +72,7 @@ class LoggingManager:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(self.console_handler_level)
         console_handler.setFormatter(self.log_format)
-        self.root_logger.addHandler(console_handler)
+        self.handlers.append(console_handler)
 
     def _setup_file_handler(self):
         if not self.log_file_path:
@@ -45,26 +80,66 @@ class LoggingManager:
 
         try:
             self.log_file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_handler = RotatingFileHandler(
+            # rotated files are compressed and pruned in the background
+            rotator = LogRotator(self.log_file_path, self.retention_bytes, self.retention_days)
+            file_handler = RotatingLogFileHandler(
                 self.log_file_path,
-                maxBytes=5 * 1024 * 1024,  # 5 MB
-                backupCount=3,
+                rotator,
+                rollover=self.rollover,
+                max_bytes=self.max_bytes,
                 encoding="utf-8",
             )
             file_handler.setLevel(self.file_handler_level)
             file_handler.setFormatter(self.log_format)
-            self.root_logger.addHandler(file_handler)
+            self.handlers.append(file_handler)
         except Exception:
             # If file config fails, use basicConfig to report the error
             logging.basicConfig()
             logging.exception("Failed to configure file logging.")
 
+    def _install_handlers(self):
+        if not self.use_queue:
+            for handler in self.handlers:
+                self.root_logger.addHandler(handler)
+            return
+
+        log_queue = queue.SimpleQueue()
+        self.queue_handler = QueueHandler(log_queue)
+        self.root_logger.addHandler(self.queue_handler)
+        self.queue_listener = QueueListener(log_queue, *self.handlers, respect_handler_level=True)
+        self.queue_listener.start()
+
+    def flush(self):
+        """
+        write out the records still queued, the listener keeps running afterwards
+        """
+        with self._listener_lock:
+            if self.queue_listener is not None:
+                # stop drains the queue before returning
+                self.queue_listener.stop()
+                self.queue_listener.start()
+        for handler in self.handlers:
+            handler.flush()
+
+    def shutdown(self):
+        """flush and close the handlers, call last"""
+        with self._listener_lock:
+            if self.queue_listener is not None:
+                self.root_logger.removeHandler(self.queue_handler)
+                self.queue_listener.stop()
+                self.queue_listener = None
+        for handler in self.handlers:
+            handler.flush()
+            handler.close()
+
     def _handle_uncaught_exception(self, exc_type, exc_value, exc_traceback):
         if issubclass(exc_type, KeyboardInterrupt):
             sys.__excepthook__(exc_type, exc_value, exc_traceback)
             return
 
         self.root_logger.critical("Uncaught exception:", exc_info=(exc_type, exc_value, exc_traceback))
+        # the process may be about to die, do not leave the record in the queue
+        self.flush()
 
     def _setup_exception_hook(self):
         sys.excepthook = self._handle_uncaught_exception
@@ -0,0 +1,157 @@
+import heapq
+import logging
+from array import array
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Keeps the last `capacity` records in memory, for diagnostics without reading the log file.
+    Records are stored in parallel arrays indexed by sequence number modulo the capacity,
+    logger names are interned once. Sequence numbers are also indexed per level and per logger,
+    so a query only visits the matching records.
+    """
+
+    def __init__(self, capacity: int = 10000, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._levels = array("H", bytes(2 * capacity))
+        self._logger_ids = array("I", bytes(4 * capacity))
+        self._messages: List[str | None] = [None] * capacity
+        # interned logger names
+        self._logger_names: List[str] = []
+        self._logger_name_ids: Dict[str, int] = {}
+        # level / logger id -> sequence numbers of the records, oldest first, pruned lazily
+        self._by_level: Dict[int, Deque[int]] = {}
+        self._by_logger: Dict[int, Deque[int]] = {}
+        # sequence number of the next record
+        self._next = 0
+        self._exception_formatter = logging.Formatter()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = record.getMessage()
+            if record.exc_info:
+                message = f"{message}\n{self._exception_formatter.formatException(record.exc_info)}"
+        except Exception:
+            self.handleError(record)
+            return
+
+        logger_id = self._logger_name_ids.get(record.name)
+        if logger_id is None:
+            logger_id = len(self._logger_names)
+            self._logger_names.append(record.name)
+            self._logger_name_ids[record.name] = logger_id
+
+        sequence = self._next
+        slot = sequence % self.capacity
+        self._times[slot] = record.created
+        self._levels[slot] = record.levelno
+        self._logger_ids[slot] = logger_id
+        self._messages[slot] = message
+        self._by_level.setdefault(record.levelno, deque()).append(sequence)
+        self._by_logger.setdefault(logger_id, deque()).append(sequence)
+        self._next = sequence + 1
+        if sequence % self.capacity == 0:
+            # once per lap, so indexes of levels or loggers that went quiet don't keep evicted records
+            self._prune_all()
+
+    def __len__(self):
+        return min(self._next, self.capacity)
+
+    @property
+    def _oldest(self) -> int:
+        return max(self._next - self.capacity, 0)
+
+    def _live(self, sequences: Deque[int]) -> Deque[int]:
+        oldest = self._oldest
+        while sequences and sequences[0] < oldest:
+            sequences.popleft()
+        return sequences
+
+    def _prune_all(self) -> None:
+        for index in (self._by_level, self._by_logger):
+            for key in list(index):
+                if not self._live(index[key]):
+                    del index[key]
+
+    def query(
+        self,
+        level: int | None = None,
+        logger: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int | None = None,
+    ) -> List[dict]:
+        """
+        Records matching all the given filters, oldest first.
+
+        @param level:
+            minimum level
+        @param logger:
+            logger name, its child loggers included
+        @param since / until:
+            time range of the records, as time.time() timestamps
+        @param limit:
+            only the most recent matching records
+        """
+        self.acquire()
+        try:
+            sequences = self._candidates(level, logger)
+            if since is not None or until is not None:
+                sequences = (s for s in sequences if self._in_range(s, since, until))
+            if limit is not None:
+                sequences = deque(sequences, maxlen=limit)
+            return [self._to_dict(sequence) for sequence in sequences]
+        finally:
+            self.release()
+
+    def _candidates(self, level: int | None, logger: str | None) -> Iterable[int]:
+        by_logger = None
+        if logger is not None:
+            # every logger is a child of the root logger
+            prefix = "" if logger == "root" else f"{logger}."
+            ids = [
+                logger_id
+                for name, logger_id in self._logger_name_ids.items()
+                if name == logger or name.startswith(prefix)
+            ]
+            by_logger = self._merge(self._by_logger, ids)
+        if level is None:
+            return by_logger if by_logger is not None else range(self._oldest, self._next)
+
+        if by_logger is not None:
+            # filter the logger's records, the level array is cheaper than merging level indexes
+            return (s for s in by_logger if self._levels[s % self.capacity] >= level)
+        return self._merge(self._by_level, [key for key in self._by_level if key >= level])
+
+    def _merge(self, index: Dict[int, Deque[int]], keys: List[int]) -> Iterator[int]:
+        # consumed by the query under the handler lock, the deques don't change meanwhile
+        return heapq.merge(*(self._live(index[key]) for key in keys if key in index))
+
+    def _in_range(self, sequence: int, since: float | None, until: float | None) -> bool:
+        created = self._times[sequence % self.capacity]
+        return (since is None or created >= since) and (until is None or created <= until)
+
+    def _to_dict(self, sequence: int) -> dict:
+        slot = sequence % self.capacity
+        return {
+            "time": self._times[slot],
+            "level": logging.getLevelName(self._levels[slot]),
+            "logger": self._logger_names[self._logger_ids[slot]],
+            "message": self._messages[slot],
+        }
+
+    def counts(self) -> Dict[str, int]:
+        """number of buffered records per level"""
+        self.acquire()
+        try:
+            return {
+                logging.getLevelName(level): len(self._live(sequences))
+                for level, sequences in sorted(self._by_level.items())
+                if self._live(sequences)
+            }
+        finally:
+            self.release()
@@ -0,0 +1,205 @@
+import datetime
+import gzip
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from logging.handlers import BaseRotatingHandler
+from pathlib import Path
+from typing import List
+
+ROLLOVER_SIZE = "size"
+ROLLOVER_DAILY = "daily"
+
+# stops the rotator thread
+_STOP = object()
+# "<timestamp>" or "<timestamp>-<n>" for a rollover within the same second
+_STAMP_PATTERN = re.compile(r"(\d{8}-\d{6})(?:-(\d+))?")
+
+
+class LogRotator:
+    """
+    Compresses rotated log files and enforces retention on a background thread,
+    so a rollover only costs the handler a rename.
+    Rotated files are named "<log file>.<timestamp>" and "<log file>.<timestamp>.gz" once compressed.
+    """
+
+    def __init__(self, log_file_path: Path, max_total_bytes: int | None = None, max_age_days: float | None = None):
+        """
+        @param max_total_bytes:
+            rotated files are deleted, oldest first, beyond this total size
+        @param max_age_days:
+            rotated files older than this are deleted
+        """
+        self.log_file_path = log_file_path
+        self.max_total_bytes = max_total_bytes
+        self.max_age_days = max_age_days
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="log-rotator", daemon=True)
+            self._thread.start()
+        # files left uncompressed by a previous run
+        for path in self.rotated_files():
+            if path.suffix != ".gz":
+                self._queue.put(path)
+        self._queue.put(None)
+
+    def submit(self, rotated_path: Path) -> None:
+        """compress a rotated file, then apply retention"""
+        self._queue.put(rotated_path)
+
+    def close(self) -> None:
+        """finish the pending work and stop the thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join()
+
+    def rotated_files(self) -> List[Path]:
+        """rotated files of the log, newest first"""
+        prefix = f"{self.log_file_path.name}."
+        files = [path for path in self.log_file_path.parent.glob(f"{prefix}*") if not path.name.endswith(".tmp")]
+        return sorted(files, key=lambda path: self._age_key(path.name[len(prefix):]))
+
+    @staticmethod
+    def _age_key(suffix: str) -> tuple:
+        """
+        Sorts newest first: timestamped files by their stamp,
+        then legacy "<log file>.<n>" backups (a greater n is older), then anything else.
+        The names are used rather than the mtimes, an mtime changes if a file is copied or touched.
+        """
+        suffix = suffix.removesuffix(".gz")
+        match = _STAMP_PATTERN.fullmatch(suffix)
+        if match:
+            stamp, index = match.groups()
+            return 0, -int(stamp.replace("-", "")), -int(index or 0), ""
+        if suffix.isdigit():
+            return 1, int(suffix), 0, ""
+        return 2, 0, 0, suffix
+
+    def _rotated_at(self, path: Path, stat: os.stat_result) -> float:
+        """time of the rollover, from the name stamp, the mtime for legacy backups"""
+        suffix = path.name[len(self.log_file_path.name) + 1 :].removesuffix(".gz")
+        match = _STAMP_PATTERN.fullmatch(suffix)
+        if match:
+            try:
+                return time.mktime(time.strptime(match.group(1), "%Y%m%d-%H%M%S"))
+            except (ValueError, OverflowError):
+                pass
+        return stat.st_mtime
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            try:
+                if item is not None:
+                    self._compress(item)
+                self.apply_retention()
+            except Exception:
+                # the rotator must survive a failing file, the next rollover retries retention
+                logging.getLogger(__name__).exception("Log rotation failed.")
+
+    @staticmethod
+    def _compress(path: Path) -> None:
+        if not path.exists():
+            return
+        target = path.with_name(f"{path.name}.gz")
+        temp = path.with_name(f"{path.name}.gz.tmp")
+        with open(path, "rb") as source, gzip.open(temp, "wb") as compressed:
+            shutil.copyfileobj(source, compressed)
+        # age retention reads the mtime, keep the one of the rotated file
+        stat = os.stat(path)
+        os.utime(temp, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(temp, target)
+        os.remove(path)
+
+    def apply_retention(self) -> None:
+        now = time.time()
+        total = 0
+        for path in self.rotated_files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            total += stat.st_size
+            too_old = self.max_age_days is not None and now - self._rotated_at(path, stat) > self.max_age_days * 86400
+            too_big = self.max_total_bytes is not None and total > self.max_total_bytes
+            if too_old or too_big:
+                path.unlink(missing_ok=True)
+
+
+class RotatingLogFileHandler(BaseRotatingHandler):
+    """
+    File handler rolling over by size or daily at midnight, the rotated file is handed to a LogRotator.
+    """
+
+    def __init__(
+        self,
+        filename: Path,
+        rotator: LogRotator,
+        rollover: str = ROLLOVER_SIZE,
+        max_bytes: int = 5 * 1024 * 1024,
+        encoding: str = "utf-8",
+    ):
+        if rollover not in (ROLLOVER_SIZE, ROLLOVER_DAILY):
+            raise ValueError(f"Unknown log rollover: {rollover}")
+        super().__init__(filename, "a", encoding=encoding, delay=False)
+        self.rotator = rotator
+        self.rollover = rollover
+        self.max_bytes = max_bytes
+        self.rollover_at = self._next_midnight(self._file_time())
+        rotator.start()
+
+    def _file_time(self) -> float:
+        try:
+            return os.stat(self.baseFilename).st_mtime
+        except OSError:
+            return time.time()
+
+    @staticmethod
+    def _next_midnight(timestamp: float) -> float:
+        day = datetime.date.fromtimestamp(timestamp) + datetime.timedelta(days=1)
+        return datetime.datetime.combine(day, datetime.time.min).timestamp()
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.rollover == ROLLOVER_DAILY:
+            return time.time() >= self.rollover_at
+        if self.stream is None or self.max_bytes <= 0:
+            return False
+        if self.stream.tell() == 0:
+            return False
+        return self.stream.tell() + len(self.format(record)) + 1 >= self.max_bytes
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        now = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+        target = Path(f"{self.baseFilename}.{stamp}")
+        index = 1
+        while target.exists() or target.with_name(f"{target.name}.gz").exists():
+            target = Path(f"{self.baseFilename}.{stamp}-{index}")
+            index += 1
+        if os.path.exists(self.baseFilename):
+            os.replace(self.baseFilename, target)
+            self.rotator.submit(target)
+        self.stream = self._open()
+        self.rollover_at = self._next_midnight(now)
+
+    def close(self) -> None:
+        super().close()
+        self.rotator.close()
@@ -0,0 +1,101 @@
+import mmap
+import os
+from array import array
+from pathlib import Path
+from typing import List, NamedTuple
+
+# bytes read per step while indexing appended data
+_CHUNK_SIZE = 1024 * 1024
+
+
+class TailChange(NamedTuple):
+    # the file was rotated or truncated, lines indexed before are gone
+    reset: bool
+    # complete lines appended since the previous poll
+    added: int
+
+
+class LogTail:
+    """
+    Incremental reader of a growing log file.
+    Each poll only reads the bytes appended since the previous one, to index where lines start.
+    Lines are read by index through a memory map, so any range of a large file is available without loading it.
+    A rotation is detected by the file at the path having another inode, the tail then restarts on the new file.
+    The file is never held open between calls, so it can still be rotated on Windows.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        # (st_dev, st_ino) of the indexed file
+        self._identity: tuple | None = None
+        # byte offset where each complete line starts, the last one is the end of the last complete line
+        self._line_starts = array("Q", [0])
+
+    @property
+    def line_count(self) -> int:
+        return len(self._line_starts) - 1
+
+    @property
+    def _offset(self) -> int:
+        return self._line_starts[-1]
+
+    def poll(self) -> TailChange:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            # rotated away and not recreated yet
+            return TailChange(False, 0)
+
+        reset = False
+        if (stat.st_dev, stat.st_ino) != self._identity or stat.st_size < self._offset:
+            reset = self._identity is not None
+            self._identity = (stat.st_dev, stat.st_ino)
+            self._line_starts = array("Q", [0])
+
+        if stat.st_size <= self._offset:
+            return TailChange(reset, 0)
+        before = self.line_count
+        try:
+            with open(self.path, "rb") as f:
+                if self._is_indexed_file(f):
+                    self._index(f)
+        except FileNotFoundError:
+            pass
+        return TailChange(reset, self.line_count - before)
+
+    def _is_indexed_file(self, f) -> bool:
+        # the path may have been rotated between stat and open, the next poll resets
+        stat = os.fstat(f.fileno())
+        return (stat.st_dev, stat.st_ino) == self._identity
+
+    def _index(self, f) -> None:
+        position = self._offset
+        f.seek(position)
+        while True:
+            chunk = f.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            newline = chunk.find(b"\n")
+            while newline != -1:
+                self._line_starts.append(position + newline + 1)
+                newline = chunk.find(b"\n", newline + 1)
+            position += len(chunk)
+        # a trailing partial line is indexed once its newline is written
+
+    def get_lines(self, start: int, stop: int) -> List[str]:
+        """decoded lines [start, stop) of the indexed lines"""
+        start = max(start, 0)
+        stop = min(stop, self.line_count)
+        if start >= stop:
+            return []
+        try:
+            with open(self.path, "rb") as f:
+                if not self._is_indexed_file(f):
+                    return []
+                with mmap.mmap(f.fileno(), self._line_starts[stop], access=mmap.ACCESS_READ) as mapped:
+                    data = mapped[self._line_starts[start] : self._line_starts[stop]]
+        except (FileNotFoundError, ValueError):
+            # gone, or truncated below the indexed size
+            return []
+        # drop the last newline, and the carriage returns of files written in text mode on Windows
+        return [line.rstrip("\r") for line in data[:-1].decode("utf-8", errors="replace").split("\n")]
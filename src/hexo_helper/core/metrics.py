@@ -0,0 +1,117 @@
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Tuple
+
+# latency bucket upper bounds in seconds, growing by 20% from 1 µs to about 2 minutes
+_BUCKET_BOUNDS: List[float] = []
+_bound = 1e-6
+while _bound < 120:
+    _BUCKET_BOUNDS.append(_bound)
+    _bound *= 1.2
+
+
+class LatencyHistogram:
+    """
+    Call counters and a log-bucketed latency histogram.
+    Counters are plain integers updated without locking, an occasional lost increment
+    under heavy contention is accepted to keep recording cheap.
+    """
+
+    __slots__ = ("count", "errors", "total", "buckets")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        # the extra bucket holds anything slower than the last bound
+        self.buckets = [0] * (len(_BUCKET_BOUNDS) + 1)
+
+    def record(self, elapsed: float, failed: bool = False) -> None:
+        self.count += 1
+        self.total += elapsed
+        if failed:
+            self.errors += 1
+        self.buckets[bisect_left(_BUCKET_BOUNDS, elapsed)] += 1
+
+    def percentile(self, q: float) -> float:
+        """upper bound in seconds of the bucket holding the q-th percentile (0 < q <= 100)"""
+        if not self.count:
+            return 0.0
+        rank = self.count * q / 100
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank:
+                return _BUCKET_BOUNDS[min(index, len(_BUCKET_BOUNDS) - 1)]
+        return _BUCKET_BOUNDS[-1]
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+        }
+
+
+class CallTracer:
+    """
+    Records count, errors and latency per (service, operation).
+    """
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def get_histogram(self, service: str, operation: str) -> LatencyHistogram:
+        key = (service, operation)
+        histogram = self._stats.get(key)
+        if histogram is None:
+            histogram = self._stats.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def trace(self, service: str, operation: str, func: Callable, *args, **kwargs):
+        """call func and record its latency"""
+        histogram = self.get_histogram(service, operation)
+        begin = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            histogram.record(time.perf_counter() - begin, True)
+            raise
+        histogram.record(time.perf_counter() - begin)
+        return result
+
+    def wrap(self, service: str, operation: str, func: Callable) -> Callable:
+        """wrap a resolved operation so every call is recorded"""
+        histogram = self.get_histogram(service, operation)
+
+        def traced(**kwargs):
+            begin = time.perf_counter()
+            try:
+                result = func(**kwargs)
+            except BaseException:
+                histogram.record(time.perf_counter() - begin, True)
+                raise
+            histogram.record(time.perf_counter() - begin)
+            return result
+
+        return traced
+
+    def snapshot(self) -> Dict[str, dict]:
+        """stats keyed by "service.operation", slowest p95 first"""
+        stats = {
+            f"{service}.{operation}": histogram.to_dict()
+            for (service, operation), histogram in list(self._stats.items())
+            if histogram.count
+        }
+        return dict(sorted(stats.items(), key=lambda item: item[1]["p95_ms"], reverse=True))
+
+    def reset(self) -> None:
+        # reset in place, wrapped operations keep their histogram
+        for histogram in list(self._stats.values()):
+            histogram.reset()
@@ -0,0 +1,164 @@
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import IO, Callable, Dict, Iterator, List
+
+from src.hexo_helper.core.event import EventBus, handler_name
+from src.hexo_helper.core.metrics import CallTracer
+
+logger = logging.getLogger(__name__)
+
+
+class EventRecorder:
+    """
+    Captures every dispatch of every EventBus while installed with `EventBus.set_recorder`.
+    Each dispatch is one NDJSON line:
+        {"t": seconds since start, "bus": bus name, "event": name, "args": [...], "kwargs": {...},
+         "depth": nesting level, "handlers": [[handler, microseconds], ...]}
+    Events emitted by a handler are recorded with a greater depth, the replayer skips them.
+    Durations of coroutine handlers only cover creating the coroutine.
+    """
+
+    def __init__(self, stream: IO[str] | None = None, tracer: CallTracer | None = None):
+        """
+        @param stream:
+            text stream the NDJSON lines are written to
+        @param tracer:
+            aggregates handler durations, keyed by (event, handler)
+        """
+        self.stream = stream
+        self.tracer = tracer
+        self._started_at = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def open(cls, path: Path) -> "EventRecorder":
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # line buffered, a crashed session keeps its recording
+        return cls(path.open("w", encoding="utf-8", buffering=1))
+
+    def record(self, bus: EventBus, event_name: str, args: tuple, kwargs: dict, run: Callable) -> list:
+        """run the handlers of a dispatch through `run` and record it"""
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        timestamp = time.perf_counter() - self._started_at
+        timings = []
+        try:
+            return run(event_name, args, kwargs, timings)
+        finally:
+            self._local.depth = depth
+            self._write(bus, event_name, args, kwargs, depth, timestamp, timings)
+
+    def _write(
+        self, bus: EventBus, event_name: str, args: tuple, kwargs: dict, depth: int, timestamp: float, timings: list
+    ) -> None:
+        handlers = [(handler_name(callback), elapsed) for callback, elapsed in timings]
+        if self.tracer is not None:
+            for name, elapsed in handlers:
+                self.tracer.get_histogram(event_name, name).record(elapsed)
+        if self.stream is None:
+            return
+
+        line = json.dumps(
+            {
+                "t": round(timestamp, 6),
+                "bus": bus.name,
+                "event": event_name,
+                "args": args,
+                "kwargs": kwargs,
+                "depth": depth,
+                "handlers": [[name, round(elapsed * 1e6)] for name, elapsed in handlers],
+            },
+            # arguments that are not JSON are kept readable, they replay as strings
+            default=repr,
+            separators=(",", ":"),
+        )
+        with self._lock:
+            self.stream.write(line + "\n")
+
+    def close(self) -> None:
+        if self.stream is not None:
+            self.stream.close()
+
+
+class EventReplayer:
+    """
+    Replays a recording against live buses, usually the module tree of a withdrawn Tk root,
+    and measures the handler durations of the replay.
+    """
+
+    def __init__(self, records: List[dict]):
+        self.records = records
+
+    @classmethod
+    def load(cls, path: Path) -> "EventReplayer":
+        with path.open("r", encoding="utf-8") as f:
+            return cls([json.loads(line) for line in f if line.strip()])
+
+    def top_level_records(self) -> Iterator[dict]:
+        """events emitted by handlers are produced again by the replay itself"""
+        return (record for record in self.records if record["depth"] == 0)
+
+    def replay(
+        self,
+        resolve_bus: Callable[[str], EventBus | None],
+        realtime: bool = False,
+        step: Callable[[], None] | None = None,
+    ) -> Dict[str, dict]:
+        """
+        @param resolve_bus:
+            maps a recorded bus name to its bus, resolved per event since modules come and go during the replay,
+            e.g. ModuleService.resolve_bus for a module tree
+        @param realtime:
+            wait between events as long as in the recording
+        @param step:
+            called after every event, e.g. root.update to run what the handlers scheduled on Tk
+        @return:
+            handler stats keyed by "event.handler", slowest p95 first
+        """
+        tracer = CallTracer()
+        previous = EventBus._recorder
+        EventBus.set_recorder(EventRecorder(tracer=tracer))
+        started_at = time.perf_counter()
+        skipped = 0
+        try:
+            for record in self.top_level_records():
+                bus = resolve_bus(record["bus"]) if record["bus"] is not None else None
+                if bus is None:
+                    skipped += 1
+                    continue
+                if realtime:
+                    delay = record["t"] - (time.perf_counter() - started_at)
+                    if delay > 0:
+                        time.sleep(delay)
+                bus.emit(record["event"], *record["args"], **record["kwargs"])
+                if step is not None:
+                    step()
+        finally:
+            EventBus.set_recorder(previous)
+        if skipped:
+            logger.warning(f"Replay skipped {skipped} events of unknown buses.")
+        return tracer.snapshot()
+
+
+def find_regressions(
+    baseline: Dict[str, dict], current: Dict[str, dict], factor: float = 1.5, min_ms: float = 1.0
+) -> Dict[str, tuple]:
+    """
+    Handlers whose p95 grew by more than `factor` against a baseline replay.
+    Handlers faster than `min_ms` are ignored, their timings are mostly noise.
+
+    @return:
+        "event.handler" -> (baseline p95 ms, current p95 ms)
+    """
+    regressions = {}
+    for key, stats in current.items():
+        before = baseline.get(key)
+        if before is None or stats["p95_ms"] < min_ms:
+            continue
+        if stats["p95_ms"] > before["p95_ms"] * factor:
+            regressions[key] = (before["p95_ms"], stats["p95_ms"])
+    return regressions
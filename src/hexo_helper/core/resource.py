@@ -3,35 +3,53 @@ from pathlib import Path
 
 from PIL import Image
 
+from src.hexo_helper.core.cache import LRUCache
+
 
 class ResourceLoader:
-    def __init__(self, resource_path: Path):
+    def __init__(self, resource_path: Path, cache: LRUCache | None = None):
         self.path = resource_path
-        self._cache = {}
+        self._cache = cache if cache is not None else LRUCache()
 
     @abstractmethod
     def load(self, name):
         pass
 
     def get_from_cache(self, name):
-        return self._cache.get(name, None)
+        return self._cache.get(name)
+
+    def pin(self, name):
+        """keep the resource cached once loaded, whatever the cache budget"""
+        self._cache.pin(name)
+
+    def cache_stats(self) -> dict:
+        return self._cache.stats()
 
     def clear_cache(self):
         self._cache.clear()
 
 
+def image_size(img: Image.Image) -> int:
+    """decoded size of an image in bytes"""
+    return img.width * img.height * len(img.getbands())
+
+
 class ImageResourceLoader(ResourceLoader):
-    def __init__(self, resource_path: Path):
-        super().__init__(resource_path)
+    def __init__(self, resource_path: Path, max_bytes: int | None = None):
+        """
+        @param max_bytes:
+            budget of the decoded images cache, None for no bound
+        """
+        super().__init__(resource_path, LRUCache(max_bytes, image_size))
 
     def load(self, name):
         img = self.get_from_cache(name)
-        if img:
+        if img is not None:
             return img
 
         path = self.path / name
         with Image.open(path) as img:
             img.load()
-            self._cache[name] = img
+            self._cache.put(name, img)
             return img
         # if not found raise exception
@@ -1,7 +1,11 @@
+import copy
 import json
 import logging
+import os
+import threading
+import uuid
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -9,33 +13,282 @@ logger = logging.getLogger(__name__)
 class SettingsManager:
     def __init__(self, path: Path):
         self.settings_path = path
+        # parsed settings and the (mtime_ns, size) of the file they were parsed from,
+        # trusted as long as the file stats are unchanged
+        self._cache: Dict[str, Any] | None = None
+        self._cache_stat: Tuple[int, int] | None = None
+        self._lock = threading.RLock()
 
     def load_settings(self) -> Dict[str, Any]:
-        if self.settings_path is None or not self.settings_path.exists():
+        with self._lock:
+            # a copy, callers may modify it
+            return copy.deepcopy(self._load())
+
+    def _load(self) -> Dict[str, Any]:
+        if self.settings_path is None:
+            return {}
+        try:
+            stat = os.stat(self.settings_path)
+        except FileNotFoundError:
+            self._invalidate()
             return {}
+        except OSError as e:
+            logger.error(f"Error loading settings: {e}. Returning default config.", exc_info=True)
+            return {}
+        if self._cache is not None and (stat.st_mtime_ns, stat.st_size) == self._cache_stat:
+            return self._cache
+
         try:
             with open(self.settings_path, encoding="utf-8") as f:
+                # stats of the file actually read, it may have been replaced since
+                stat = os.fstat(f.fileno())
                 content = f.read()
-                if not content:
-                    logger.warning("Settings file is empty. Returning default config.")
-                    return {}
-                return json.loads(content)
+            if not content:
+                logger.warning("Settings file is empty. Returning default config.")
+                settings = {}
+            else:
+                settings = json.loads(content)
         except (json.JSONDecodeError, OSError) as e:
             logger.error(f"Error loading settings: {e}. Returning default config.", exc_info=True)
+            self._invalidate()
             return {}
+        self._cache = settings
+        self._cache_stat = (stat.st_mtime_ns, stat.st_size)
+        return settings
+
+    def _invalidate(self) -> None:
+        self._cache = None
+        self._cache_stat = None
 
-    def save_settings(self, settings: Dict[str, Any]):
+    def save_settings(self, settings: Dict[str, Any]) -> bool:
+        """@return: whether the settings were written"""
+        return self._write_file(settings)
+
+    def _write_file(self, settings: Dict[str, Any]) -> bool:
+        """@return: whether the settings file was written"""
         if self.settings_path is None:
             logger.error("Cannot save settings, path is not set.")
+            return False
+        with self._lock:
+            temp_path = None
+            try:
+                self.settings_path.parent.mkdir(parents=True, exist_ok=True)
+                # write a temporary file next to the settings and swap it in,
+                # a crash never leaves a truncated settings file
+                path = self.settings_path.with_name(f".{self.settings_path.name}.{uuid.uuid4().hex}.tmp")
+                # created like a plain open would, the kernel applies the umask;
+                # the umask is never read by setting it, that would race with threads creating files
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0), 0o666)
+                temp_path = path
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(settings, f, indent=4, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                # keep the mode of the file being replaced
+                mode = self._existing_file_mode()
+                if mode is not None:
+                    os.chmod(temp_path, mode)
+                os.replace(temp_path, self.settings_path)
+                temp_path = None
+                stat = os.stat(self.settings_path)
+            except OSError:
+                logger.exception("Error saving settings to file.")
+                self._invalidate()
+                if temp_path is not None:
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+                return False
+            self._cache = copy.deepcopy(settings)
+            self._cache_stat = (stat.st_mtime_ns, stat.st_size)
+            return True
+
+    def _existing_file_mode(self) -> int | None:
+        try:
+            return os.stat(self.settings_path).st_mode & 0o7777
+        except FileNotFoundError:
+            return None
+
+    def update_setting(self, data: dict) -> bool:
+        """@return: whether the settings were written"""
+        with self._lock:
+            current_settings = dict(self._load())
+            current_settings.update(data)
+            return self.save_settings(current_settings)
+
+    def close(self) -> None:
+        """release open files, the manager is not used afterwards"""
+        pass
+
+
+class JournaledSettingsManager(SettingsManager):
+    """
+    Settings stored as a snapshot, the regular settings file, plus a journal next to it
+    holding one JSON line per update. An update appends a line instead of rewriting the snapshot.
+    Loading replays the journal onto the snapshot. Once the journal holds more than `max_entries`
+    lines or `max_bytes`, it is compacted into a new snapshot on a background thread.
+    An existing settings file is simply the first snapshot, so switching to this manager needs no migration.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 1000, max_bytes: int = 1 << 20):
+        super().__init__(path)
+        self.journal_path = path.with_suffix(".journal")
+        # journal being compacted, left behind if compaction was interrupted
+        self.compacting_path = path.with_suffix(".journal.old")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._settings: Dict[str, Any] | None = None
+        self._journal = None
+        self._entries = 0
+        self._bytes = 0
+        # the journal ends with a torn line, the next append starts on a new line
+        self._torn_tail = False
+        # guards the in-memory settings and the journal, the snapshot has the base class lock
+        self._journal_lock = threading.Lock()
+        self._compaction: threading.Thread | None = None
+
+    def load_settings(self) -> Dict[str, Any]:
+        with self._journal_lock:
+            return copy.deepcopy(self._get_settings())
+
+    def _get_settings(self) -> Dict[str, Any]:
+        if self._settings is not None:
+            return self._settings
+        with self._lock:
+            settings = dict(super()._load())
+        interrupted = self.compacting_path.exists()
+        damaged = False
+        for path in (self.compacting_path, self.journal_path):
+            damaged = not self._replay(path, settings) or damaged
+        self._settings = settings
+        # finish an interrupted compaction before the rotated journal could be overwritten,
+        # and don't append after corrupt lines
+        if (interrupted or damaged) and self._write_file(settings):
+            self._reset_journal()
+        return settings
+
+    def _replay(self, path: Path, settings: Dict[str, Any]) -> bool:
+        """@return: whether every line of the journal was valid"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return True
+        except OSError:
+            logger.exception(f"Error reading settings journal {path}.")
+            return True
+        valid = True
+        for number, line in enumerate(lines, 1):
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # the last line is torn if the application died while appending it
+                entry = None
+            if not isinstance(entry, dict):
+                logger.warning(f"Skipping corrupt line {number} of settings journal {path}.")
+                valid = False
+                continue
+            settings.update(entry)
+        torn_tail = bool(lines) and not lines[-1].endswith("\n")
+        if path == self.journal_path:
+            self._entries = len(lines)
+            self._bytes = sum(len(line.encode("utf-8")) for line in lines)
+            self._torn_tail = torn_tail
+        return valid and not torn_tail
+
+    def update_setting(self, data: dict) -> bool:
+        """@return: whether the update reached the journal"""
+        line = json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._journal_lock:
+            self._get_settings().update(copy.deepcopy(data))
+            try:
+                if self._journal is None:
+                    self.settings_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._journal = open(self.journal_path, "a", encoding="utf-8")
+                if self._torn_tail:
+                    # the snapshot could not be rewritten, at least keep the new line intact
+                    self._journal.write("\n")
+                    self._torn_tail = False
+                self._journal.write(line)
+                self._journal.flush()
+            except OSError:
+                logger.exception("Error appending to the settings journal.")
+                return False
+            self._entries += 1
+            self._bytes += len(line.encode("utf-8"))
+            if self._entries > self.max_entries or self._bytes > self.max_bytes:
+                self._start_compaction()
+            return True
+
+    def save_settings(self, settings: Dict[str, Any]) -> bool:
+        """replace all settings, written as a new snapshot right away"""
+        with self._journal_lock:
+            self._settings = copy.deepcopy(settings)
+            self._wait_compaction()
+            if not self._write_file(settings):
+                return False
+            self._reset_journal()
+            return True
+
+    def _start_compaction(self) -> None:
+        if self._compaction is not None and self._compaction.is_alive():
+            return
+        # new updates go to a fresh journal while the full one is folded into the snapshot
+        self._close_journal()
+        if not self.compacting_path.exists():
+            try:
+                os.replace(self.journal_path, self.compacting_path)
+            except OSError:
+                logger.exception("Error rotating the settings journal.")
+                return
+            self._entries = 0
+            self._bytes = 0
+        # otherwise a failed compaction left its journal, retry without overwriting it
+        self._compaction = threading.Thread(
+            target=self._compact,
+            args=(copy.deepcopy(self._settings),),
+            name="settings-compaction",
+            daemon=True,
+        )
+        self._compaction.start()
+
+    def _compact(self, settings: Dict[str, Any]) -> None:
+        # the snapshot holds everything up to the rotated journal, which can go once it is written.
+        # Interrupted before that, the rotated journal is replayed on the next load.
+        if not self._write_file(settings):
+            # the rotated journal stays and is replayed on the next load
             return
         try:
-            self.settings_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.settings_path, "w", encoding="utf-8") as f:
-                json.dump(settings, f, indent=4, ensure_ascii=False)
+            os.remove(self.compacting_path)
         except OSError:
-            logger.exception("Error saving settings to file.")
+            logger.exception("Error removing the compacted settings journal.")
+        logger.debug("Settings journal compacted.")
+
+    def _wait_compaction(self) -> None:
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+
+    def _reset_journal(self) -> None:
+        self._close_journal()
+        for path in (self.journal_path, self.compacting_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                logger.exception(f"Error removing settings journal {path}.")
+        self._entries = 0
+        self._bytes = 0
+        self._torn_tail = False
+
+    def _close_journal(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
 
-    def update_setting(self, data: dict) -> None:
-        current_settings = self.load_settings()
-        current_settings.update(data)
-        self.save_settings(current_settings)
+    def close(self) -> None:
+        with self._journal_lock:
+            self._wait_compaction()
+            self._close_journal()
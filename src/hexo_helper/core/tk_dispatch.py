@@ -0,0 +1,89 @@
+import logging
+import queue
+import threading
+import tkinter as tk
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class TkDispatcher:
+    """
+    Marshals calls from worker threads onto the Tk thread.
+    Calls are queued in a lock-free SimpleQueue and drained in batches by a single `root.after` pump,
+    so a burst of calls from workers costs Tk at most `batch_size` callbacks every `interval_ms`.
+    """
+
+    def __init__(self, root: tk.Misc, batch_size: int = 256, interval_ms: int = 16):
+        """
+        @param root:
+            Tk root window, must be created on the thread running the mainloop
+        @param batch_size:
+            calls run per pump tick, the rest waits for the next tick
+        @param interval_ms:
+            pump period, the latency target of a marshalled call
+        """
+        self.root = root
+        self.batch_size = batch_size
+        self.interval_ms = interval_ms
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread_id = threading.get_ident()
+        self._after_id = None
+
+    def in_main_thread(self) -> bool:
+        return threading.get_ident() == self._thread_id
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> None:
+        """run func now if on the Tk thread, otherwise on the next pump tick"""
+        if self.in_main_thread():
+            func(*args, **kwargs)
+            return
+        self._queue.put((func, args, kwargs))
+
+    def post(self, func: Callable[..., Any], *args, **kwargs) -> None:
+        """run func on the next pump tick, from any thread"""
+        self._queue.put((func, args, kwargs))
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def _tick(self) -> None:
+        self.drain(self.batch_size)
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def drain(self, limit: int | None = None) -> int:
+        """
+        Run queued calls on the current thread.
+
+        @param limit:
+            maximum number of calls to run, all queued calls if None
+        @return:
+            number of calls run
+        """
+        done = 0
+        while limit is None or done < limit:
+            try:
+                func, args, kwargs = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            done += 1
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                # one failing call must not stall the rest of the batch
+                logger.exception(f"Marshalled call {getattr(func, '__qualname__', func)!r} failed.")
+        return done
+
+    def stop(self) -> None:
+        """stop the pump and run what is left, call on the Tk thread"""
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except tk.TclError:
+                # root already destroyed
+                pass
+            self._after_id = None
+        self.drain()
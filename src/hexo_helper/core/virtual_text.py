@@ -0,0 +1,87 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import ttk
+from typing import Callable, List
+
+
+class VirtualTextView(ttk.Frame):
+    """
+    Read-only text view over any number of lines, only the visible lines are inserted in the Text widget.
+    Lines are pulled from `get_lines(start, stop)` whenever the view scrolls or resizes.
+    """
+
+    def __init__(self, master, get_lines: Callable[[int, int], List[str]], **text_options):
+        super().__init__(master)
+        self.get_lines = get_lines
+        self.line_count = 0
+        # index of the first visible line
+        self.first = 0
+
+        self.text = tk.Text(self, wrap="none", state="disabled", **text_options)
+        self._linespace = max(tkfont.Font(font=self.text.cget("font")).metrics("linespace"), 1)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        x_scrollbar = ttk.Scrollbar(self, orient="horizontal", command=self.text.xview)
+        self.text.config(xscrollcommand=x_scrollbar.set)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.text.grid(row=0, column=0, sticky="nsew")
+        x_scrollbar.grid(row=1, column=0, sticky="we")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.text.bind("<Configure>", lambda event: self.render())
+        self.text.bind("<MouseWheel>", self._on_mouse_wheel)
+        # X11 reports the wheel as buttons 4 and 5
+        self.text.bind("<Button-4>", lambda event: self.scroll_by(-3) or "break")
+        self.text.bind("<Button-5>", lambda event: self.scroll_by(3) or "break")
+
+    def visible_line_count(self) -> int:
+        return max(self.text.winfo_height() // self._linespace, 1)
+
+    def at_bottom(self) -> bool:
+        return self.first + self.visible_line_count() >= self.line_count
+
+    def set_line_count(self, line_count: int, follow: bool = False) -> None:
+        """
+        @param follow:
+            scroll to the last line
+        """
+        self.line_count = line_count
+        if follow:
+            self.first = line_count - self.visible_line_count()
+        self.render()
+
+    def scroll_to(self, first: int) -> None:
+        self.first = first
+        self.render()
+
+    def scroll_by(self, lines: int) -> None:
+        self.scroll_to(self.first + lines)
+
+    def _on_scrollbar(self, action: str, *args) -> None:
+        visible = self.visible_line_count()
+        if action == "moveto":
+            self.scroll_to(round(float(args[0]) * self.line_count))
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            self.scroll_by(amount * visible if unit == "pages" else amount)
+
+    def _on_mouse_wheel(self, event) -> str:
+        # Windows reports multiples of 120, macOS small deltas
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll_by(-steps * 3)
+        return "break"
+
+    def render(self) -> None:
+        visible = self.visible_line_count()
+        self.first = max(min(self.first, self.line_count - visible), 0)
+        lines = self.get_lines(self.first, self.first + visible)
+
+        self.text.config(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(lines))
+        self.text.config(state="disabled")
+
+        if self.line_count:
+            self.scrollbar.set(self.first / self.line_count, min((self.first + visible) / self.line_count, 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
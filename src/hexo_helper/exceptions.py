@@ -2,6 +2,18 @@ class ServiceNotFoundException(Exception):
     pass
 
 
+class ServiceDependencyException(Exception):
+    pass
+
+
+class ServiceProcessCrashedException(Exception):
+    pass
+
+
+class ServiceProcessTimeoutException(Exception):
+    pass
+
+
 class ModuleInstanceNotFoundException(Exception):
     pass
 
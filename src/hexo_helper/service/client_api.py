@@ -1,4 +1,4 @@
-from typing import Any, Set
+from typing import Any, Callable, Iterable, List, Set
 
 from src.hexo_helper.common.component import ServiceRequestProducer
 from src.hexo_helper.service.enum import ServiceName
@@ -10,31 +10,45 @@ class ClientAPI(ServiceRequestProducer):
     methods for common cross-controller operations.
     """
 
+    def __init__(self):
+        super().__init__()
+        # pre-bound handles for hot operations
+        self._read_setting = self.handle(ServiceName.BLACKBOARD.value, "read")
+        self._read_settings_batch = self.handle(ServiceName.BLACKBOARD.value, "read_batch")
+        self._load_image = self.handle(ServiceName.RESOURCE.value, "load_image")
+
     # --- Blackboard Shortcuts ---
     def read_setting(self, key: str) -> Any:
         """read a setting from the blackboard."""
-        return self.call(
-            service_name=ServiceName.BLACKBOARD.value,
-            operation="read",
-            unique_response=True,
-            key=key,
-        )
+        return self._read_setting(key=key)
 
     def read_settings_batch(self, keys: Set) -> dict:
         """read multiple setting from the blackboard."""
+        return self._read_settings_batch(keys=keys)
+
+    def update_settings(self, data: dict) -> None:
+        """update multiple settings."""
+        self.call(
+            service_name=ServiceName.BLACKBOARD.value,
+            operation="update",
+            data=data,
+        )
+
+    def watch_settings(self, keys: Iterable[str], callback: Callable[[dict], Any]) -> int:
+        """call back with the changed settings among keys, returns the watch id."""
         return self.call(
             service_name=ServiceName.BLACKBOARD.value,
-            operation="read_batch",
+            operation="watch",
             unique_response=True,
             keys=keys,
+            callback=callback,
         )
 
-    def update_settings(self, data: dict) -> None:
-        """update multiple settings."""
+    def unwatch_settings(self, watch_id: int) -> None:
         self.call(
             service_name=ServiceName.BLACKBOARD.value,
-            operation="update",
-            data=data,
+            operation="unwatch",
+            watch_id=watch_id,
         )
 
     # --- Module Shortcuts ---
@@ -58,11 +72,19 @@ class ClientAPI(ServiceRequestProducer):
     # --- Resource Shortcuts ---
     def load_image(self, name: str) -> Any:
         """load an image resource."""
+        return self._load_image(name=name)
+
+    def load_images(self, *names: str) -> List[Any]:
+        """load several image resources in one batch."""
+        results = self.call_many([(ServiceName.RESOURCE.value, "load_image", {"name": name}) for name in names])
+        return [result.unwrap() for result in results]
+
+    def image_cache_stats(self) -> dict:
+        """hits, misses, evictions and size of the decoded images cache."""
         return self.call(
             service_name=ServiceName.RESOURCE.value,
-            operation="load_image",
+            operation="image_cache_stats",
             unique_response=True,
-            name=name,
         )
 
     # --- Config Shortcuts ---
@@ -80,6 +102,41 @@ class ClientAPI(ServiceRequestProducer):
             theme=theme,
         )
 
+    # --- Log Shortcuts ---
+    def dump_service_stats(self) -> dict:
+        """log and return the latency stats of service calls."""
+        return self.call(
+            service_name=ServiceName.LOG.value,
+            operation="dump_service_stats",
+            unique_response=True,
+        )
+
+    def reset_service_stats(self) -> None:
+        self.call(
+            service_name=ServiceName.LOG.value,
+            operation="reset_service_stats",
+        )
+
+    def query_logs(
+        self,
+        level: int | str | None = None,
+        logger_name: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int | None = None,
+    ) -> List[dict]:
+        """recent log records kept in memory, filtered by minimum level, logger and time range."""
+        return self.call(
+            service_name=ServiceName.LOG.value,
+            operation="query_logs",
+            unique_response=True,
+            level=level,
+            logger_name=logger_name,
+            since=since,
+            until=until,
+            limit=limit,
+        )
+
     # --- Command Shortcuts ---
     def command_refresh_i18n(self) -> None:
         self.call(
@@ -4,15 +4,18 @@ from src.hexo_helper.service.enum import ModuleName
 MODULE_MAIN = ModuleName.MAIN.value
 MODULE_MAIN_SETTINGS = f"{MODULE_MAIN}.{ModuleName.SETTINGS.value}"
 MODULE_MAIN_WORKSPACE = f"{MODULE_MAIN}.{ModuleName.WORKSPACE.value}"
+MODULE_MAIN_LOGS = f"{MODULE_MAIN}.{ModuleName.LOGS.value}"
 
-# events
+# events, dotted topics so wildcard subscriptions can select groups of them
 # internal events
-CLOSE_WINDOW_CLICKED = "close_window_clicked"
-MAIN_SETTINGS_CLICKED = "main_settings_clicked"
-MAIN_SETTINGS_LANGUAGE_SELECTED = "main_settings_language_selected"
-MAIN_SETTINGS_THEME_SELECTED = "main_settings_theme_selected"
-MAIN_SETTINGS_APPLY_CLICKED = "main_settings_apply_clicked"
-MAIN_INFO_CLICKED = "main_info_clicked"
+CLOSE_WINDOW_CLICKED = "ui.window.close_clicked"
+MAIN_SETTINGS_CLICKED = "ui.main.settings_clicked"
+MAIN_SETTINGS_LANGUAGE_SELECTED = "ui.main.settings.language_selected"
+MAIN_SETTINGS_THEME_SELECTED = "ui.main.settings.theme_selected"
+MAIN_SETTINGS_APPLY_CLICKED = "ui.main.settings.apply_clicked"
+MAIN_INFO_CLICKED = "ui.main.info_clicked"
+MAIN_LOGS_CLICKED = "ui.main.logs_clicked"
+MAIN_LOGS_FOLLOW_TOGGLED = "ui.main.logs.follow_toggled"
 
 # command module events
-COMMAND_REFRESH_I18N = "command_refresh_i18n"
+COMMAND_REFRESH_I18N = "command.refresh_i18n"
@@ -23,3 +23,4 @@ class ModuleName(Enum):
     MAIN = "main"
     SETTINGS = "settings"
     WORKSPACE = "workspace"
+    LOGS = "logs"
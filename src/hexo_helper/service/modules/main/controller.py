@@ -2,7 +2,10 @@ from src.hexo_helper.common.controller import ServiceRequestController
 from src.hexo_helper.service.client_api import client_api
 from src.hexo_helper.service.constants import (
     CLOSE_WINDOW_CLICKED,
+    COMMAND_REFRESH_I18N,
+    MAIN_LOGS_CLICKED,
     MAIN_SETTINGS_CLICKED,
+    MODULE_MAIN_LOGS,
     MODULE_MAIN_SETTINGS,
 )
 from src.hexo_helper.service.enum import BlackboardKey
@@ -21,18 +24,25 @@ class MainController(ServiceRequestController):
         # UI event
         self.internal_consumer.subscribe(CLOSE_WINDOW_CLICKED, self._on_close)
         self.internal_consumer.subscribe(MAIN_SETTINGS_CLICKED, self._on_settings_click)
+        self.internal_consumer.subscribe(MAIN_LOGS_CLICKED, self._on_logs_click)
+        self.command_consumer.subscribe(COMMAND_REFRESH_I18N, self._refresh_i18n)
 
     def on_ready(self):
         super().on_ready()
         # load images
+        settings_image, info_image, app_image = client_api.load_images("settings.png", "info.png", "app.png")
         self.view.load_images(
             {
-                "settings": client_api.load_image("settings.png"),
-                "info": client_api.load_image("info.png"),
-                "app": client_api.load_image("app.png"),
+                "settings": settings_image,
+                "info": info_image,
+                "app": app_image,
             }
         )
 
+    def cleanup(self):
+        super().cleanup()
+        self.command_consumer.unsubscribe_all()
+
     def _on_close(self):
         client_api.deactivate_module(self.instance_id)
 
@@ -46,3 +56,12 @@ class MainController(ServiceRequestController):
             MODULE_MAIN_SETTINGS,
             self.instance_id,
         )
+
+    def _on_logs_click(self):
+        client_api.activate_module(
+            MODULE_MAIN_LOGS,
+            self.instance_id,
+        )
+
+    def _refresh_i18n(self):
+        self.view.refresh_i18n()
@@ -0,0 +1,3 @@
+from src.hexo_helper.i18n import get_translator
+
+_ = get_translator("modules")
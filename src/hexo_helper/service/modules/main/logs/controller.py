@@ -0,0 +1,68 @@
+import logging
+from pathlib import Path
+
+from src.hexo_helper.common.controller import ServiceRequestController
+from src.hexo_helper.core.log_tail import LogTail
+from src.hexo_helper.service.client_api import client_api
+from src.hexo_helper.service.constants import (
+    CLOSE_WINDOW_CLICKED,
+    COMMAND_REFRESH_I18N,
+    MAIN_LOGS_FOLLOW_TOGGLED,
+)
+from src.hexo_helper.service.modules.main.logs.model import LogsModel
+from src.hexo_helper.service.modules.main.logs.view import LogsView
+from src.hexo_helper.settings import LOG_FILE_PATH, LOG_VIEWER_POLL_MS
+
+logger = logging.getLogger(__name__)
+
+
+class LogsController(ServiceRequestController):
+    model: LogsModel
+    view: LogsView
+
+    def __init__(self, model: LogsModel, view: LogsView) -> None:
+        super().__init__(model, view)
+        self.tail: LogTail | None = None
+        self._after_id = None
+
+    def setup_handlers(self):
+        self.internal_consumer.subscribe(CLOSE_WINDOW_CLICKED, self._on_close)
+        self.internal_consumer.subscribe(MAIN_LOGS_FOLLOW_TOGGLED, self._on_follow_toggled)
+        self.command_consumer.subscribe(COMMAND_REFRESH_I18N, self._refresh_i18n)
+
+    def get_model_data(self):
+        return {
+            "log_file_path": str(LOG_FILE_PATH),
+            "follow": True,
+        }
+
+    def on_ready(self):
+        super().on_ready()
+        self.tail = LogTail(Path(self.model.get("log_file_path")))
+        self.view.get_lines = self.tail.get_lines
+        self._poll()
+
+    def cleanup(self):
+        super().cleanup()
+        self.command_consumer.unsubscribe_all()
+        if self._after_id is not None:
+            self.view.cancel_schedule(self._after_id)
+            self._after_id = None
+
+    def _poll(self):
+        # only the bytes appended since the previous poll are read
+        change = self.tail.poll()
+        if change.reset or change.added:
+            self.view.show_lines(self.tail.line_count, self.model.get("follow"))
+        self._after_id = self.view.schedule(LOG_VIEWER_POLL_MS, self._poll)
+
+    def _on_close(self):
+        client_api.deactivate_module(self.instance_id)
+
+    def _on_follow_toggled(self, follow: bool):
+        self.model.set("follow", follow)
+        if follow:
+            self.view.show_lines(self.tail.line_count, True)
+
+    def _refresh_i18n(self):
+        self.view.refresh_i18n()
@@ -0,0 +1,8 @@
+from src.hexo_helper.core.mvc.model import Model
+
+
+class LogsModel(Model):
+    def __init__(self):
+        self.log_file_path = None
+        # keep the last line in view as lines are appended
+        self.follow = True
@@ -0,0 +1,15 @@
+from src.hexo_helper.common.module import Module, register_module
+from src.hexo_helper.core.mvc.controller import Controller
+from src.hexo_helper.core.mvc.model import Model
+from src.hexo_helper.core.mvc.view import View
+from src.hexo_helper.service.constants import MODULE_MAIN_LOGS
+from src.hexo_helper.service.modules.main.logs.controller import LogsController
+from src.hexo_helper.service.modules.main.logs.model import LogsModel
+from src.hexo_helper.service.modules.main.logs.view import LogsView
+
+
+@register_module(MODULE_MAIN_LOGS, activate_immediately=False)
+class LogsModule(Module):
+    @classmethod
+    def get_mvc(cls) -> tuple[type[Model] | None, type[View] | None, type[Controller] | None]:
+        return LogsModel, LogsView, LogsController
@@ -0,0 +1,110 @@
+import tkinter as tk
+from enum import Enum
+from tkinter import ttk
+from typing import Callable, List
+
+from src.hexo_helper.core.mvc.view import View
+from src.hexo_helper.core.utils.ui import UI
+from src.hexo_helper.core.virtual_text import VirtualTextView
+from src.hexo_helper.core.widget import I18nWidgetManager
+from src.hexo_helper.service.constants import (
+    CLOSE_WINDOW_CLICKED,
+    MAIN_LOGS_FOLLOW_TOGGLED,
+)
+
+from . import _
+
+
+class I18nWidgetsId(Enum):
+    TOPLEVEL_WINDOW = "toplevel_window"
+    FOLLOW_CHECK = "follow_check"
+
+
+class LogsView(View):
+    def __init__(self):
+        super().__init__()
+        self.follow_var = tk.BooleanVar(value=True)
+        # set by the controller, reads lines of the log by index
+        self.get_lines: Callable[[int, int], List[str]] = lambda start, stop: []
+        self.text_view: VirtualTextView | None = None
+
+    def create_widgets(self):
+        """
+        Creates widgets with categorical tags for granular control:
+        - 'container': For layout frames.
+        - 'label': For static text labels.
+        - 'input': For user input fields.
+        - 'i18n': A cross-cutting tag for any widget whose text needs translation.
+        """
+        i18n_map = {
+            I18nWidgetsId.TOPLEVEL_WINDOW.value: "{Logs}",
+            I18nWidgetsId.FOLLOW_CHECK.value: "{Follow}",
+        }
+        self.widgets = I18nWidgetManager(i18n_map, _)
+
+        toplevel_window = tk.Toplevel(self.master.winfo_toplevel())
+        toplevel_window.title(_("Logs"))
+        toplevel_window.geometry("900x500")
+        UI.center_window(toplevel_window)
+        self.widgets.register(
+            toplevel_window, widget_id=I18nWidgetsId.TOPLEVEL_WINDOW.value, tags=["container", "i18n"]
+        )
+        self.window = toplevel_window
+
+        main_frame = ttk.Frame(toplevel_window, padding=10)
+        main_frame.pack(fill="both", expand=True)
+        self.widgets.register(main_frame, tags=["container"])
+
+        # --- Tool Bar ---
+        tool_bar = ttk.Frame(main_frame)
+        tool_bar.pack(fill="x", pady=(0, 5))
+        self.widgets.register(tool_bar, tags=["container"])
+
+        path_label = ttk.Label(tool_bar, text="")
+        path_label.pack(side="left")
+        # the path is not translated
+        self.widgets.register(path_label, widget_id="path_label", tags=["label"])
+
+        follow_check = ttk.Checkbutton(tool_bar, text=_("Follow"), variable=self.follow_var)
+        follow_check.pack(side="right")
+        self.widgets.register(follow_check, widget_id=I18nWidgetsId.FOLLOW_CHECK.value, tags=["input", "i18n"])
+
+        # --- Log Lines ---
+        # only the visible lines are inserted, the log may hold millions
+        text_view = VirtualTextView(main_frame, lambda start, stop: self.get_lines(start, stop), font="TkFixedFont")
+        text_view.pack(fill="both", expand=True)
+        self.widgets.register(text_view, widget_id="text_view", tags=["container"])
+        self.text_view = text_view
+
+        self.widgets.refresh_i18n()
+
+    def setup_bindings(self):
+        """Set up all event bindings here."""
+        toplevel_window = self.widgets.get_by_id(I18nWidgetsId.TOPLEVEL_WINDOW.value)
+        toplevel_window.protocol("WM_DELETE_WINDOW", lambda: self.producer.send_event(CLOSE_WINDOW_CLICKED))
+
+        follow_check = self.widgets.get_by_id(I18nWidgetsId.FOLLOW_CHECK.value)
+        follow_check.config(
+            command=lambda: self.producer.send_event(MAIN_LOGS_FOLLOW_TOGGLED, follow=self.follow_var.get())
+        )
+
+    def init_data(self, model_data: dict) -> None:
+        """Initial data fill using the provided model_data dictionary."""
+        self.widgets.get_by_id("path_label").config(text=model_data.get("log_file_path", ""))
+        self.follow_var.set(model_data.get("follow", True))
+
+    def show_lines(self, line_count: int, follow: bool) -> None:
+        self.text_view.set_line_count(line_count, follow=follow)
+
+    def schedule(self, delay_ms: int, func: Callable[[], None]) -> str:
+        return self.window.after(delay_ms, func)
+
+    def cancel_schedule(self, after_id: str) -> None:
+        self.window.after_cancel(after_id)
+
+    def cleanup(self) -> None:
+        toplevel_window = self.widgets.get_by_id(I18nWidgetsId.TOPLEVEL_WINDOW.value)
+        toplevel_window.destroy()
+
+    def refresh_i18n(self):
+        self.widgets.refresh_i18n()
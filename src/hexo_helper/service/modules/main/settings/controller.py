@@ -69,18 +69,9 @@ class SettingsController(BlackboardMixin, ServiceRequestController):
     def _on_apply_clicked(self):
         dirty_fields = self.model.get_dirty_fields()
         dirty_data = {field: self.model.get(field) for field in dirty_fields}
+        # the config service watches language and theme, it applies them and refreshes i18n
         client_api.update_settings(dirty_data)
 
-        for k, v in dirty_data.items():
-            if k == BlackboardKey.LANGUAGE.value:
-                client_api.config_set_language(v)
-                client_api.command_refresh_i18n()
-                continue
-
-            if k == BlackboardKey.THEME.value:
-                client_api.config_set_theme(v)
-                continue
-
         self.model.apply()
         self.view.clear_dirty()
 
@@ -1,8 +1,15 @@
+from typing import Dict
+
 from src.hexo_helper.common.module import Module, register_module
+from src.hexo_helper.core.event import CoalesceMode, CoalescePolicy
 from src.hexo_helper.core.mvc.controller import Controller
 from src.hexo_helper.core.mvc.model import Model
 from src.hexo_helper.core.mvc.view import View
-from src.hexo_helper.service.constants import MODULE_MAIN_SETTINGS
+from src.hexo_helper.service.constants import (
+    MAIN_SETTINGS_LANGUAGE_SELECTED,
+    MAIN_SETTINGS_THEME_SELECTED,
+    MODULE_MAIN_SETTINGS,
+)
 from src.hexo_helper.service.modules.main.settings.controller import SettingsController
 from src.hexo_helper.service.modules.main.settings.model import SettingsModel
 from src.hexo_helper.service.modules.main.settings.view import SettingsView
@@ -13,3 +20,11 @@ class SettingsModule(Module):
     @classmethod
     def get_mvc(cls) -> tuple[type[Model] | None, type[View] | None, type[Controller] | None]:
         return SettingsModel, SettingsView, SettingsController
+
+    @classmethod
+    def get_coalesce_policies(cls) -> Dict[str, CoalescePolicy]:
+        # scrolling through a combobox selects many values, only the last one matters
+        return {
+            MAIN_SETTINGS_LANGUAGE_SELECTED: CoalescePolicy(CoalesceMode.LATEST),
+            MAIN_SETTINGS_THEME_SELECTED: CoalescePolicy(CoalesceMode.LATEST),
+        }
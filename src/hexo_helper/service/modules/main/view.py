@@ -8,10 +8,13 @@ from src.hexo_helper.core.widget import WidgetManager
 from src.hexo_helper.service.constants import (
     CLOSE_WINDOW_CLICKED,
     MAIN_INFO_CLICKED,
+    MAIN_LOGS_CLICKED,
     MAIN_SETTINGS_CLICKED,
 )
 from src.hexo_helper.service.enum import BlackboardKey
 
+from . import _
+
 
 class MainView(View):
     def __init__(self):
@@ -60,6 +63,10 @@ class MainView(View):
         settings_button.pack(side="right", padx=(0, 5))
         self.widgets.register(settings_button, widget_id="settings_button", tags={"button"})
 
+        logs_button = ttk.Button(title_bar, text=_("Logs"), style="Header.TButton")
+        logs_button.pack(side="right", padx=(0, 5))
+        self.widgets.register(logs_button, widget_id="logs_button", tags={"button", "i18n"})
+
         title_label = ttk.Label(title_bar, text="...", font=("Segoe UI", 16, "bold"))
         title_label.pack(expand=True)
         # This is a label. Its text is dynamic, so we won't tag it 'i18n' for static translation.
@@ -95,5 +102,11 @@ class MainView(View):
         info_button = self.widgets.get_by_id("info_button")
         info_button.config(command=lambda: self.producer.send_event(MAIN_INFO_CLICKED))
 
+        logs_button = self.widgets.get_by_id("logs_button")
+        logs_button.config(command=lambda: self.producer.send_event(MAIN_LOGS_CLICKED))
+
+    def refresh_i18n(self):
+        self.widgets.get_by_id("logs_button").config(text=_("Logs"))
+
     def cleanup(self):
         self.master.destroy()
@@ -1,5 +1,8 @@
 import logging
 from abc import abstractmethod
+from typing import Callable, Hashable
+
+from src.hexo_helper.core.cache import CachePolicy, OperationCache, make_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -7,6 +10,10 @@ logger = logging.getLogger(__name__)
 class Service:
     def __init__(self):
         self._operation_mapping = self._get_operation_mapping()
+        self._thread_safe_operations = frozenset(self._get_thread_safe_operations())
+        self._cache = OperationCache()
+        # operation mapping with cacheable operations wrapped
+        self._operations = self._build_operations(self._get_cache_policies())
         self.name = self.get_name()
         logger.debug(f"Service [{self.name}] initialized")
 
@@ -15,6 +22,20 @@ class Service:
     def get_name(cls):
         raise NotImplementedError(f"Service should have name: {cls.__name__}")
 
+    @classmethod
+    def get_dependencies(cls) -> tuple:
+        """
+        names of the services that must be started before this one
+        """
+        return ()
+
+    @classmethod
+    def can_start_concurrently(cls) -> bool:
+        """
+        whether start() may run on a worker thread, services touching Tk widgets must keep the main thread
+        """
+        return False
+
     @abstractmethod
     def start(self):
         pass
@@ -23,6 +44,48 @@ class Service:
     def _get_operation_mapping(self) -> dict:
         pass
 
+    def _get_thread_safe_operations(self) -> set:
+        """
+        operations that may run on a worker thread, see `ServiceManager.submit`
+        """
+        return set()
+
+    def is_thread_safe(self, operation: str) -> bool:
+        return operation in self._thread_safe_operations
+
+    def _get_cache_policies(self) -> dict:
+        """
+        cacheable operations, mapped to their `CachePolicy`
+        """
+        return {}
+
+    def _build_operations(self, policies: dict) -> dict:
+        operations = dict(self._operation_mapping)
+        for operation, policy in policies.items():
+            operations[operation] = self._wrap_cached(operation, self._operation_mapping[operation], policy)
+        return operations
+
+    def _wrap_cached(self, operation: str, func: Callable, policy: CachePolicy) -> Callable:
+        cache = self._cache
+
+        def cached(**kwargs):
+            key = make_cache_key(operation, kwargs)
+            if key is None:
+                return func(**kwargs)
+            tags = policy.keys(**kwargs) if policy.keys else ()
+            return cache.get_or_call(key, lambda: func(**kwargs), policy.ttl, tags)
+
+        return cached
+
+    def invalidate_cache(self, *keys: Hashable) -> None:
+        """
+        drop cached results registered under the invalidation keys, or all of them if no key is given
+        """
+        if keys:
+            self._cache.invalidate(keys)
+        else:
+            self._cache.clear()
+
     def exec(self, action: dict):
         """
         {
@@ -30,8 +93,19 @@ class Service:
             "args": {xx},
         }
         """
-        args = action.get("args", None) or {}
-        return self._operation_mapping[action["operation"]](**args)
+        return self.call(action["operation"], action.get("args", None))
+
+    def call(self, operation: str, args: dict | None = None):
+        """
+        execute an operation without building an action envelope
+        """
+        return self._operations[operation](**(args or {}))
+
+    def get_operation(self, operation: str):
+        """
+        resolve an operation to its callable, for callers that invoke it repeatedly
+        """
+        return self._operations[operation]
 
     @abstractmethod
     def shutdown(self):
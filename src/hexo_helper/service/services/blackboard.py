@@ -1,11 +1,25 @@
 import copy
-from typing import Set
+import functools
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Set
 
 from src.hexo_helper.core.blackboard import Blackboard
-from src.hexo_helper.core.settings import SettingsManager
+from src.hexo_helper.core.cache import CachePolicy
+from src.hexo_helper.core.event import EventBus
+from src.hexo_helper.core.settings import JournaledSettingsManager, SettingsManager
 from src.hexo_helper.service.enum import ServiceName
 from src.hexo_helper.service.services.base import Service
-from src.hexo_helper.settings import DEFAULT_SETTINGS, SETTINGS_FILE_PATH
+from src.hexo_helper.settings import (
+    DEFAULT_SETTINGS,
+    SETTINGS_BACKEND,
+    SETTINGS_FILE_PATH,
+    SETTINGS_JOURNAL_MAX_BYTES,
+    SETTINGS_JOURNAL_MAX_ENTRIES,
+    SETTINGS_WRITE_BEHIND_DELAY,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class BlackboardService(Service):
@@ -14,16 +28,39 @@ class BlackboardService(Service):
     def get_name(cls):
         return ServiceName.BLACKBOARD.value
 
-    def __init__(self):
+    @classmethod
+    def can_start_concurrently(cls) -> bool:
+        return True
+
+    def __init__(self, write_behind_delay: float | None = SETTINGS_WRITE_BEHIND_DELAY):
+        """
+        @param write_behind_delay:
+            seconds writes are coalesced before the settings file is written on a background thread,
+            None writes the file on every write
+        """
         super().__init__()
         self.blackboard = Blackboard()
-        self.settings_manager = SettingsManager(SETTINGS_FILE_PATH)
+        if SETTINGS_BACKEND == "journal":
+            self.settings_manager = JournaledSettingsManager(
+                SETTINGS_FILE_PATH, SETTINGS_JOURNAL_MAX_ENTRIES, SETTINGS_JOURNAL_MAX_BYTES
+            )
+        else:
+            self.settings_manager = SettingsManager(SETTINGS_FILE_PATH)
+        self.write_behind_delay = write_behind_delay
+        # writes may come from worker threads, keep read-modify-write of the file serialized
+        self._persist_lock = threading.Lock()
+        # write-behind: values not persisted yet, and the timer of the pending flush
+        self._dirty: Dict[str, Any] = {}
+        self._dirty_lock = threading.Lock()
+        self._flush_timer: threading.Timer | None = None
 
     def start(self):
         settings = copy.deepcopy(DEFAULT_SETTINGS)
         user_settings = self.settings_manager.load_settings()
         settings.update(user_settings)
+        # loading is not a change, watchers registered later see the loaded values by reading
         self.blackboard.update(settings)
+        self.invalidate_cache()
 
     def _get_operation_mapping(self) -> dict:
         return {
@@ -31,10 +68,25 @@ class BlackboardService(Service):
             "read_batch": self.read_batch,
             "write": self.write,
             "update": self.update,
+            "watch": self.watch,
+            "unwatch": self.unwatch,
+            "flush": self.flush,
+        }
+
+    def _get_thread_safe_operations(self) -> set:
+        return {"read", "read_batch", "write", "update", "flush"}
+
+    def _get_cache_policies(self) -> dict:
+        return {
+            "read": CachePolicy(keys=lambda key: (key,)),
         }
 
     def shutdown(self):
+        # pending writes must reach the file before the application exits
+        self.flush()
+        self.settings_manager.close()
         self.blackboard.clear()
+        self.invalidate_cache()
 
     def read(self, key: str):
         return self.blackboard.get(key)
@@ -43,9 +95,65 @@ class BlackboardService(Service):
         return {key: self.blackboard.get(key) for key in keys}
 
     def write(self, key: str, value):
-        self.blackboard.set(key, value)
-        self.settings_manager.update_setting({key: value})
+        self.update({key: value})
 
     def update(self, data: dict):
-        self.blackboard.update(data)
-        self.settings_manager.update_setting(data)
+        # watchers are notified when the transaction exits, after the cached reads are dropped,
+        # so a watcher reading a setting gets the new value
+        with self.blackboard.transaction():
+            self.blackboard.update(data)
+            self.invalidate_cache(*data)
+        self._persist(data)
+
+    def _persist(self, data: dict) -> None:
+        if self.write_behind_delay is None:
+            with self._persist_lock:
+                if not self.settings_manager.update_setting(data):
+                    logger.error("Failed to persist settings.")
+            return
+
+        with self._dirty_lock:
+            self._dirty.update(data)
+            if self._flush_timer is not None:
+                # joins the pending flush
+                return
+            self._flush_timer = threading.Timer(self.write_behind_delay, self.flush)
+            self._flush_timer.name = "blackboard-flush"
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self):
+        """write the pending settings to the file now"""
+        # the persist lock is taken first, so flushes reach the file in the order of their writes
+        with self._persist_lock:
+            with self._dirty_lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                dirty, self._dirty = self._dirty, {}
+            if not dirty:
+                return
+            try:
+                persisted = self.settings_manager.update_setting(dirty)
+            except Exception:
+                logger.exception("Error persisting settings.")
+                persisted = False
+            if not persisted:
+                logger.error("Failed to persist settings, retrying with the next flush.")
+                with self._dirty_lock:
+                    # values written meanwhile are newer
+                    self._dirty = {**dirty, **self._dirty}
+
+    def watch(self, keys: Iterable[str] | None, callback: Callable[[dict], Any]) -> int:
+        """
+        Call back with {key: new value} when watched keys change, on the Tk thread.
+        @return: watch id, to unwatch
+        """
+        main_thread = EventBus.get_main_thread()
+        if main_thread is not None:
+            # writes may run on a worker thread
+            callback = functools.partial(main_thread.call, callback)
+        return self.blackboard.watch(keys, callback)
+
+    def unwatch(self, watch_id: int):
+        self.blackboard.unwatch(watch_id)
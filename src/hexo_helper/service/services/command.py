@@ -1,6 +1,8 @@
 from src.hexo_helper.common.component import (
     CommandProducer,
+    command_bus,
 )
+from src.hexo_helper.core.event import CoalesceMode, CoalescePolicy
 from src.hexo_helper.service.constants import COMMAND_REFRESH_I18N
 from src.hexo_helper.service.enum import ServiceName
 from src.hexo_helper.service.services.base import Service
@@ -11,12 +13,18 @@ class CommandService(Service):
     def get_name(cls):
         return ServiceName.COMMAND.value
 
+    @classmethod
+    def can_start_concurrently(cls) -> bool:
+        return True
+
     def __init__(self):
         super().__init__()
         self.command_producer = None
 
     def start(self):
         self.command_producer: CommandProducer = CommandProducer()
+        # several refreshes in one frame re-translate the widgets once
+        command_bus.set_coalesce_policy(COMMAND_REFRESH_I18N, CoalescePolicy(CoalesceMode.IDLE))
 
     def _get_operation_mapping(self) -> dict:
         return {
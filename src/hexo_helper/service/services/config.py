@@ -13,9 +13,15 @@ class ConfigService(Service):
     def get_name(cls):
         return ServiceName.CONFIG.value
 
+    @classmethod
+    def get_dependencies(cls) -> tuple:
+        # settings are read from the blackboard on start
+        return (ServiceName.BLACKBOARD.value,)
+
     def __init__(self):
         super().__init__()
         self.style = ttkb.Style()
+        self._watch_id = None
 
     def start(self):
         # language
@@ -28,6 +34,17 @@ class ConfigService(Service):
         if theme not in THEMES:
             theme = DEFAULT_SETTINGS.get(BlackboardKey.THEME.value)
         self.set_theme(theme)
+        # apply later changes of the settings, whoever writes them
+        self._watch_id = client_api.watch_settings(
+            (BlackboardKey.LANGUAGE.value, BlackboardKey.THEME.value), self._on_settings_changed
+        )
+
+    def _on_settings_changed(self, changes: dict):
+        if BlackboardKey.LANGUAGE.value in changes:
+            self.set_language(changes[BlackboardKey.LANGUAGE.value])
+            client_api.command_refresh_i18n()
+        if BlackboardKey.THEME.value in changes:
+            self.set_theme(changes[BlackboardKey.THEME.value])
 
     def _get_operation_mapping(self) -> dict:
         return {
@@ -36,7 +53,9 @@ class ConfigService(Service):
         }
 
     def shutdown(self):
-        pass
+        if self._watch_id is not None:
+            client_api.unwatch_settings(self._watch_id)
+            self._watch_id = None
 
     def set_language(self, language: str):
         setup_translations(language)
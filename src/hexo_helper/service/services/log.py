@@ -1,6 +1,15 @@
+import json
+import logging
+from typing import Dict, List
+
 from src.hexo_helper.core.log import LoggingManager
+from src.hexo_helper.core.log_buffer import RingBufferHandler
+from src.hexo_helper.core.metrics import CallTracer
 from src.hexo_helper.service.enum import ServiceName
 from src.hexo_helper.service.services.base import Service
+from src.hexo_helper.settings import LOG_BUFFER_CAPACITY
+
+logger = logging.getLogger(__name__)
 
 
 class LogService(Service):
@@ -9,15 +18,76 @@ class LogService(Service):
     def get_name(cls):
         return ServiceName.LOG.value
 
-    def __init__(self, logging_manager: LoggingManager):
+    @classmethod
+    def can_start_concurrently(cls) -> bool:
+        return True
+
+    def __init__(
+        self,
+        logging_manager: LoggingManager,
+        tracer: CallTracer | None = None,
+        buffer_capacity: int = LOG_BUFFER_CAPACITY,
+    ):
         super().__init__()
         self.logging_manager = logging_manager
+        self.tracer = tracer
+        self.buffer = RingBufferHandler(buffer_capacity)
 
     def start(self):
-        pass
+        # attached to the root logger itself rather than behind the queue listener,
+        # queued records reach handlers already formatted, and buffering is cheap enough to run inline
+        logging.getLogger().addHandler(self.buffer)
 
     def _get_operation_mapping(self) -> dict:
-        return {}
+        return {
+            "dump_service_stats": self.dump_service_stats,
+            "reset_service_stats": self.reset_service_stats,
+            "query_logs": self.query_logs,
+            "log_counts": self.log_counts,
+        }
+
+    def _get_thread_safe_operations(self) -> set:
+        return {"query_logs", "log_counts"}
 
     def shutdown(self):
-        pass
+        logging.getLogger().removeHandler(self.buffer)
+        self.buffer.close()
+        # queued records reach the console and the file before the application exits
+        self.logging_manager.flush()
+
+    def query_logs(
+        self,
+        level: int | str | None = None,
+        logger_name: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int | None = None,
+    ) -> List[dict]:
+        """
+        recent records, oldest first, see RingBufferHandler.query
+
+        @param level:
+            minimum level, as a number or a name like "WARNING"
+        """
+        if isinstance(level, str):
+            level_number = logging.getLevelName(level.upper())
+            if not isinstance(level_number, int):
+                raise ValueError(f"Unknown log level: {level}")
+            level = level_number
+        return self.buffer.query(level=level, logger=logger_name, since=since, until=until, limit=limit)
+
+    def log_counts(self) -> Dict[str, int]:
+        """number of recent records per level"""
+        return self.buffer.counts()
+
+    def dump_service_stats(self) -> dict:
+        """log and return the service call stats, empty if tracing is disabled"""
+        if self.tracer is None:
+            return {}
+        stats = self.tracer.snapshot()
+        logger.info(f"Service call stats: {json.dumps(stats, indent=2)}")
+        return stats
+
+    def reset_service_stats(self):
+        if self.tracer is not None:
+            self.tracer.reset()
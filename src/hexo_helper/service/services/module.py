@@ -1,11 +1,13 @@
 import tkinter
 from typing import Optional, Type
 
+from src.hexo_helper.common.component import command_bus, service_request_bus
 from src.hexo_helper.common.constants import ModuleRegistryKey
 from src.hexo_helper.common.module import (
     Module,
     get_module_registry,
 )
+from src.hexo_helper.core.event import EventBus
 from src.hexo_helper.exceptions import (
     ActivateTreeException,
     ModuleInstanceNotFoundException,
@@ -20,6 +22,15 @@ class ModuleService(Service):
     def get_name(cls):
         return ServiceName.MODULE.value
 
+    @classmethod
+    def get_dependencies(cls) -> tuple:
+        # theme and language must be applied before the first window is built,
+        # lazy services such as resource and command are started on their first request
+        return (
+            ServiceName.CONFIG.value,
+            ServiceName.BLACKBOARD.value,
+        )
+
     def _get_operation_mapping(self) -> dict:
         return {
             "activate": self.activate,
@@ -99,6 +110,23 @@ class ModuleService(Service):
 
         return current
 
+    def resolve_bus(self, bus_name: str) -> EventBus | None:
+        """
+        Live bus of a recorded bus name, to replay a recording with EventReplayer:
+        the shared service and command buses, or the internal bus of an activated module by its instance id.
+        None if the module is not activated (yet), non unique modules are numbered again in a new session.
+        """
+        for bus in (service_request_bus, command_bus):
+            if bus.name == bus_name:
+                return bus
+        if self.activated_tree is None:
+            return None
+        try:
+            instance = self.get_activated_instance(bus_name)
+        except ModuleInstanceNotFoundException:
+            return None
+        return instance.internal_bus if instance else None
+
     def activate(self, module_id: str, parent_instance_id: Optional[str]):
         """
         Dynamically activates a new module and adds it to the live tree using the shared helper.
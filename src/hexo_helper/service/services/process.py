@@ -0,0 +1,238 @@
+import functools
+import logging
+import multiprocessing
+import threading
+from abc import abstractmethod
+from multiprocessing.connection import Connection
+
+from src.hexo_helper.exceptions import (
+    ServiceProcessCrashedException,
+    ServiceProcessTimeoutException,
+)
+from src.hexo_helper.service.services.base import Service
+
+logger = logging.getLogger(__name__)
+
+# response status
+_OK = "ok"
+_BYTES = "bytes"
+_ERROR = "error"
+# sent once the worker is set up
+_READY = "ready"
+
+
+class ProcessWorker:
+    """
+    Implementation of a `ProcessService`, instantiated in the child process.
+    Operations are the public methods named by `get_operations`.
+    """
+
+    @classmethod
+    @abstractmethod
+    def get_operations(cls) -> tuple:
+        pass
+
+    def setup(self):
+        """called once in the child process before serving requests"""
+        pass
+
+
+def _serve(conn: Connection, worker_class: type[ProcessWorker]) -> None:
+    """request loop of the child process"""
+    try:
+        worker = worker_class()
+        worker.setup()
+    except Exception as e:
+        _send_error(conn, e)
+        return
+    conn.send((_READY, None))
+    operations = set(worker_class.get_operations())
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+
+        operation, args, bytes_names = request
+        for name in bytes_names:
+            args[name] = conn.recv_bytes()
+
+        try:
+            if operation not in operations:
+                raise KeyError(operation)
+            result = getattr(worker, operation)(**args)
+        except Exception as e:
+            _send_error(conn, e)
+            continue
+
+        if isinstance(result, (bytes, bytearray, memoryview)):
+            conn.send((_BYTES, None))
+            conn.send_bytes(result)
+        else:
+            conn.send((_OK, result))
+
+
+def _send_error(conn: Connection, e: Exception) -> None:
+    try:
+        conn.send((_ERROR, e))
+    except Exception:
+        # the exception itself can't be pickled
+        conn.send((_ERROR, RuntimeError(repr(e))))
+
+
+class ProcessService(Service):
+    """
+    Service whose operations run in a child process, behind the same `exec(action)` contract.
+    Bytes arguments and results skip pickling, the child process is restarted if it crashes.
+    """
+
+    def __init__(self):
+        self._process: multiprocessing.Process | None = None
+        self._conn: Connection | None = None
+        # one request/response exchange at a time on the pipe
+        self._lock = threading.Lock()
+        super().__init__()
+
+    @classmethod
+    @abstractmethod
+    def get_worker_class(cls) -> type[ProcessWorker]:
+        pass
+
+    @classmethod
+    def get_call_timeout(cls) -> float:
+        """seconds to wait for the child process to answer a call, a hung child is restarted"""
+        return 30.0
+
+    @classmethod
+    def get_startup_timeout(cls) -> float:
+        """seconds to wait for the child process to boot and set its worker up"""
+        return 60.0
+
+    @classmethod
+    def can_start_concurrently(cls) -> bool:
+        # spawning the child process is slow and does not touch Tk
+        return True
+
+    def _get_operation_mapping(self) -> dict:
+        return {
+            operation: functools.partial(self._remote_call, operation)
+            for operation in self.get_worker_class().get_operations()
+        }
+
+    def _get_thread_safe_operations(self) -> set:
+        # calls are serialized on the pipe, they never block the Tk thread when run on a worker
+        return set(self.get_worker_class().get_operations())
+
+    def start(self):
+        with self._lock:
+            self._spawn()
+
+    def shutdown(self):
+        with self._lock:
+            self._stop()
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def _spawn(self) -> None:
+        # spawn, forking a process holding a Tk interpreter is unsafe
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=_serve,
+            args=(child_conn, self.get_worker_class()),
+            name=f"service-{self.name}",
+            daemon=True,
+        )
+        process.start()
+        # close our copy of the child end, so a crash shows up as EOF
+        child_conn.close()
+        self._process = process
+        self._conn = parent_conn
+        # the call timeout only applies once the child serves requests,
+        # booting the interpreter and setting the worker up may take longer
+        timeout = self.get_startup_timeout()
+        try:
+            if not parent_conn.poll(timeout):
+                self._stop(graceful=False)
+                raise ServiceProcessTimeoutException(
+                    f"Service [{self.name}] child process was not ready within {timeout}s"
+                )
+            status, payload = parent_conn.recv()
+        except (EOFError, OSError) as e:
+            self._stop(graceful=False)
+            raise ServiceProcessCrashedException(f"Service [{self.name}] child process crashed on startup") from e
+        if status == _ERROR:
+            self._stop(graceful=False)
+            raise payload
+        logger.debug(f"Service [{self.name}] child process started, pid: {process.pid}")
+
+    def _stop(self, graceful: bool = True) -> None:
+        """
+        @param graceful:
+            let the child finish its request loop, otherwise it is terminated right away
+        """
+        if self._process is None:
+            return
+        if graceful:
+            try:
+                self._conn.send(None)
+            except OSError:
+                pass
+            self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def _restart(self, reason: str = "died") -> None:
+        logger.warning(f"Service [{self.name}] child process {reason}, restarting.")
+        if self._process is not None:
+            self._process.join(timeout=1)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+            if self._conn is not None:
+                self._conn.close()
+        self._spawn()
+
+    def _receive(self, conn: Connection, operation: str, timeout: float) -> None:
+        """wait for the next message of the child process"""
+        if not conn.poll(timeout):
+            self._restart("did not answer in time")
+            raise ServiceProcessTimeoutException(
+                f"Service [{self.name}] child process did not answer '{operation}' within {timeout}s"
+            )
+
+    def _remote_call(self, operation: str, **kwargs):
+        bytes_args = {name: value for name, value in kwargs.items() if isinstance(value, (bytes, bytearray))}
+        args = {name: value for name, value in kwargs.items() if name not in bytes_args}
+
+        with self._lock:
+            if not self.is_alive():
+                self._restart()
+            conn = self._conn
+            try:
+                conn.send((operation, args, tuple(bytes_args)))
+                for value in bytes_args.values():
+                    conn.send_bytes(value)
+                # never block on a hung child, callers may be on the Tk thread
+                timeout = self.get_call_timeout()
+                self._receive(conn, operation, timeout)
+                status, payload = conn.recv()
+                if status == _BYTES:
+                    self._receive(conn, operation, timeout)
+                    payload = conn.recv_bytes()
+            except (EOFError, OSError) as e:
+                self._restart()
+                raise ServiceProcessCrashedException(
+                    f"Service [{self.name}] child process crashed during '{operation}'"
+                ) from e
+
+        if status == _ERROR:
+            raise payload
+        return payload
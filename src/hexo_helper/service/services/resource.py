@@ -1,7 +1,8 @@
+from src.hexo_helper.core.cache import CachePolicy
 from src.hexo_helper.core.resource import ImageResourceLoader
 from src.hexo_helper.service.enum import ServiceName
 from src.hexo_helper.service.services.base import Service
-from src.hexo_helper.settings import IMAGE_PATH
+from src.hexo_helper.settings import IMAGE_CACHE_MAX_BYTES, IMAGE_PATH, PINNED_IMAGES
 
 
 class ResourceService(Service):
@@ -10,16 +11,33 @@ class ResourceService(Service):
     def get_name(cls):
         return ServiceName.RESOURCE.value
 
+    @classmethod
+    def can_start_concurrently(cls) -> bool:
+        return True
+
     def __init__(self):
         super().__init__()
         self.image_loader: ImageResourceLoader | None = None
 
     def start(self):
-        self.image_loader = ImageResourceLoader(IMAGE_PATH)
+        self.image_loader = ImageResourceLoader(IMAGE_PATH, IMAGE_CACHE_MAX_BYTES)
+        for name in PINNED_IMAGES:
+            self.image_loader.pin(name)
 
     def _get_operation_mapping(self) -> dict:
         return {
             "load_image": self.load_image,
+            "pin_image": self.pin_image,
+            "image_cache_stats": self.image_cache_stats,
+        }
+
+    def _get_thread_safe_operations(self) -> set:
+        return {"load_image", "pin_image", "image_cache_stats"}
+
+    def _get_cache_policies(self) -> dict:
+        # the loader keeps decoded images, only coalesce concurrent loads of the same image
+        return {
+            "load_image": CachePolicy(ttl=0),
         }
 
     def shutdown(self):
@@ -27,3 +45,11 @@ class ResourceService(Service):
 
     def load_image(self, name):
         return self.image_loader.load(name)
+
+    def pin_image(self, name):
+        """never evict the image from the cache"""
+        self.image_loader.pin(name)
+
+    def image_cache_stats(self) -> dict:
+        """hits, misses, evictions and size of the decoded images cache"""
+        return self.image_loader.cache_stats()
@@ -1,14 +1,51 @@
-from typing import Dict
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
 
-from src.hexo_helper.common.component import ServiceConsumer
+from src.hexo_helper.common.component import ServiceConsumer, ServiceResult
 from src.hexo_helper.common.constants import EVENT_REQUEST_SERVICE
-from src.hexo_helper.exceptions import ServiceNotFoundException
+from src.hexo_helper.core.metrics import CallTracer
+from src.hexo_helper.core.tk_dispatch import TkDispatcher
+from src.hexo_helper.exceptions import (
+    ServiceDependencyException,
+    ServiceNotFoundException,
+)
 from src.hexo_helper.service.services.base import Service
 
+logger = logging.getLogger(__name__)
+
 
 class ServiceManager:
-    def __init__(self):
-        self.services: Dict[str:Service] = {}
+    def __init__(self, main_thread: TkDispatcher | None = None, max_workers: int = 4, tracer: CallTracer | None = None):
+        """
+        @param main_thread:
+            marshals async results onto the Tk thread. Callbacks run inline if None.
+        @param max_workers:
+            size of the worker pool running thread safe operations
+        @param tracer:
+            records latency of every service call when set
+        """
+        self.main_thread = main_thread
+        self.max_workers = max_workers
+        self.tracer = tracer
+        self._executor: ThreadPoolExecutor | None = None
+        self.services: Dict[str, Service] = {}
+        # lazy services, constructed and started on first request
+        self._factories: Dict[str, Callable[[], Service]] = {}
+        # lazy services being started -> (future of the service, ident of the starting thread),
+        # threads asking for a service being started wait on its future
+        self._starting: Dict[str, Tuple[Future, int]] = {}
+        # thread ident -> name of the lazy service it waits for, to detect circular dependencies
+        self._waiting: Dict[int, str] = {}
+        # only held to look up and publish, never while a service starts
+        self._factory_lock = threading.Lock()
+        # names of the started services, in the order they finished starting, so dependencies come first
+        self._started: List[str] = []
+        self._started_lock = threading.Lock()
+        # bumped on every registration, so resolved operation handles know when to re-resolve
+        self.revision = 0
         self.consumer = ServiceConsumer()
         self._setup_handlers()
 
@@ -17,22 +54,257 @@ class ServiceManager:
 
     def register(self, service):
         self.services[service.name] = service
+        self._factories.pop(service.name, None)
+        self.revision += 1
 
-    def _on_service_requested(self, name: str, action: dict):
+    def register_factory(self, name: str, factory: Callable[[], Service], eager: bool = False):
+        """
+        Register a service by its factory.
+
+        @param name:
+            name of the service built by the factory
+        @param factory:
+            callable returning the service instance
+        @param eager:
+            construct now and start with `start_up`, otherwise the service is constructed
+            and started when it is first requested
+        """
+        if eager:
+            self.register(factory())
+            return
+        self.services.pop(name, None)
+        self._factories[name] = factory
+        self.revision += 1
+
+    def get_service(self, name: str) -> Service:
+        """
+        O(1) lookup of a registered service by name, lazy services are started on first lookup.
+        """
         service: Service | None = self.services.get(name, None)
-        if not service:
-            raise ServiceNotFoundException
+        if service is None:
+            service = self._start_lazy_service(name)
+        return service
+
+    def _start_lazy_service(self, name: str) -> Service:
+        thread = threading.get_ident()
+        with self._factory_lock:
+            # another thread may have started it meanwhile
+            service = self.services.get(name, None)
+            if service is not None:
+                return service
+            starting = self._starting.get(name, None)
+            if starting is None:
+                factory = self._factories.get(name, None)
+                if factory is None:
+                    raise ServiceNotFoundException(name)
+                future = Future()
+                self._starting[name] = (future, thread)
+            else:
+                future, owner = starting
+                self._check_circular_wait(name, owner, thread)
+                self._waiting[thread] = name
+
+        if starting is not None:
+            try:
+                return future.result()
+            finally:
+                with self._factory_lock:
+                    del self._waiting[thread]
+
+        try:
+            service = factory()
+            for dependency in service.get_dependencies():
+                self.get_service(dependency)
+            self._start_service(service)
+        except BaseException as e:
+            with self._factory_lock:
+                del self._starting[name]
+            future.set_exception(e)
+            raise
+        with self._factory_lock:
+            # publish only once started
+            self.services[name] = service
+            self._factories.pop(name, None)
+            del self._starting[name]
+        future.set_result(service)
+        return service
+
+    def _check_circular_wait(self, name: str, owner: int, thread: int) -> None:
+        """raise if the thread starting `name` waits, directly or not, for a service `thread` is starting"""
+        chain = [name]
+        while owner != thread:
+            waited = self._waiting.get(owner, None)
+            if waited is None or waited not in self._starting:
+                return
+            chain.append(waited)
+            owner = self._starting[waited][1]
+        raise ServiceDependencyException(f"Circular service dependencies: {' -> '.join(chain)}")
+
+    def _instantiate_lazy_service(self, name: str) -> Service | None:
+        """construct a lazy service without starting it, used when eager services depend on it"""
+        factory = self._factories.pop(name, None)
+        if factory is None:
+            return None
+        service = factory()
+        self.services[name] = service
+        return service
+
+    def dispatch(self, name: str, operation: str, args: dict | None = None) -> Any:
+        """
+        Direct dispatch path, used instead of broadcasting on the service request bus.
+        """
+        return self._call(self.get_service(name), operation, args)
+
+    def _call(self, service: Service, operation: str, args: dict | None) -> Any:
+        if self.tracer is None:
+            return service.call(operation, args)
+        return self.tracer.trace(service.name, operation, service.call, operation, args)
+
+    def dispatch_many(self, requests: Iterable[Tuple[str, str, dict | None]]) -> List[ServiceResult]:
+        """
+        Dispatch a batch of (name, operation, args) requests, capturing errors per request.
+        """
+        results = []
+        for name, operation, args in requests:
+            try:
+                results.append(ServiceResult(self._call(self.get_service(name), operation, args)))
+            except Exception as e:
+                results.append(ServiceResult(error=e))
+        return results
+
+    def submit(
+        self,
+        name: str,
+        operation: str,
+        args: dict | None = None,
+        callback: Callable[[Future], Any] | None = None,
+    ) -> Future:
+        """
+        Run a service operation asynchronously.
+        Operations the service declares thread safe run on the worker pool, the others run on the Tk thread.
+        `callback` receives the finished future on the Tk thread.
+        """
+        service = self.get_service(name)
+        if service.is_thread_safe(operation):
+            future = self._get_executor().submit(self._call, service, operation, args)
+        else:
+            future = Future()
+            self._run_on_main_thread(self._run_into_future, future, service, operation, args)
+
+        if callback is not None:
+            future.add_done_callback(lambda f: self._run_on_main_thread(callback, f))
+        return future
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="service")
+        return self._executor
+
+    def _run_on_main_thread(self, func: Callable, *args) -> None:
+        if self.main_thread is None:
+            func(*args)
+            return
+        self.main_thread.post(func, *args)
+
+    def _run_into_future(self, future: Future, service: Service, operation: str, args: dict | None) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(self._call(service, operation, args))
+        except Exception as e:
+            future.set_exception(e)
+
+    def resolve(self, name: str, operation: str):
+        """
+        Resolve a service operation to a callable, see `OperationHandle`.
+        """
+        func = self.get_service(name).get_operation(operation)
+        if self.tracer is None:
+            return func
+        return self.tracer.wrap(name, operation, func)
+
+    def _on_service_requested(self, name: str, action: dict):
+        service: Service = self.get_service(name)
         if not action:
             return
-        return {name: service.exec(action)}
+        if self.tracer is None:
+            return {name: service.exec(action)}
+        return {name: self.tracer.trace(name, action["operation"], service.exec, action)}
 
     def shutdown(self):
         """
         shutdown the services
         """
-        for service in self.services.values():
+        # let pending async operations finish before the services go away
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        # dependents stop before their dependencies, services never started go last
+        started = set(self._started)
+        services = [self.services[name] for name in reversed(self._started) if name in self.services]
+        services += [service for service in reversed(list(self.services.values())) if service.name not in started]
+        self._started.clear()
+        for service in services:
             service.shutdown()
 
     def start_up(self):
-        for service in self.services.values():
-            service.start()
+        """
+        Start the services following their declared dependencies.
+        Services that can start concurrently run on the worker pool, the others on the calling (Tk) thread.
+        """
+        begin = time.perf_counter()
+        pending: Dict[str, Set[str]] = {}
+        to_check = list(self.services.values())
+        while to_check:
+            service = to_check.pop()
+            dependencies = set(service.get_dependencies())
+            for dependency in dependencies - self.services.keys():
+                # eager services pull their lazy dependencies into start up
+                lazy_service = self._instantiate_lazy_service(dependency)
+                if lazy_service is None:
+                    raise ServiceDependencyException(
+                        f"Service [{service.name}] depends on unregistered service: {dependency}"
+                    )
+                to_check.append(lazy_service)
+            pending[service.name] = dependencies
+
+        running: Dict[Future, str] = {}
+        while pending or running:
+            ready = [name for name, dependencies in pending.items() if not dependencies]
+            inline = []
+            for name in ready:
+                del pending[name]
+                service = self.services[name]
+                if service.can_start_concurrently():
+                    running[self._get_executor().submit(self._start_service, service)] = name
+                else:
+                    inline.append(service)
+
+            # main thread services run while the concurrent ones are in flight
+            for service in inline:
+                self._start_service(service)
+                self._on_service_started(pending, service.name)
+            if inline:
+                continue
+
+            if not running:
+                raise ServiceDependencyException(f"Circular service dependencies: {sorted(pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                future.result()
+                self._on_service_started(pending, name)
+
+        logger.info(f"Services started in {(time.perf_counter() - begin) * 1000:.1f} ms")
+
+    def _start_service(self, service: Service) -> None:
+        begin = time.perf_counter()
+        service.start()
+        with self._started_lock:
+            self._started.append(service.name)
+        logger.info(f"Service [{service.name}] started in {(time.perf_counter() - begin) * 1000:.1f} ms")
+
+    @staticmethod
+    def _on_service_started(pending: Dict[str, Set[str]], name: str) -> None:
+        for dependencies in pending.values():
+            dependencies.discard(name)
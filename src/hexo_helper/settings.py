@@ -1,4 +1,5 @@
 import logging
+import os
 import platform
 from collections import OrderedDict
 from pathlib import Path
@@ -26,6 +27,13 @@ LOCALE_DIR = ROOT_PATH / "locale"
 BASE_DATA_DIR = Path(platformdirs.user_data_dir())
 APP_DATA_DIR = BASE_DATA_DIR / APP_NAME
 SETTINGS_FILE_PATH = APP_DATA_DIR / "settings.json"
+# seconds settings writes are coalesced before the file is written in the background, None writes through
+SETTINGS_WRITE_BEHIND_DELAY = 0.5
+# "json" rewrites the settings file on every write,
+# "journal" appends changes to a journal, compacted into the settings file past either limit
+SETTINGS_BACKEND = "json"
+SETTINGS_JOURNAL_MAX_ENTRIES = 1000
+SETTINGS_JOURNAL_MAX_BYTES = 1 << 20
 
 # --- i18n ---
 DOMAINS = ["_", "modules", "services"]
@@ -60,11 +68,49 @@ THEMES = OrderedDict(
     }
 )
 
+# --- services ---
+# worker threads running thread safe service operations
+SERVICE_WORKER_COUNT = 4
+# record call count, errors and latency per service operation, dump with the log service
+SERVICE_TRACING = os.environ.get("HEXO_HELPER_SERVICE_TRACING", "") == "1"
+
+# --- resources ---
+# decoded images kept in memory, least recently used ones are dropped past this size
+IMAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# app icons, never dropped from the images cache
+PINNED_IMAGES = ("settings.png", "info.png", "app.png")
+
+# --- asyncio ---
+# how often the asyncio loop is stepped from the Tk mainloop
+ASYNCIO_PUMP_INTERVAL_MS = 10
+
+# --- threads ---
+# calls marshalled from worker threads onto the Tk thread, run at most this many per pump tick
+MAIN_THREAD_BATCH_SIZE = 256
+# pump period, the latency target of marshalled calls
+MAIN_THREAD_INTERVAL_MS = 16
+
+# --- event recording ---
+# record every event dispatch to this NDJSON file, replay it with core.recorder.EventReplayer
+EVENT_RECORD_PATH = os.environ.get("HEXO_HELPER_EVENT_RECORD") or None
+
 # --- Log ---
 LOG_FILE_PATH = APP_DATA_DIR / "app.log"
 ROOT_LOGGER_LEVEL = logging.DEBUG
 CONSOLE_HANDLER_LEVEL = logging.INFO
 FILE_HANDLER_LEVEL = logging.DEBUG
+# console and file handlers run on a listener thread, logging only enqueues records
+LOG_USE_QUEUE = True
+# "size" rolls the log over past LOG_MAX_BYTES, "daily" at midnight; rotated logs are gzipped in the background
+LOG_ROLLOVER = "size"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+# rotated logs are deleted, oldest first, past this total size or age
+LOG_RETENTION_BYTES = 50 * 1024 * 1024
+LOG_RETENTION_DAYS = 14
+# how often the log viewer reads what was appended to the log file
+LOG_VIEWER_POLL_MS = 500
+# records kept in memory by the log service, to query without reading the log file
+LOG_BUFFER_CAPACITY = 10000
 
 try:
     from local_settings import *  # noqa
@@ -0,0 +1,68 @@
+import pytest
+
+from src.hexo_helper.core.blackboard import Blackboard
+
+
+class TestBlackboardWatch:
+    @pytest.fixture
+    def blackboard(self):
+        blackboard = Blackboard()
+        blackboard.update({"language": "en", "theme": "flatly", "open_projects": ["a"]})
+        return blackboard
+
+    def test_set_notifies_watched_key(self, blackboard, mocker):
+        callback = mocker.Mock()
+        blackboard.watch(["language"], callback)
+
+        blackboard.set("language", "zh_CN")
+
+        callback.assert_called_once_with({"language": "zh_CN"})
+
+    def test_unchanged_and_unwatched_values_are_filtered(self, blackboard, mocker):
+        callback = mocker.Mock()
+        blackboard.watch(["language", "open_projects"], callback)
+
+        blackboard.update({"language": "en", "open_projects": ["a"], "theme": "darkly"})
+
+        callback.assert_not_called()
+
+    def test_watch_all_keys(self, blackboard, mocker):
+        callback = mocker.Mock()
+        blackboard.watch(None, callback)
+
+        blackboard.update({"language": "en", "theme": "darkly", "new_key": 1})
+
+        callback.assert_called_once_with({"theme": "darkly", "new_key": 1})
+
+    def test_transaction_sends_one_batch(self, blackboard, mocker):
+        callback = mocker.Mock()
+        blackboard.watch(None, callback)
+
+        with blackboard.transaction():
+            blackboard.set("language", "zh_CN")
+            with blackboard.transaction():
+                blackboard.set("theme", "darkly")
+            # back to the value before the transaction
+            blackboard.set("language", "en")
+            callback.assert_not_called()
+
+        callback.assert_called_once_with({"theme": "darkly"})
+
+    def test_unwatch(self, blackboard, mocker):
+        callback = mocker.Mock()
+        watch_id = blackboard.watch(["language"], callback)
+
+        blackboard.unwatch(watch_id)
+        blackboard.set("language", "zh_CN")
+
+        callback.assert_not_called()
+
+    def test_failing_watcher_does_not_stop_others(self, blackboard, mocker):
+        callback = mocker.Mock()
+        blackboard.watch(["language"], mocker.Mock(side_effect=RuntimeError))
+        blackboard.watch(["language"], callback)
+
+        blackboard.set("language", "zh_CN")
+
+        assert blackboard.get("language") == "zh_CN"
+        callback.assert_called_once_with({"language": "zh_CN"})
@@ -0,0 +1,175 @@
+import threading
+import time
+
+import pytest
+
+from src.hexo_helper.core.cache import LRUCache, OperationCache, make_cache_key
+
+
+class TestOperationCache:
+    """Unit test suite for the OperationCache class."""
+
+    @pytest.fixture
+    def cache(self):
+        return OperationCache()
+
+    def test_result_is_cached(self, cache, mocker):
+        func = mocker.Mock(return_value="value")
+
+        assert cache.get_or_call("key", func, ttl=None) == "value"
+        assert cache.get_or_call("key", func, ttl=None) == "value"
+        func.assert_called_once()
+
+    def test_ttl_expires(self, cache, mocker):
+        func = mocker.Mock(side_effect=["first", "second"])
+
+        assert cache.get_or_call("key", func, ttl=0.01) == "first"
+        time.sleep(0.02)
+        assert cache.get_or_call("key", func, ttl=0.01) == "second"
+
+    def test_zero_ttl_does_not_store(self, cache, mocker):
+        func = mocker.Mock(side_effect=["first", "second"])
+
+        assert cache.get_or_call("key", func, ttl=0) == "first"
+        assert cache.get_or_call("key", func, ttl=0) == "second"
+        assert len(cache) == 0
+
+    def test_invalidate_by_tag(self, cache, mocker):
+        func = mocker.Mock(side_effect=["a1", "b1", "a2"])
+        cache.get_or_call("a", func, ttl=None, tags=("tag_a",))
+        cache.get_or_call("b", func, ttl=None, tags=("tag_b",))
+
+        cache.invalidate(["tag_a"])
+
+        assert cache.get_or_call("a", func, ttl=None, tags=("tag_a",)) == "a2"
+        assert cache.get_or_call("b", func, ttl=None, tags=("tag_b",)) == "b1"
+
+    def test_errors_are_not_cached(self, cache, mocker):
+        func = mocker.Mock(side_effect=[ValueError("boom"), "value"])
+
+        with pytest.raises(ValueError):
+            cache.get_or_call("key", func, ttl=None)
+        assert cache.get_or_call("key", func, ttl=None) == "value"
+
+    def test_concurrent_calls_are_coalesced(self, cache):
+        """identical calls in flight wait for a single execution"""
+        calls = []
+        release = threading.Event()
+
+        def slow():
+            calls.append(1)
+            release.wait(5)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_call("key", slow, ttl=0))) for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert results == ["value"] * 5
+
+    def test_invalidation_during_call_drops_result(self, cache):
+        def compute():
+            cache.invalidate(["tag"])
+            return "stale"
+
+        assert cache.get_or_call("key", compute, ttl=None, tags=("tag",)) == "stale"
+        assert len(cache) == 0
+
+    def test_call_after_invalidation_does_not_join_older_call(self, cache):
+        store = {"language": "old"}
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_read():
+            value = store["language"]
+            started.set()
+            release.wait(5)
+            return value
+
+        leader_results = []
+        leader = threading.Thread(
+            target=lambda: leader_results.append(cache.get_or_call("key", slow_read, ttl=None, tags=("language",)))
+        )
+        leader.start()
+        assert started.wait(5)
+
+        store["language"] = "new"
+        cache.invalidate(("language",))
+
+        assert cache.get_or_call("key", lambda: store["language"], ttl=None, tags=("language",)) == "new"
+        release.set()
+        leader.join(5)
+        assert leader_results == ["old"]
+        # the detached call neither stored its stale result nor dropped the fresh one
+        assert cache.get_or_call("key", lambda: "unexpected", ttl=None, tags=("language",)) == "new"
+
+    def test_make_cache_key(self):
+        assert make_cache_key("read", {"keys": {"a", "b"}}) == make_cache_key("read", {"keys": {"b", "a"}})
+        assert make_cache_key("read", {"key": "a"}) != make_cache_key("read", {"key": "b"})
+        assert make_cache_key("read", {"obj": {"nested": [1, 2]}}) is not None
+        assert make_cache_key("read", {"obj": [{1, 2}, bytearray(b"x")]}) is None
+
+
+class TestLRUCache:
+    """Unit test suite for the LRUCache class."""
+
+    @pytest.fixture
+    def cache(self):
+        return LRUCache(max_bytes=10, sizeof=len)
+
+    def test_least_recently_used_is_evicted(self, cache):
+        cache.put("a", "aaaa")
+        cache.put("b", "bbbb")
+        assert cache.get("a") == "aaaa"
+
+        cache.put("c", "cccc")
+
+        assert "b" not in cache
+        assert cache.get("a") == "aaaa"
+        assert cache.get("c") == "cccc"
+        assert cache.get("b") is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"]) == (3, 1, 1)
+        assert stats["bytes"] == 8
+
+    def test_replacing_a_value_updates_size(self, cache):
+        cache.put("a", "aaaaaaaa")
+        cache.put("a", "a")
+
+        assert cache.stats()["bytes"] == 1
+
+    def test_value_larger_than_budget_is_not_kept(self, cache):
+        cache.put("a", "aaaa")
+        cache.put("big", "x" * 11)
+
+        assert "big" not in cache
+        assert "a" in cache
+
+    def test_pinned_value_is_never_evicted(self, cache):
+        cache.pin("icon")
+        cache.put("icon", "iiiiiiii")
+        for key in "abcdef":
+            cache.put(key, "xxxx")
+
+        assert cache.get("icon") == "iiiiiiii"
+        stats = cache.stats()
+        assert stats["pinned_bytes"] == 8
+        assert stats["bytes"] == 8
+
+    def test_unpin_puts_value_back_under_budget(self, cache):
+        cache.put("icon", "iiiiii")
+        cache.pin("icon")
+        cache.put("a", "aaaaaa")
+
+        cache.unpin("icon")
+
+        assert "icon" not in cache
+        assert cache.get("a") == "aaaaaa"
@@ -0,0 +1,556 @@
+import asyncio
+import functools
+import gc
+import weakref
+
+import pytest
+
+from src.hexo_helper.core.aio import TkAsyncioPump
+from src.hexo_helper.core.event import (
+    _WILDCARD_SNAPSHOT_CACHE_SIZE,
+    AsyncEventBus,
+    CoalesceMode,
+    CoalescePolicy,
+    Consumer,
+    EventBus,
+    is_topic_pattern,
+)
+
+
+class TestEventBus:
+    """Unit test suite for the EventBus class."""
+
+    @pytest.fixture
+    def bus(self):
+        return EventBus()
+
+    def test_emit_collects_results(self, bus, mocker):
+        handler_1 = mocker.Mock(return_value="first")
+        handler_2 = mocker.Mock(return_value=None)
+        handler_3 = mocker.Mock(return_value="third")
+        for handler in (handler_1, handler_2, handler_3):
+            bus.register("event", handler)
+
+        assert bus.emit("event", 1, key="value") == ["first", "third"]
+        handler_2.assert_called_once_with(1, key="value")
+        assert bus.emit("unknown_event") == []
+
+    def test_register_is_idempotent(self, bus, mocker):
+        handler = mocker.Mock(return_value=None)
+        bus.register("event", handler)
+        bus.register("event", handler)
+
+        bus.emit("event")
+        handler.assert_called_once()
+
+    def test_handlers_keep_registration_order(self, bus):
+        calls = []
+        for i in range(5):
+            bus.register("event", lambda i=i: calls.append(i))
+
+        bus.emit("event")
+        assert calls == [0, 1, 2, 3, 4]
+
+    def test_unregister(self, bus, mocker):
+        handler = mocker.Mock()
+        bus.register("event", handler)
+        bus.unregister("event", handler)
+        # unregistering twice is a no-op
+        bus.unregister("event", handler)
+        bus.unregister("other_event", handler)
+
+        bus.emit("event")
+        handler.assert_not_called()
+        assert not bus.has_subscribers("event")
+
+    def test_unsubscribe_during_emit(self, bus):
+        """handlers removed during an emit still run for that emit, not for the next one"""
+        calls = []
+
+        def first():
+            calls.append("first")
+            bus.unregister("event", second)
+
+        def second():
+            calls.append("second")
+
+        bus.register("event", first)
+        bus.register("event", second)
+
+        bus.emit("event")
+        bus.emit("event")
+        assert calls == ["first", "second", "first"]
+
+    def test_subscribe_during_emit(self, bus):
+        calls = []
+
+        def late():
+            calls.append("late")
+
+        def first():
+            calls.append("first")
+            bus.register("event", late)
+
+        bus.register("event", first)
+
+        bus.emit("event")
+        assert calls == ["first"]
+        bus.emit("event")
+        assert calls == ["first", "first", "late"]
+
+    def test_bound_methods(self, bus):
+        class Handler:
+            def __init__(self):
+                self.count = 0
+
+            def on_event(self):
+                self.count += 1
+
+        handler = Handler()
+        bus.register("event", handler.on_event)
+        bus.register("event", handler.on_event)
+        bus.emit("event")
+        assert handler.count == 1
+
+        bus.unregister("event", handler.on_event)
+        bus.emit("event")
+        assert handler.count == 1
+
+
+class _Handler:
+    def __init__(self):
+        self.count = 0
+
+    def on_event(self):
+        self.count += 1
+
+
+class TestWeakSubscriptions:
+    """weak registrations do not keep handlers alive"""
+
+    def test_weak_bound_method_is_called(self):
+        bus = EventBus()
+        handler = _Handler()
+        bus.register("event", handler.on_event, weak=True)
+
+        bus.emit("event")
+        assert handler.count == 1
+        assert bus.subscription_report() == {"event": ["_Handler.on_event (weak)"]}
+
+    def test_dead_handler_is_pruned_on_emit(self):
+        bus = EventBus()
+        handler = _Handler()
+        bus.register("event", handler.on_event, weak=True)
+
+        del handler
+        gc.collect()
+
+        assert bus.subscription_report() == {}
+        assert bus.emit("event") == []
+        assert not bus.has_subscribers("event")
+
+    def test_weak_handler_can_be_unregistered(self):
+        bus = EventBus()
+        handler = _Handler()
+        bus.register("event", handler.on_event, weak=True)
+        # registering again is a no-op
+        bus.register("event", handler.on_event)
+
+        bus.unregister("event", handler.on_event)
+        bus.emit("event")
+        assert handler.count == 0
+
+    def test_weak_consumer_does_not_keep_owner_alive(self):
+        bus = EventBus()
+
+        class Controller:
+            def __init__(self):
+                self.consumer = Consumer(bus, weak=True)
+                self.consumer.subscribe("event", self.on_event)
+
+            def on_event(self):
+                pass
+
+        controller = Controller()
+        controller_ref = weakref.ref(controller)
+        del controller
+        gc.collect()
+
+        assert controller_ref() is None
+        bus.emit("event")
+        assert not bus.has_subscribers("event")
+
+    def test_weak_consumer_owner_is_freed_without_gc(self):
+        bus = EventBus()
+        calls = []
+
+        class Controller:
+            def __init__(self):
+                self.consumer = Consumer(bus, weak=True)
+                self.consumer.subscribe("event", self.on_event)
+
+            def on_event(self):
+                calls.append(self)
+
+        controller = Controller()
+        controller_ref = weakref.ref(controller)
+        gc.disable()
+        try:
+            del controller
+            assert controller_ref() is None
+            bus.emit("event")
+        finally:
+            gc.enable()
+        assert calls == []
+
+    def test_weak_consumer_holds_other_callables_strongly(self):
+        bus = EventBus()
+        consumer = Consumer(bus, weak=True)
+        calls = []
+        on_event = lambda: calls.append("lambda")  # noqa: E731
+        consumer.subscribe("event", on_event)
+        consumer.subscribe("event", functools.partial(calls.append, "partial"))
+        bus.register("other", lambda: calls.append("other"), weak=True)
+
+        gc.collect()
+        bus.emit("event")
+        bus.emit("other")
+
+        assert calls == ["lambda", "partial", "other"]
+        assert not any(name.endswith("(weak)") for names in bus.subscription_report().values() for name in names)
+        consumer.unsubscribe("event", on_event)
+        assert len(bus.subscription_report()["event"]) == 1
+
+    def test_weak_consumer_unsubscribe(self):
+        bus = EventBus()
+        handler = _Handler()
+        consumer = Consumer(bus, weak=True)
+        consumer.subscribe("event", handler.on_event)
+        consumer.subscribe("other", handler.on_event)
+
+        consumer.unsubscribe("event", handler.on_event)
+        assert not bus.has_subscribers("event")
+        consumer.unsubscribe_all()
+        assert bus.subscription_report() == {}
+
+
+class TestWildcardTopics:
+    """`*` matches one topic segment, `#` any number of segments"""
+
+    def test_is_topic_pattern(self):
+        assert is_topic_pattern("ui.*.clicked")
+        assert is_topic_pattern("ui.#")
+        assert not is_topic_pattern("ui.main.settings_clicked")
+        assert not is_topic_pattern("ui.main#")
+
+    @pytest.mark.parametrize(
+        "pattern, topic, matched",
+        [
+            ("ui.*", "ui.main", True),
+            ("ui.*", "ui.main.clicked", False),
+            ("ui.*", "ui", False),
+            ("ui.#", "ui", True),
+            ("ui.#", "ui.main.settings.clicked", True),
+            ("#", "anything.at.all", True),
+            ("ui.#.clicked", "ui.clicked", True),
+            ("ui.#.clicked", "ui.main.settings.clicked", True),
+            ("ui.#.clicked", "ui.main.selected", False),
+            ("*.main.#", "ui.main.settings", True),
+            ("*.main.#", "main.settings", False),
+        ],
+    )
+    def test_matching(self, pattern, topic, matched):
+        bus = EventBus()
+        bus.register(pattern, lambda: "wildcard")
+
+        assert bus.emit(topic) == (["wildcard"] if matched else [])
+        assert bus.has_subscribers(topic) is matched
+
+    def test_exact_handlers_run_before_wildcards_without_duplicates(self):
+        bus = EventBus()
+        calls = []
+
+        def handler():
+            calls.append("shared")
+
+        bus.register("ui.#", lambda: calls.append("hash"))
+        bus.register("ui.*.clicked", handler)
+        bus.register("ui.main.clicked", handler)
+        bus.register("ui.main.clicked", lambda: calls.append("exact"))
+
+        bus.emit("ui.main.clicked")
+        assert calls == ["shared", "exact", "hash"]
+
+    def test_register_and_unregister_pattern_update_cached_topics(self):
+        bus = EventBus()
+        calls = []
+
+        def handler():
+            calls.append("wildcard")
+
+        bus.register("ui.main.clicked", lambda: calls.append("exact"))
+        bus.emit("ui.main.clicked")
+        bus.emit("ui.other.clicked")
+
+        bus.register("ui.*.clicked", handler)
+        bus.emit("ui.main.clicked")
+        bus.emit("ui.other.clicked")
+
+        bus.unregister("ui.*.clicked", handler)
+        bus.emit("ui.main.clicked")
+        bus.emit("ui.other.clicked")
+
+        assert calls == ["exact", "exact", "wildcard", "wildcard", "exact"]
+        assert bus.subscription_report() == {
+            "ui.main.clicked": [
+                "TestWildcardTopics.test_register_and_unregister_pattern_update_cached_topics.<locals>.<lambda>"
+            ]
+        }
+
+    def test_dynamic_topics_keep_a_bounded_cache(self):
+        bus = EventBus()
+        progress = []
+        bus.register("worker.#", lambda value: progress.append(value))
+        bus.register("worker.done", lambda value: None)
+
+        for i in range(10000):
+            bus.emit(f"worker.progress.{i}", i)
+
+        assert len(progress) == 10000
+        assert len(bus._wildcard_snapshots) <= _WILDCARD_SNAPSHOT_CACHE_SIZE
+        assert list(bus._snapshots) == ["worker.done"]
+
+    def test_unregistered_dynamic_topics_keep_a_bounded_cache(self):
+        bus = EventBus()
+        progress = []
+        bus.register("worker.#", lambda: progress.append(1))
+
+        def handler():
+            pass
+
+        for i in range(1000):
+            bus.register(f"worker.progress.{i}", handler)
+            bus.unregister(f"worker.progress.{i}", handler)
+
+        assert bus._snapshots == {}
+        assert not bus._subscribers
+        bus.emit("worker.progress.1")
+        assert progress == [1]
+
+    def test_unregistered_pattern_prunes_the_trie(self):
+        bus = EventBus()
+
+        def handler():
+            pass
+
+        bus.register("ui.*.clicked", handler)
+        bus.register("ui.#", handler)
+        bus.unregister("ui.*.clicked", handler)
+        assert list(bus._trie.children["ui"].children) == ["#"]
+
+        bus.unregister("ui.#", handler)
+        assert bus._trie.children == {}
+
+    def test_dead_weak_wildcard_is_pruned(self):
+        bus = EventBus()
+        handler = _Handler()
+        bus.register("ui.#", handler.on_event, weak=True)
+        bus.emit("ui.main")
+        assert handler.count == 1
+
+        del handler
+        gc.collect()
+
+        assert bus.emit("ui.main") == []
+        assert bus.subscription_report() == {}
+
+
+class FakeScheduler:
+    """Collects after/after_idle callbacks like Tk, run them with run_all."""
+
+    def __init__(self):
+        self.callbacks = {}
+        self._next_id = 0
+
+    def after(self, ms, func, *args):
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        self.callbacks[after_id] = (func, args)
+        return after_id
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, after_id):
+        self.callbacks.pop(after_id, None)
+
+    def run_all(self):
+        callbacks, self.callbacks = self.callbacks, {}
+        for func, args in callbacks.values():
+            func(*args)
+
+
+class TestCoalescing:
+    """bursts of coalesced events run the handlers once per flush"""
+
+    @pytest.fixture
+    def scheduler(self):
+        return FakeScheduler()
+
+    @pytest.fixture
+    def bus(self, scheduler):
+        bus = EventBus()
+        bus.set_scheduler(scheduler)
+        return bus
+
+    def test_latest_wins(self, bus, scheduler, mocker):
+        handler = mocker.Mock()
+        bus.register("event", handler)
+        bus.set_coalesce_policy("event", CoalescePolicy(CoalesceMode.LATEST))
+
+        for i in range(5):
+            assert bus.emit("event", value=i) == []
+        handler.assert_not_called()
+
+        scheduler.run_all()
+        handler.assert_called_once_with(value=4)
+
+    def test_once_per_idle_keeps_first(self, bus, scheduler, mocker):
+        handler = mocker.Mock()
+        bus.register("event", handler)
+        bus.set_coalesce_policy("event", CoalescePolicy(CoalesceMode.IDLE))
+
+        for i in range(5):
+            bus.emit("event", i)
+        scheduler.run_all()
+        handler.assert_called_once_with(0)
+
+        # next frame
+        bus.emit("event", 5)
+        scheduler.run_all()
+        assert handler.call_count == 2
+
+    def test_debounce_restarts_timer(self, bus, scheduler, mocker):
+        handler = mocker.Mock()
+        bus.register("event", handler)
+        bus.set_coalesce_policy("event", CoalescePolicy(CoalesceMode.DEBOUNCE, 200))
+
+        bus.emit("event", 1)
+        bus.emit("event", 2)
+        assert len(scheduler.callbacks) == 1
+
+        scheduler.run_all()
+        handler.assert_called_once_with(2)
+
+    def test_other_events_are_not_coalesced(self, bus, mocker):
+        handler = mocker.Mock(return_value="result")
+        bus.register("other", handler)
+        bus.set_coalesce_policy("event", CoalescePolicy(CoalesceMode.LATEST))
+
+        assert bus.emit("other") == ["result"]
+
+    def test_without_scheduler_emits_immediately(self, mocker):
+        bus = EventBus()
+        handler = mocker.Mock()
+        bus.register("event", handler)
+        bus.set_coalesce_policy("event", CoalescePolicy(CoalesceMode.LATEST))
+
+        bus.emit("event")
+        handler.assert_called_once()
+
+    def test_cancel_pending(self, bus, scheduler, mocker):
+        handler = mocker.Mock()
+        bus.register("event", handler)
+        bus.set_coalesce_policy("event", CoalescePolicy(CoalesceMode.LATEST))
+
+        bus.emit("event")
+        bus.cancel_pending()
+        scheduler.run_all()
+        handler.assert_not_called()
+
+
+class TestConsumer:
+    def test_unsubscribe_all(self, mocker):
+        bus = EventBus()
+        consumer = Consumer(bus)
+        handler = mocker.Mock()
+        consumer.subscribe("event_a", handler)
+        consumer.subscribe("event_b", handler)
+
+        consumer.unsubscribe_all()
+
+        bus.emit("event_a")
+        bus.emit("event_b")
+        handler.assert_not_called()
+
+
+class TestAsyncEventBus:
+    """Unit test suite for the AsyncEventBus class."""
+
+    def test_emit_async_awaits_coroutines_concurrently(self):
+        bus = AsyncEventBus()
+        order = []
+
+        async def slow(value):
+            await asyncio.sleep(0.02)
+            order.append("slow")
+            return f"slow {value}"
+
+        async def fast(value):
+            order.append("fast")
+            return f"fast {value}"
+
+        def sync(value):
+            order.append("sync")
+            return f"sync {value}"
+
+        bus.register("event", slow)
+        bus.register("event", sync)
+        bus.register("event", fast)
+
+        results = asyncio.run(bus.emit_async("event", 1))
+
+        assert results == ["sync 1", "slow 1", "fast 1"]
+        assert order == ["sync", "fast", "slow"]
+
+    def test_emit_schedules_coroutines_on_loop(self):
+        loop = asyncio.new_event_loop()
+        bus = AsyncEventBus(loop)
+        calls = []
+
+        async def handler():
+            calls.append("async")
+
+        bus.register("event", handler)
+        bus.register("event", lambda: "sync")
+
+        assert bus.emit("event") == ["sync"]
+        assert calls == []
+        loop.run_until_complete(asyncio.sleep(0))
+        assert calls == ["async"]
+        loop.close()
+
+
+class TestTkAsyncioPump:
+    def test_pump_steps_loop_from_after(self, mocker):
+        root = mocker.Mock()
+        pump = TkAsyncioPump(root, interval_ms=5)
+        calls = []
+
+        async def task():
+            calls.append("started")
+            await asyncio.sleep(3600)
+
+        pump.start()
+        root.after.assert_called_once_with(5, pump._tick)
+        pump.loop.create_task(task())
+
+        # Tk calls the scheduled tick
+        pump._tick()
+        assert calls == ["started"]
+        assert root.after.call_count == 2
+
+        pump.stop()
+        asyncio.set_event_loop(None)
+        assert pump.loop.is_closed()
+        root.after_cancel.assert_called_once()
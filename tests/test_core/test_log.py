@@ -0,0 +1,73 @@
+import logging
+import sys
+import threading
+from logging.handlers import QueueHandler
+
+import pytest
+
+from src.hexo_helper.core.log import LoggingManager
+
+
+@pytest.fixture
+def restore_logging():
+    root = logging.getLogger()
+    handlers, level, excepthook = list(root.handlers), root.level, sys.excepthook
+    yield
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    sys.excepthook = excepthook
+
+
+class TestQueueLogging:
+    @pytest.fixture
+    def manager(self, tmp_path, restore_logging):
+        manager = LoggingManager(tmp_path / "app.log", logging.DEBUG, logging.CRITICAL, logging.DEBUG, use_queue=True)
+        manager.setup()
+        yield manager
+        manager.shutdown()
+
+    def test_root_logger_only_enqueues(self, manager):
+        handlers = logging.getLogger().handlers
+        assert manager.queue_handler in handlers
+        assert isinstance(manager.queue_handler, QueueHandler)
+        assert not set(manager.handlers) & set(handlers)
+
+    def test_records_are_written_on_listener_thread(self, manager, mocker):
+        threads = []
+        file_handler = manager.handlers[-1]
+        emit = file_handler.emit
+        mocker.patch.object(
+            file_handler, "emit", side_effect=lambda record: threads.append(threading.get_ident()) or emit(record)
+        )
+
+        logging.getLogger("indexer").debug("indexed %d files", 3)
+        manager.flush()
+
+        assert threads and threading.get_ident() not in threads
+        assert "indexer - DEBUG - indexed 3 files" in manager.log_file_path.read_text(encoding="utf-8")
+
+    def test_uncaught_exception_is_flushed(self, manager):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            manager._handle_uncaught_exception(*sys.exc_info())
+
+        content = manager.log_file_path.read_text(encoding="utf-8")
+        assert "CRITICAL - Uncaught exception:" in content
+        assert "ValueError: boom" in content
+
+    def test_logging_keeps_working_after_flush(self, manager):
+        manager.flush()
+        logging.getLogger("after").info("still logged")
+        manager.shutdown()
+
+        assert "still logged" in manager.log_file_path.read_text(encoding="utf-8")
+
+
+def test_direct_mode_attaches_handlers(tmp_path, restore_logging):
+    manager = LoggingManager(tmp_path / "app.log")
+    manager.setup()
+
+    assert set(manager.handlers) <= set(logging.getLogger().handlers)
+    assert manager.queue_listener is None
+    manager.shutdown()
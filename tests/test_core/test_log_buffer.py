@@ -0,0 +1,71 @@
+import logging
+
+import pytest
+
+from src.hexo_helper.core.log_buffer import RingBufferHandler
+
+
+def _record(name, level, message, created):
+    record = logging.LogRecord(name, level, __file__, 1, message, None, None)
+    record.created = created
+    return record
+
+
+class TestRingBufferHandler:
+    @pytest.fixture
+    def handler(self):
+        handler = RingBufferHandler(capacity=4)
+        for created, (name, level, message) in enumerate(
+            [
+                ("app.ui", logging.INFO, "opened"),
+                ("app.service", logging.WARNING, "slow"),
+                ("app.ui.view", logging.ERROR, "failed"),
+                ("other", logging.DEBUG, "noise"),
+            ]
+        ):
+            handler.handle(_record(name, level, message, float(created)))
+        return handler
+
+    def _messages(self, records):
+        return [record["message"] for record in records]
+
+    def test_query_all_in_order(self, handler):
+        records = handler.query()
+
+        assert self._messages(records) == ["opened", "slow", "failed", "noise"]
+        assert records[0] == {"time": 0.0, "level": "INFO", "logger": "app.ui", "message": "opened"}
+
+    def test_filters(self, handler):
+        assert self._messages(handler.query(level=logging.WARNING)) == ["slow", "failed"]
+        assert self._messages(handler.query(logger="app.ui")) == ["opened", "failed"]
+        assert self._messages(handler.query(logger="app.u")) == []
+        assert self._messages(handler.query(logger="root")) == ["opened", "slow", "failed", "noise"]
+        assert self._messages(handler.query(logger="app", level=logging.ERROR)) == ["failed"]
+        assert self._messages(handler.query(since=1.0, until=2.0)) == ["slow", "failed"]
+        assert self._messages(handler.query(limit=2)) == ["failed", "noise"]
+
+    def test_overwrites_oldest_and_prunes_indexes(self, handler):
+        handler.handle(_record("app.ui", logging.INFO, "again", 4.0))
+        handler.handle(_record("other", logging.DEBUG, "more", 5.0))
+
+        assert len(handler) == 4
+        assert self._messages(handler.query()) == ["failed", "noise", "again", "more"]
+        assert self._messages(handler.query(level=logging.WARNING)) == ["failed"]
+        assert self._messages(handler.query(logger="app.service")) == []
+        assert handler.counts() == {"DEBUG": 2, "INFO": 1, "ERROR": 1}
+
+    def test_exception_text_is_kept(self):
+        handler = RingBufferHandler(capacity=2)
+        log = logging.getLogger("test.log_buffer")
+        log.addHandler(handler)
+        try:
+            try:
+                raise RuntimeError("boom")
+            except RuntimeError:
+                log.exception("failed")
+        finally:
+            log.removeHandler(handler)
+
+        (record,) = handler.query()
+        assert record["message"].startswith("failed\nTraceback")
+        assert "RuntimeError: boom" in record["message"]
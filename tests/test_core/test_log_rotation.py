@@ -0,0 +1,150 @@
+import gzip
+import logging
+import os
+import time
+
+import pytest
+
+from src.hexo_helper.core.log_rotation import (
+    ROLLOVER_DAILY,
+    LogRotator,
+    RotatingLogFileHandler,
+)
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+
+
+class TestRotatingLogFileHandler:
+    @pytest.fixture
+    def log_path(self, tmp_path):
+        return tmp_path / "app.log"
+
+    def test_size_rollover_compresses_in_background(self, log_path):
+        handler = RotatingLogFileHandler(log_path, LogRotator(log_path), max_bytes=100)
+
+        for i in range(5):
+            handler.emit(_record(f"line {i} " + "x" * 40))
+        handler.close()
+
+        rotated = LogRotator(log_path).rotated_files()
+        assert rotated and all(path.suffix == ".gz" for path in rotated)
+        lines = log_path.read_text(encoding="utf-8").splitlines()
+        for path in rotated:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                lines += f.read().splitlines()
+        assert sorted(line.split()[1] for line in lines) == ["0", "1", "2", "3", "4"]
+
+    def test_daily_rollover_at_midnight(self, log_path, mocker):
+        log_path.write_text("yesterday\n", encoding="utf-8")
+        yesterday = time.time() - 86400
+        os.utime(log_path, (yesterday, yesterday))
+        rotator = LogRotator(log_path)
+        submit = mocker.patch.object(rotator, "submit")
+        handler = RotatingLogFileHandler(log_path, rotator, rollover=ROLLOVER_DAILY)
+
+        handler.emit(_record("today"))
+        handler.emit(_record("still today"))
+        handler.close()
+
+        submit.assert_called_once()
+        assert submit.call_args.args[0].read_text(encoding="utf-8") == "yesterday\n"
+        assert log_path.read_text(encoding="utf-8") == "today\nstill today\n"
+
+    def test_unknown_rollover(self, log_path):
+        with pytest.raises(ValueError):
+            RotatingLogFileHandler(log_path, LogRotator(log_path), rollover="hourly")
+
+
+class TestLogRotatorRetention:
+    def _make_rotated(self, log_path, stamp, size, age_days=0):
+        path = log_path.with_name(f"{log_path.name}.{stamp}.gz")
+        path.write_bytes(b"x" * size)
+        mtime = time.time() - age_days * 86400
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_total_bytes_keeps_newest(self, tmp_path):
+        log_path = tmp_path / "app.log"
+        oldest = self._make_rotated(log_path, "20260101-000000", 600)
+        older = self._make_rotated(log_path, "20260102-000000", 600)
+        newest = self._make_rotated(log_path, "20260103-000000", 600)
+
+        LogRotator(log_path, max_total_bytes=1300).apply_retention()
+
+        assert newest.exists() and older.exists()
+        assert not oldest.exists()
+
+    def test_order_with_legacy_backups(self, tmp_path):
+        log_path = tmp_path / "app.log"
+        for name in ("app.log.1", "app.log.2", "app.log.3"):
+            (tmp_path / name).write_bytes(b"x" * 600)
+        newest = self._make_rotated(log_path, "20261016-100000-1", 600)
+        self._make_rotated(log_path, "20261016-100000", 600)
+        self._make_rotated(log_path, "20261015-090000", 600)
+
+        assert [path.name for path in LogRotator(log_path).rotated_files()] == [
+            "app.log.20261016-100000-1.gz",
+            "app.log.20261016-100000.gz",
+            "app.log.20261015-090000.gz",
+            "app.log.1",
+            "app.log.2",
+            "app.log.3",
+        ]
+
+        LogRotator(log_path, max_total_bytes=1300).apply_retention()
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "app.log.20261016-100000-1.gz",
+            "app.log.20261016-100000.gz",
+        ]
+        assert newest.exists()
+
+    @staticmethod
+    def _stamp(age_days):
+        return time.strftime("%Y%m%d-%H%M%S", time.localtime(time.time() - age_days * 86400))
+
+    def test_age(self, tmp_path):
+        log_path = tmp_path / "app.log"
+        old = self._make_rotated(log_path, self._stamp(30), 10, age_days=30)
+        recent = self._make_rotated(log_path, self._stamp(1), 10, age_days=1)
+        # touched after its rollover, the name stamp is the age
+        touched = self._make_rotated(log_path, self._stamp(20), 10)
+        legacy_old = tmp_path / "app.log.2"
+        legacy_old.write_bytes(b"x")
+        mtime = time.time() - 30 * 86400
+        os.utime(legacy_old, (mtime, mtime))
+        legacy_recent = tmp_path / "app.log.1"
+        legacy_recent.write_bytes(b"x")
+
+        LogRotator(log_path, max_age_days=14).apply_retention()
+
+        assert recent.exists() and legacy_recent.exists()
+        assert not old.exists() and not touched.exists() and not legacy_old.exists()
+
+    def test_compression_keeps_the_age(self, tmp_path):
+        log_path = tmp_path / "app.log"
+        old = log_path.with_name("app.log.20200101-000000")
+        old.write_text("old", encoding="utf-8")
+        mtime = time.time() - 40 * 86400
+        os.utime(old, (mtime, mtime))
+        rotator = LogRotator(log_path, max_age_days=14)
+
+        rotator.start()
+        rotator.close()
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_leftover_uncompressed_files_are_compressed_on_start(self, tmp_path):
+        log_path = tmp_path / "app.log"
+        leftover = log_path.with_name("app.log.20260101-000000")
+        leftover.write_text("crashed before compression", encoding="utf-8")
+        rotator = LogRotator(log_path)
+
+        rotator.start()
+        rotator.close()
+
+        assert not leftover.exists()
+        with gzip.open(leftover.with_name(f"{leftover.name}.gz"), "rt", encoding="utf-8") as f:
+            assert f.read() == "crashed before compression"
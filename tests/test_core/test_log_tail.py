@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from src.hexo_helper.core.log_tail import LogTail, TailChange
+
+
+class TestLogTail:
+    @pytest.fixture
+    def log_path(self, tmp_path):
+        return tmp_path / "app.log"
+
+    def _append(self, path, text):
+        with open(path, "a", encoding="utf-8", newline="") as f:
+            f.write(text)
+
+    def test_missing_file(self, log_path):
+        tail = LogTail(log_path)
+
+        assert tail.poll() == TailChange(False, 0)
+        assert tail.get_lines(0, 10) == []
+
+    def test_only_appended_bytes_are_read(self, log_path, mocker):
+        self._append(log_path, "first\nsecond\n")
+        tail = LogTail(log_path)
+        assert tail.poll() == TailChange(False, 2)
+
+        self._append(log_path, "third\n")
+        seek = mocker.spy(tail, "_index")
+        assert tail.poll() == TailChange(False, 1)
+        assert seek.call_count == 1
+        assert tail.poll() == TailChange(False, 0)
+        assert tail.get_lines(0, 3) == ["first", "second", "third"]
+
+    def test_partial_line_waits_for_newline(self, log_path):
+        self._append(log_path, "complete\npart")
+        tail = LogTail(log_path)
+
+        assert tail.poll().added == 1
+        self._append(log_path, "ial\r\n")
+        assert tail.poll().added == 1
+        assert tail.get_lines(0, 5) == ["complete", "partial"]
+
+    def test_random_access_by_index(self, log_path):
+        self._append(log_path, "".join(f"line {i} ünïcode\n" for i in range(10000)))
+        tail = LogTail(log_path)
+        tail.poll()
+
+        assert tail.line_count == 10000
+        assert tail.get_lines(5000, 5002) == ["line 5000 ünïcode", "line 5001 ünïcode"]
+        assert tail.get_lines(9999, 20000) == ["line 9999 ünïcode"]
+
+    def test_rotation_restarts_on_new_file(self, log_path):
+        self._append(log_path, "old 1\nold 2\n")
+        tail = LogTail(log_path)
+        tail.poll()
+
+        os.replace(log_path, log_path.with_name("app.log.1"))
+        assert tail.poll() == TailChange(False, 0)
+        self._append(log_path, "new 1\n")
+
+        assert tail.poll() == TailChange(True, 1)
+        assert tail.line_count == 1
+        assert tail.get_lines(0, 5) == ["new 1"]
+
+    def test_truncation_resets(self, log_path):
+        self._append(log_path, "a long line before truncation\n")
+        tail = LogTail(log_path)
+        tail.poll()
+
+        with open(log_path, "w", encoding="utf-8") as f:
+            f.write("short\n")
+
+        assert tail.poll() == TailChange(True, 1)
+        assert tail.get_lines(0, 1) == ["short"]
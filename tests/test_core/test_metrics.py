@@ -0,0 +1,56 @@
+import pytest
+
+from src.hexo_helper.core.metrics import CallTracer, LatencyHistogram
+
+
+class TestLatencyHistogram:
+    """Unit test suite for the LatencyHistogram class."""
+
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(50) == 0.0
+        assert histogram.to_dict()["count"] == 0
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.record(0.001)
+        for _ in range(10):
+            histogram.record(0.1, failed=True)
+
+        assert histogram.count == 100
+        assert histogram.errors == 10
+        # bucket bounds grow by 20%, so the reported value is within that of the real latency
+        assert 0.001 <= histogram.percentile(50) < 0.0012
+        assert 0.001 <= histogram.percentile(90) < 0.0012
+        assert 0.1 <= histogram.percentile(95) < 0.12
+        assert 0.1 <= histogram.percentile(99) < 0.12
+
+
+class TestCallTracer:
+    """Unit test suite for the CallTracer class."""
+
+    def test_trace_records_calls_and_errors(self, mocker):
+        tracer = CallTracer()
+        func = mocker.Mock(side_effect=["ok", ValueError("boom")])
+
+        assert tracer.trace("blackboard", "read", func, key="a") == "ok"
+        with pytest.raises(ValueError):
+            tracer.trace("blackboard", "read", func, key="a")
+
+        stats = tracer.snapshot()["blackboard.read"]
+        assert stats["count"] == 2
+        assert stats["errors"] == 1
+
+    def test_wrap_and_reset(self, mocker):
+        tracer = CallTracer()
+        wrapped = tracer.wrap("resource", "load_image", mocker.Mock(return_value="image"))
+
+        assert wrapped(name="app.png") == "image"
+        assert tracer.snapshot()["resource.load_image"]["count"] == 1
+
+        tracer.reset()
+        assert tracer.snapshot() == {}
+        # wrapped operations keep recording after a reset
+        wrapped(name="app.png")
+        assert tracer.snapshot()["resource.load_image"]["count"] == 1
@@ -0,0 +1,104 @@
+import io
+import json
+
+import pytest
+
+from src.hexo_helper.core.event import EventBus
+from src.hexo_helper.core.recorder import EventRecorder, EventReplayer, find_regressions
+
+
+@pytest.fixture
+def stream():
+    yield io.StringIO()
+    EventBus.set_recorder(None)
+
+
+def _on_selected(lang_code):
+    return lang_code
+
+
+class TestEventRecorder:
+    def test_records_dispatch_and_handler_durations(self, stream):
+        bus = EventBus("main.settings")
+        bus.register("ui.main.settings.language_selected", _on_selected)
+        EventBus.set_recorder(EventRecorder(stream))
+
+        assert bus.emit("ui.main.settings.language_selected", lang_code="en") == ["en"]
+
+        record = json.loads(stream.getvalue())
+        assert record["bus"] == "main.settings"
+        assert record["event"] == "ui.main.settings.language_selected"
+        assert record["args"] == []
+        assert record["kwargs"] == {"lang_code": "en"}
+        assert record["depth"] == 0
+        [[name, micros]] = record["handlers"]
+        assert name == "_on_selected"
+        assert micros >= 0
+
+    def test_nested_emits_are_deeper(self, stream):
+        bus = EventBus("main")
+        bus.register("outer", lambda: bus.emit("inner"))
+        bus.register("inner", lambda: None)
+        EventBus.set_recorder(EventRecorder(stream))
+
+        bus.emit("outer")
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        # the inner dispatch finishes first
+        assert [(r["event"], r["depth"]) for r in records] == [("inner", 1), ("outer", 0)]
+
+    def test_unserializable_arguments_are_kept_as_repr(self, stream):
+        bus = EventBus("main")
+        EventBus.set_recorder(EventRecorder(stream))
+
+        bus.emit("event", object)
+
+        assert json.loads(stream.getvalue())["args"] == [repr(object)]
+
+
+class TestEventReplayer:
+    def test_replay_drives_top_level_events_only(self, stream):
+        calls = []
+        bus = EventBus("main")
+        bus.register("outer", lambda value: calls.append(value) or bus.emit("inner"))
+        bus.register("inner", lambda: calls.append("inner"))
+        EventBus.set_recorder(EventRecorder(stream))
+        bus.emit("outer", 1)
+        bus.emit("outer", 2)
+        EventBus.set_recorder(None)
+        calls.clear()
+
+        replayer = EventReplayer([json.loads(line) for line in stream.getvalue().splitlines()])
+        stats = replayer.replay({"main": bus}.get)
+
+        assert calls == [1, "inner", 2, "inner"]
+        assert stats["outer.TestEventReplayer.test_replay_drives_top_level_events_only.<locals>.<lambda>"]["count"] == 2
+        assert EventBus._recorder is None
+
+    def test_load_and_skip_unknown_buses(self, tmp_path, mocker):
+        path = tmp_path / "session.ndjson"
+        recorder = EventRecorder.open(path)
+        EventBus.set_recorder(recorder)
+        EventBus("closed").emit("event")
+        EventBus(None).emit("event")
+        EventBus.set_recorder(None)
+        recorder.close()
+
+        step = mocker.Mock()
+        replayer = EventReplayer.load(path)
+
+        assert len(replayer.records) == 2
+        assert replayer.replay(lambda name: None, step=step) == {}
+        step.assert_not_called()
+
+
+def test_find_regressions():
+    baseline = {"a.slow": {"p95_ms": 10.0}, "a.fast": {"p95_ms": 0.1}, "a.same": {"p95_ms": 5.0}}
+    current = {
+        "a.slow": {"p95_ms": 20.0},
+        "a.fast": {"p95_ms": 0.5},
+        "a.same": {"p95_ms": 6.0},
+        "a.new": {"p95_ms": 50.0},
+    }
+
+    assert find_regressions(baseline, current) == {"a.slow": (10.0, 20.0)}
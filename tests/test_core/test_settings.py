@@ -0,0 +1,183 @@
+import json
+import os
+
+import pytest
+
+from src.hexo_helper.core.settings import JournaledSettingsManager, SettingsManager
+
+
+class TestSettingsManager:
+    @pytest.fixture
+    def path(self, tmp_path):
+        return tmp_path / "settings.json"
+
+    def test_missing_file_loads_empty(self, path):
+        assert SettingsManager(path).load_settings() == {}
+
+    def test_load_is_cached_until_file_changes(self, path, mocker):
+        path.write_text(json.dumps({"language": "en"}), encoding="utf-8")
+        manager = SettingsManager(path)
+        spy = mocker.spy(json, "loads")
+
+        assert manager.load_settings() == {"language": "en"}
+        assert manager.load_settings() == {"language": "en"}
+        assert spy.call_count == 1
+
+        # changed externally
+        path.write_text(json.dumps({"language": "zh_CN", "theme": "darkly"}), encoding="utf-8")
+        assert manager.load_settings() == {"language": "zh_CN", "theme": "darkly"}
+        assert spy.call_count == 2
+
+    @pytest.mark.skipif(os.name != "posix", reason="file modes are POSIX")
+    def test_save_keeps_file_mode(self, path):
+        path.write_text("{}", encoding="utf-8")
+        os.chmod(path, 0o644)
+
+        SettingsManager(path).save_settings({"language": "en"})
+
+        assert path.stat().st_mode & 0o777 == 0o644
+
+    @pytest.mark.skipif(os.name != "posix", reason="file modes are POSIX")
+    def test_new_file_mode_follows_umask(self, path):
+        umask = os.umask(0o022)
+        try:
+            SettingsManager(path).save_settings({"language": "en"})
+        finally:
+            os.umask(umask)
+
+        assert path.stat().st_mode & 0o777 == 0o644
+
+    def test_save_never_changes_the_umask(self, path, mocker):
+        umask = mocker.spy(os, "umask")
+
+        SettingsManager(path).save_settings({"language": "en"})
+
+        umask.assert_not_called()
+
+    def test_loaded_settings_are_a_copy(self, path):
+        path.write_text(json.dumps({"open_projects": ["a"]}), encoding="utf-8")
+        manager = SettingsManager(path)
+
+        manager.load_settings()["open_projects"].append("b")
+
+        assert manager.load_settings() == {"open_projects": ["a"]}
+
+    def test_update_does_not_read_its_own_writes(self, path, mocker):
+        manager = SettingsManager(path)
+        spy = mocker.spy(json, "loads")
+
+        manager.update_setting({"language": "en"})
+        manager.update_setting({"theme": "darkly"})
+
+        assert spy.call_count == 0
+        assert json.loads(path.read_text(encoding="utf-8")) == {"language": "en", "theme": "darkly"}
+
+    def test_save_is_atomic(self, path, mocker):
+        manager = SettingsManager(path)
+        manager.save_settings({"language": "en"})
+        mocker.patch("src.hexo_helper.core.settings.os.replace", side_effect=OSError)
+
+        manager.save_settings({"language": "zh_CN"})
+
+        # the previous file is intact and no temporary file is left behind
+        assert json.loads(path.read_text(encoding="utf-8")) == {"language": "en"}
+        assert os.listdir(path.parent) == ["settings.json"]
+        assert manager.load_settings() == {"language": "en"}
+
+    def test_invalid_file_loads_empty(self, path):
+        path.write_text("{not json", encoding="utf-8")
+
+        assert SettingsManager(path).load_settings() == {}
+
+
+class TestJournaledSettingsManager:
+    @pytest.fixture
+    def path(self, tmp_path):
+        return tmp_path / "settings.json"
+
+    def test_updates_are_appended_and_replayed(self, path):
+        manager = JournaledSettingsManager(path)
+        manager.update_setting({"language": "en"})
+        manager.update_setting({"theme": "darkly", "language": "zh_CN"})
+        manager.close()
+
+        assert not path.exists()
+        assert len(path.with_suffix(".journal").read_text(encoding="utf-8").splitlines()) == 2
+        assert JournaledSettingsManager(path).load_settings() == {"language": "zh_CN", "theme": "darkly"}
+
+    def test_existing_settings_file_is_the_first_snapshot(self, path):
+        path.write_text(json.dumps({"language": "en", "theme": "flatly"}), encoding="utf-8")
+        manager = JournaledSettingsManager(path)
+
+        manager.update_setting({"theme": "darkly"})
+
+        assert manager.load_settings() == {"language": "en", "theme": "darkly"}
+        # the snapshot is untouched until compaction
+        assert json.loads(path.read_text(encoding="utf-8")) == {"language": "en", "theme": "flatly"}
+        manager.close()
+
+    def test_compaction_folds_journal_into_snapshot(self, path):
+        manager = JournaledSettingsManager(path, max_entries=3)
+        for i in range(4):
+            manager.update_setting({f"key_{i}": i})
+        manager.update_setting({"key_0": "last"})
+        manager.close()
+
+        assert json.loads(path.read_text(encoding="utf-8")) == {"key_0": 0, "key_1": 1, "key_2": 2, "key_3": 3}
+        assert not path.with_suffix(".journal.old").exists()
+        assert path.with_suffix(".journal").read_text(encoding="utf-8") == '{"key_0":"last"}\n'
+        assert JournaledSettingsManager(path).load_settings() == {"key_0": "last", "key_1": 1, "key_2": 2, "key_3": 3}
+
+    def test_interrupted_compaction_and_torn_line_are_recovered(self, path):
+        path.write_text(json.dumps({"language": "en"}), encoding="utf-8")
+        path.with_suffix(".journal.old").write_text('{"theme":"darkly"}\n', encoding="utf-8")
+        path.with_suffix(".journal").write_text('{"language":"zh_CN"}\n{"theme":', encoding="utf-8")
+
+        manager = JournaledSettingsManager(path)
+
+        assert manager.load_settings() == {"language": "zh_CN", "theme": "darkly"}
+        assert json.loads(path.read_text(encoding="utf-8")) == {"language": "zh_CN", "theme": "darkly"}
+        assert not path.with_suffix(".journal.old").exists()
+        assert not path.with_suffix(".journal").exists()
+        manager.close()
+
+    def test_non_object_lines_are_skipped(self, path):
+        path.with_suffix(".journal").write_text('{"language":"en"}\n3\n[["theme","darkly"]]\nnull\n', encoding="utf-8")
+
+        manager = JournaledSettingsManager(path)
+
+        assert manager.load_settings() == {"language": "en"}
+        # rewritten as a snapshot, the corrupt lines are dropped
+        assert json.loads(path.read_text(encoding="utf-8")) == {"language": "en"}
+        manager.close()
+
+    def test_update_after_torn_line_survives_reload(self, path):
+        path.write_text(json.dumps({"language": "en"}), encoding="utf-8")
+        path.with_suffix(".journal").write_text('{"theme":', encoding="utf-8")
+        manager = JournaledSettingsManager(path)
+
+        manager.update_setting({"theme": "darkly"})
+        manager.close()
+
+        assert path.with_suffix(".journal").read_text(encoding="utf-8") == '{"theme":"darkly"}\n'
+        assert JournaledSettingsManager(path).load_settings() == {"language": "en", "theme": "darkly"}
+
+    def test_update_after_torn_line_starts_a_new_line_if_snapshot_fails(self, path, mocker):
+        path.with_suffix(".journal").write_text('{"language":"en"}\n{"theme":', encoding="utf-8")
+        manager = JournaledSettingsManager(path)
+        mocker.patch.object(manager, "_write_file", return_value=False)
+
+        manager.update_setting({"theme": "darkly"})
+        manager.close()
+
+        assert JournaledSettingsManager(path).load_settings() == {"language": "en", "theme": "darkly"}
+
+    def test_save_replaces_snapshot_and_journal(self, path):
+        manager = JournaledSettingsManager(path)
+        manager.update_setting({"language": "en"})
+
+        manager.save_settings({"theme": "darkly"})
+
+        assert manager.load_settings() == {"theme": "darkly"}
+        assert not path.with_suffix(".journal").exists()
+        manager.close()
@@ -0,0 +1,128 @@
+import threading
+
+from src.hexo_helper.core.event import EventBus
+from src.hexo_helper.core.tk_dispatch import TkDispatcher
+
+
+class FakeRoot:
+    """records after calls, ticks are run by the test"""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, func, *args):
+        self.scheduled.append((ms, func, args))
+        return f"after#{len(self.scheduled)}"
+
+    def after_cancel(self, after_id):
+        pass
+
+    def tick(self):
+        ms, func, args = self.scheduled.pop(0)
+        func(*args)
+
+
+def _in_worker(func):
+    thread = threading.Thread(target=func)
+    thread.start()
+    thread.join()
+
+
+class TestTkDispatcher:
+    def test_call_on_main_thread_runs_inline(self):
+        dispatcher = TkDispatcher(FakeRoot())
+        calls = []
+
+        dispatcher.call(calls.append, 1)
+
+        assert calls == [1]
+        assert dispatcher.pending() == 0
+
+    def test_call_from_worker_is_queued_until_tick(self):
+        root = FakeRoot()
+        dispatcher = TkDispatcher(root, interval_ms=5)
+        calls = []
+
+        _in_worker(lambda: dispatcher.call(lambda: calls.append(threading.get_ident())))
+        assert calls == []
+
+        dispatcher.start()
+        assert root.scheduled[0][0] == 5
+        root.tick()
+        assert calls == [threading.get_ident()]
+        # the pump reschedules itself
+        assert len(root.scheduled) == 1
+
+    def test_tick_runs_at_most_one_batch(self):
+        root = FakeRoot()
+        dispatcher = TkDispatcher(root, batch_size=10)
+        calls = []
+
+        def produce():
+            for i in range(25):
+                dispatcher.call(calls.append, i)
+
+        _in_worker(produce)
+        dispatcher.start()
+
+        root.tick()
+        assert calls == list(range(10))
+        root.tick()
+        root.tick()
+        assert calls == list(range(25))
+
+    def test_failing_call_does_not_stall_batch(self):
+        dispatcher = TkDispatcher(FakeRoot())
+        calls = []
+
+        dispatcher.post(lambda: 1 / 0)
+        dispatcher.post(calls.append, "after")
+
+        assert dispatcher.drain() == 2
+        assert calls == ["after"]
+
+    def test_stop_runs_remaining_calls(self):
+        root = FakeRoot()
+        dispatcher = TkDispatcher(root)
+        calls = []
+        dispatcher.start()
+        dispatcher.post(calls.append, "left")
+
+        dispatcher.stop()
+
+        assert calls == ["left"]
+
+
+class TestEmitThreadsafe:
+    def teardown_method(self):
+        EventBus.bind_main_thread(None)
+
+    def test_emit_from_worker_is_marshalled(self):
+        dispatcher = TkDispatcher(FakeRoot())
+        EventBus.bind_main_thread(dispatcher)
+        bus = EventBus()
+        threads = []
+        bus.register("worker.progress", lambda value: threads.append((value, threading.get_ident())))
+
+        results = []
+        _in_worker(lambda: results.append(bus.emit_threadsafe("worker.progress", 50)))
+        assert results == [[]]
+        assert threads == []
+
+        dispatcher.drain()
+        assert threads == [(50, threading.get_ident())]
+
+    def test_emit_on_main_thread_returns_results(self):
+        EventBus.bind_main_thread(TkDispatcher(FakeRoot()))
+        bus = EventBus()
+        bus.register("event", lambda: "result")
+
+        assert bus.emit_threadsafe("event") == ["result"]
+
+    def test_emit_without_dispatcher_runs_in_caller(self):
+        bus = EventBus()
+        bus.register("event", lambda: "result")
+
+        results = []
+        _in_worker(lambda: results.append(bus.emit_threadsafe("event")))
+        assert results == [["result"]]
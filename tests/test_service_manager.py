@@ -1,8 +1,15 @@
 # flake8: noqa
+import threading
+
 import pytest
 
+from src.hexo_helper.common.component import ServiceRequestProducer
 from src.hexo_helper.common.constants import EVENT_REQUEST_SERVICE
-from src.hexo_helper.exceptions import ServiceNotFoundException
+from src.hexo_helper.core.metrics import CallTracer
+from src.hexo_helper.exceptions import (
+    ServiceDependencyException,
+    ServiceNotFoundException,
+)
 from src.hexo_helper.services_manager import ServiceManager
 
 
@@ -12,7 +19,9 @@ class TestServiceManager:
         """fixture to mock ServiceConsumer"""
         mock_consumer_instance = mocker.Mock()
         mocker.patch("src.hexo_helper.services_manager.ServiceConsumer", return_value=mock_consumer_instance)
-        return mock_consumer_instance
+        yield mock_consumer_instance
+        # the global client API must not keep a test manager bound
+        ServiceRequestProducer.unbind_dispatcher()
 
     def test_initialization(self, mock_consumer):
         """init"""
@@ -83,6 +92,9 @@ class TestServiceManager:
         manager = ServiceManager()
         mock_service_1 = mocker.Mock(name="service1")
         mock_service_2 = mocker.Mock(name="service2")
+        for mock_service in (mock_service_1, mock_service_2):
+            mock_service.get_dependencies.return_value = ()
+            mock_service.can_start_concurrently.return_value = False
         manager.register(mock_service_1)
         manager.register(mock_service_2)
 
@@ -103,3 +115,333 @@ class TestServiceManager:
 
         mock_service_1.shutdown.assert_called_once()
         mock_service_2.shutdown.assert_called_once()
+
+    def test_dispatch_calls_service_directly(self, mock_consumer, mocker):
+        """direct dispatch skips the action envelope"""
+        manager = ServiceManager()
+        mock_service = mocker.Mock()
+        mock_service.name = "direct_service"
+        mock_service.call.return_value = "direct_result"
+        manager.register(mock_service)
+
+        result = manager.dispatch("direct_service", "do_something", {"id": 1})
+
+        mock_service.call.assert_called_once_with("do_something", {"id": 1})
+        mock_service.exec.assert_not_called()
+        assert result == "direct_result"
+
+    def test_dispatch_not_found_raises_exception(self, mock_consumer):
+        manager = ServiceManager()
+        with pytest.raises(ServiceNotFoundException):
+            manager.dispatch("non_existent_service", "do_nothing")
+
+    def test_producer_uses_bound_manager(self, mock_consumer, mocker):
+        """client calls resolve through the manager instead of the bus"""
+        manager = ServiceManager()
+        ServiceRequestProducer.bind_dispatcher(manager)
+        mock_service = mocker.Mock()
+        mock_service.name = "bound_service"
+        mock_service.call.return_value = "bound_result"
+        manager.register(mock_service)
+        producer = ServiceRequestProducer()
+        send_event = mocker.patch.object(producer, "send_event")
+
+        assert producer.call("bound_service", "do_something", unique_response=True, id=1) == "bound_result"
+        assert producer.call("bound_service", "do_something", id=1) == ["bound_result"]
+        send_event.assert_not_called()
+
+    def test_manager_is_bound_explicitly(self, mock_consumer):
+        """building a manager leaves the global client API alone"""
+        manager = ServiceManager()
+        assert ServiceRequestProducer._dispatcher is None
+
+        ServiceRequestProducer.bind_dispatcher(manager)
+        # another manager's unbinding doesn't unbind this one
+        ServiceRequestProducer.unbind_dispatcher(ServiceManager())
+        assert ServiceRequestProducer._dispatcher is manager
+        ServiceRequestProducer.unbind_dispatcher(manager)
+        assert ServiceRequestProducer._dispatcher is None
+
+    def test_producer_broadcast_mode(self, mock_consumer, mocker):
+        """broadcast keeps the event bus behavior"""
+        ServiceManager()
+        producer = ServiceRequestProducer()
+        send_event = mocker.patch.object(
+            producer, "send_event", return_value=[{"other_service": 0}, {"bus_service": "bus_result"}]
+        )
+
+        result = producer.call("bus_service", "do_something", unique_response=True, broadcast=True, id=1)
+
+        send_event.assert_called_once_with(
+            EVENT_REQUEST_SERVICE, name="bus_service", action={"operation": "do_something", "args": {"id": 1}}
+        )
+        assert result == "bus_result"
+
+    def test_operation_handle_resolves_once(self, mock_consumer, mocker):
+        """a handle resolves the operation once and reuses it"""
+        manager = ServiceManager()
+        ServiceRequestProducer.bind_dispatcher(manager)
+        mock_service = mocker.Mock()
+        mock_service.name = "handle_service"
+        mock_service.get_operation.return_value = mocker.Mock(return_value="handle_result")
+        manager.register(mock_service)
+
+        handle = ServiceRequestProducer().handle("handle_service", "read")
+        assert handle(key="a") == "handle_result"
+        assert handle(key="b") == "handle_result"
+
+        mock_service.get_operation.assert_called_once_with("read")
+        mock_service.get_operation.return_value.assert_called_with(key="b")
+
+    def test_operation_handle_invalidated_on_register(self, mock_consumer, mocker):
+        """re-registering a service makes handles resolve again"""
+        manager = ServiceManager()
+        ServiceRequestProducer.bind_dispatcher(manager)
+        old_service = mocker.Mock()
+        old_service.name = "handle_service"
+        old_service.get_operation.return_value = mocker.Mock(return_value="old")
+        manager.register(old_service)
+
+        handle = ServiceRequestProducer().handle("handle_service", "read")
+        assert handle() == "old"
+
+        new_service = mocker.Mock()
+        new_service.name = "handle_service"
+        new_service.get_operation.return_value = mocker.Mock(return_value="new")
+        manager.register(new_service)
+
+        assert handle() == "new"
+
+    def test_dispatch_many_captures_errors_per_item(self, mock_consumer, mocker):
+        """batched requests keep their order and do not stop on a failure"""
+        manager = ServiceManager()
+        mock_service = mocker.Mock()
+        mock_service.name = "batch_service"
+        mock_service.call.side_effect = ["first", ValueError("boom"), "third"]
+        manager.register(mock_service)
+
+        results = manager.dispatch_many(
+            [
+                ("batch_service", "op", {"i": 1}),
+                ("batch_service", "op", {"i": 2}),
+                ("missing_service", "op", None),
+                ("batch_service", "op", None),
+            ]
+        )
+
+        assert [result.value for result in results] == ["first", None, None, "third"]
+        assert isinstance(results[1].error, ValueError)
+        assert isinstance(results[2].error, ServiceNotFoundException)
+        assert results[0].ok and results[3].ok
+        with pytest.raises(ValueError):
+            results[1].unwrap()
+
+    def test_submit_thread_safe_operation_runs_on_worker(self, mock_consumer, mocker):
+        """thread safe operations run on the worker pool"""
+        manager = ServiceManager()
+        mock_service = mocker.Mock()
+        mock_service.name = "async_service"
+        mock_service.is_thread_safe.return_value = True
+        mock_service.call.side_effect = lambda operation, args: threading.current_thread().name
+        manager.register(mock_service)
+
+        future = manager.submit("async_service", "op", {"i": 1})
+
+        assert future.result(timeout=5).startswith("service")
+        manager.shutdown()
+
+    def test_submit_delivers_callback_on_tk_loop(self, mock_consumer, mocker):
+        """operations that are not thread safe run on the Tk thread, callbacks are marshalled there too"""
+        main_thread = mocker.Mock()
+        main_thread.post.side_effect = lambda func, *args: func(*args)
+        manager = ServiceManager(main_thread)
+        mock_service = mocker.Mock()
+        mock_service.name = "async_service"
+        mock_service.is_thread_safe.return_value = False
+        mock_service.call.return_value = "async_result"
+        manager.register(mock_service)
+        callback = mocker.Mock()
+
+        future = manager.submit("async_service", "op", None, callback)
+
+        assert future.result(timeout=5) == "async_result"
+        callback.assert_called_once_with(future)
+        assert main_thread.post.call_count == 2
+
+    @staticmethod
+    def _make_startable(mocker, name, dependencies=(), concurrent=False, started=None):
+        service = mocker.Mock()
+        service.name = name
+        service.get_dependencies.return_value = dependencies
+        service.can_start_concurrently.return_value = concurrent
+        if started is not None:
+            service.start.side_effect = lambda: started.append((name, threading.current_thread().name))
+        return service
+
+    def test_startup_follows_dependencies(self, mock_consumer, mocker):
+        """dependents start after their prerequisites, independent services start on the worker pool"""
+        manager = ServiceManager()
+        started = []
+        manager.register(self._make_startable(mocker, "ui", ("config", "resource"), started=started))
+        manager.register(self._make_startable(mocker, "config", ("blackboard",), started=started))
+        manager.register(self._make_startable(mocker, "resource", concurrent=True, started=started))
+        manager.register(self._make_startable(mocker, "blackboard", concurrent=True, started=started))
+
+        manager.start_up()
+        manager.shutdown()
+
+        order = [name for name, _ in started]
+        assert sorted(order) == ["blackboard", "config", "resource", "ui"]
+        assert order.index("blackboard") < order.index("config") < order.index("ui")
+        assert order.index("resource") < order.index("ui")
+        threads = dict(started)
+        assert threads["blackboard"].startswith("service")
+        assert threads["config"] == threading.current_thread().name
+
+    def test_shutdown_reverses_start_order(self, mock_consumer, mocker):
+        """dependents, including lazily started ones, shut down before their dependencies"""
+        manager = ServiceManager()
+        stopped = []
+        services = {
+            "config": self._make_startable(mocker, "config", ("blackboard",)),
+            "blackboard": self._make_startable(mocker, "blackboard", concurrent=True),
+            "command": self._make_startable(mocker, "command", ("config",)),
+            "idle": self._make_startable(mocker, "idle"),
+        }
+        for name, service in services.items():
+            service.shutdown.side_effect = lambda name=name: stopped.append(name)
+        manager.register(services["config"])
+        manager.register(services["blackboard"])
+        manager.register_factory("command", lambda: services["command"])
+        manager.register_factory("idle", lambda: services["idle"])
+
+        manager.start_up()
+        manager.get_service("command")
+        manager.shutdown()
+
+        assert stopped == ["command", "config", "blackboard"]
+
+    def test_startup_missing_dependency_raises_exception(self, mock_consumer, mocker):
+        manager = ServiceManager()
+        manager.register(self._make_startable(mocker, "config", ("blackboard",)))
+        with pytest.raises(ServiceDependencyException):
+            manager.start_up()
+
+    def test_startup_circular_dependency_raises_exception(self, mock_consumer, mocker):
+        manager = ServiceManager()
+        manager.register(self._make_startable(mocker, "a", ("b",)))
+        manager.register(self._make_startable(mocker, "b", ("a",)))
+        with pytest.raises(ServiceDependencyException):
+            manager.start_up()
+
+    def test_lazy_service_started_on_first_request(self, mock_consumer, mocker):
+        """lazy services are built and started when first requested"""
+        manager = ServiceManager()
+        lazy_service = self._make_startable(mocker, "lazy_service")
+        lazy_service.call.return_value = "lazy_result"
+        factory = mocker.Mock(return_value=lazy_service)
+        manager.register_factory("lazy_service", factory)
+
+        manager.start_up()
+        factory.assert_not_called()
+        assert "lazy_service" not in manager.services
+
+        assert manager.dispatch("lazy_service", "op") == "lazy_result"
+        assert manager.dispatch("lazy_service", "op") == "lazy_result"
+        factory.assert_called_once()
+        lazy_service.start.assert_called_once()
+        assert manager.services["lazy_service"] is lazy_service
+
+    def test_lazy_circular_dependency_raises_exception(self, mock_consumer, mocker):
+        manager = ServiceManager()
+        manager.register_factory("a", lambda: self._make_startable(mocker, "a", ("b",)))
+        manager.register_factory("b", lambda: self._make_startable(mocker, "b", ("a",)))
+
+        with pytest.raises(ServiceDependencyException):
+            manager.get_service("a")
+        assert "a" not in manager.services and "b" not in manager.services
+
+    def test_lazy_circular_dependency_across_threads_raises_exception(self, mock_consumer, mocker):
+        manager = ServiceManager()
+        building = threading.Barrier(2, timeout=5)
+
+        def factory(name, dependency):
+            building.wait()
+            return self._make_startable(mocker, name, (dependency,))
+
+        manager.register_factory("a", lambda: factory("a", "b"))
+        manager.register_factory("b", lambda: factory("b", "a"))
+        errors = []
+
+        def get(name):
+            try:
+                manager.get_service(name)
+            except ServiceDependencyException as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=get, args=(name,)) for name in ("a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert not any(thread.is_alive() for thread in threads)
+        assert len(errors) == 2
+
+    def test_slow_lazy_start_does_not_block_other_services(self, mock_consumer, mocker):
+        manager = ServiceManager()
+        starting = threading.Event()
+        release = threading.Event()
+        slow_service = self._make_startable(mocker, "slow")
+        slow_service.start.side_effect = lambda: starting.set() or release.wait(5)
+        manager.register_factory("slow", mocker.Mock(return_value=slow_service))
+        fast_service = self._make_startable(mocker, "fast")
+        manager.register_factory("fast", lambda: fast_service)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(manager.get_service("slow"))) for _ in range(2)]
+        threads[0].start()
+        assert starting.wait(5)
+        threads[1].start()
+
+        assert manager.get_service("fast") is fast_service
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        assert results == [slow_service, slow_service]
+        slow_service.start.assert_called_once()
+
+    def test_eager_factory_builds_immediately(self, mock_consumer, mocker):
+        manager = ServiceManager()
+        eager_service = self._make_startable(mocker, "eager_service")
+        manager.register_factory("eager_service", lambda: eager_service, eager=True)
+
+        assert manager.services["eager_service"] is eager_service
+        manager.start_up()
+        eager_service.start.assert_called_once()
+
+    def test_eager_service_pulls_lazy_dependency_into_start_up(self, mock_consumer, mocker):
+        manager = ServiceManager()
+        started = []
+        manager.register(self._make_startable(mocker, "config", ("blackboard",), started=started))
+        manager.register_factory("blackboard", lambda: self._make_startable(mocker, "blackboard", started=started))
+
+        manager.start_up()
+
+        assert [name for name, _ in started] == ["blackboard", "config"]
+
+    def test_tracer_records_dispatched_calls(self, mock_consumer, mocker):
+        tracer = CallTracer()
+        manager = ServiceManager(tracer=tracer)
+        mock_service = mocker.Mock()
+        mock_service.name = "traced_service"
+        mock_service.get_operation.return_value = mocker.Mock(return_value="handle_result")
+        manager.register(mock_service)
+
+        manager.dispatch("traced_service", "op")
+        manager._on_service_requested(name="traced_service", action={"operation": "op"})
+        manager.resolve("traced_service", "other_op")()
+
+        stats = tracer.snapshot()
+        assert stats["traced_service.op"]["count"] == 2
+        assert stats["traced_service.other_op"]["count"] == 1
@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+
+import pytest
+
+from src.hexo_helper.core.settings import SettingsManager
+from src.hexo_helper.service.services.blackboard import BlackboardService
+
+
+class TestWriteBehind:
+    @pytest.fixture
+    def settings_manager(self, mocker):
+        manager = mocker.Mock()
+        manager.load_settings.return_value = {}
+        manager.update_setting.return_value = True
+        mocker.patch("src.hexo_helper.service.services.blackboard.SettingsManager", return_value=manager)
+        return manager
+
+    def test_write_through_without_delay(self, settings_manager):
+        service = BlackboardService(write_behind_delay=None)
+
+        service.write("language", "en")
+
+        settings_manager.update_setting.assert_called_once_with({"language": "en"})
+
+    def test_writes_are_coalesced_into_one_flush(self, settings_manager):
+        flushed = threading.Event()
+        settings_manager.update_setting.side_effect = lambda data: flushed.set() or True
+        service = BlackboardService(write_behind_delay=0.05)
+
+        service.write("language", "en")
+        service.update({"theme": "darkly", "language": "zh_CN"})
+        service.write("selected_project", "blog")
+
+        # readable before the file is written
+        assert service.read("language") == "zh_CN"
+        settings_manager.update_setting.assert_not_called()
+        assert flushed.wait(timeout=5)
+        settings_manager.update_setting.assert_called_once_with(
+            {"language": "zh_CN", "theme": "darkly", "selected_project": "blog"}
+        )
+
+    def test_shutdown_forces_flush(self, settings_manager):
+        service = BlackboardService(write_behind_delay=60)
+
+        service.write("language", "en")
+        service.shutdown()
+
+        settings_manager.update_setting.assert_called_once_with({"language": "en"})
+        assert service._flush_timer is None
+
+    def test_failed_flush_is_retried(self, tmp_path, mocker):
+        path = tmp_path / "settings.json"
+        mocker.patch(
+            "src.hexo_helper.service.services.blackboard.SettingsManager", return_value=SettingsManager(path)
+        )
+        service = BlackboardService(write_behind_delay=60)
+        real_replace = os.replace
+        replace = mocker.patch("src.hexo_helper.core.settings.os.replace", side_effect=OSError)
+
+        service.write("language", "zh_CN")
+        service.flush()
+        assert not path.exists()
+
+        replace.side_effect = real_replace
+        service.write("theme", "darkly")
+        service.flush()
+
+        assert json.loads(path.read_text(encoding="utf-8")) == {"language": "zh_CN", "theme": "darkly"}
+        assert not list(tmp_path.glob("*.tmp"))
+
+
+class TestWatch:
+    @pytest.fixture
+    def service(self, mocker):
+        manager = mocker.Mock()
+        manager.load_settings.return_value = {"language": "en"}
+        mocker.patch("src.hexo_helper.service.services.blackboard.SettingsManager", return_value=manager)
+        mocker.patch("src.hexo_helper.core.event.EventBus.get_main_thread", return_value=None)
+        service = BlackboardService(write_behind_delay=None)
+        service.start()
+        return service
+
+    def test_watcher_reads_new_value(self, service):
+        seen = []
+        service.call(
+            "watch",
+            {"keys": ["language"], "callback": lambda changes: seen.append(service.call("read", {"key": "language"}))},
+        )
+        # cached before the write
+        assert service.call("read", {"key": "language"}) == "en"
+
+        service.call("write", {"key": "language", "value": "zh-cn"})
+
+        assert seen == ["zh-cn"]
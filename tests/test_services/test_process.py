@@ -0,0 +1,130 @@
+import os
+import time
+
+import pytest
+
+from src.hexo_helper.exceptions import (
+    ServiceProcessCrashedException,
+    ServiceProcessTimeoutException,
+)
+from src.hexo_helper.service.services.process import ProcessService, ProcessWorker
+
+
+class EchoWorker(ProcessWorker):
+    """Worker used by the tests, it must be importable from the child process."""
+
+    @classmethod
+    def get_operations(cls) -> tuple:
+        return ("pid", "upper", "reverse_bytes", "fail", "crash", "hang")
+
+    def pid(self):
+        return os.getpid()
+
+    def upper(self, text: str):
+        return text.upper()
+
+    def reverse_bytes(self, data: bytes, prefix: str = ""):
+        return prefix.encode() + bytes(reversed(data))
+
+    def fail(self):
+        raise ValueError("worker error")
+
+    def crash(self):
+        os._exit(1)
+
+    def hang(self):
+        time.sleep(60)
+
+
+class EchoService(ProcessService):
+    @classmethod
+    def get_name(cls):
+        return "echo"
+
+    @classmethod
+    def get_worker_class(cls):
+        return EchoWorker
+
+
+class SlowSetupWorker(EchoWorker):
+    def setup(self):
+        time.sleep(1)
+
+
+class FailingSetupWorker(EchoWorker):
+    def setup(self):
+        raise ValueError("setup error")
+
+
+class ImpatientEchoService(EchoService):
+    """the call timeout is shorter than the worker setup, which must not count against it"""
+
+    @classmethod
+    def get_worker_class(cls):
+        return SlowSetupWorker
+
+    @classmethod
+    def get_call_timeout(cls) -> float:
+        return 0.5
+
+
+class FailingSetupService(EchoService):
+    @classmethod
+    def get_worker_class(cls):
+        return FailingSetupWorker
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = EchoService()
+    service.start()
+    yield service
+    service.shutdown()
+
+
+class TestProcessService:
+    """
+    Test suite for ProcessService, running a real child process.
+    """
+
+    def test_runs_in_child_process(self, service):
+        assert service.exec({"operation": "pid"}) != os.getpid()
+        assert service.exec({"operation": "upper", "args": {"text": "hexo"}}) == "HEXO"
+
+    def test_bytes_payload(self, service):
+        assert service.call("reverse_bytes", {"data": b"abc", "prefix": ">"}) == b">cba"
+
+    def test_worker_exception_is_raised(self, service):
+        with pytest.raises(ValueError):
+            service.call("fail")
+        # the child keeps serving
+        assert service.call("upper", {"text": "ok"}) == "OK"
+
+    def test_restart_on_crash(self, service):
+        old_pid = service.call("pid")
+        with pytest.raises(ServiceProcessCrashedException):
+            service.call("crash")
+        assert service.is_alive()
+        assert service.call("pid") != old_pid
+
+    def test_operations_are_thread_safe(self, service):
+        assert service.is_thread_safe("upper")
+        assert service.can_start_concurrently()
+
+    def test_restart_on_timeout(self):
+        service = ImpatientEchoService()
+        service.start()
+        try:
+            old_pid = service.call("pid")
+            with pytest.raises(ServiceProcessTimeoutException):
+                service.call("hang")
+            assert service.is_alive()
+            assert service.call("pid") != old_pid
+        finally:
+            service.shutdown()
+
+    def test_setup_error_is_raised_on_start(self):
+        service = FailingSetupService()
+        with pytest.raises(ValueError):
+            service.start()
+        assert not service.is_alive()
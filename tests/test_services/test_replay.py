@@ -0,0 +1,134 @@
+import io
+import json
+import tkinter as tk
+
+import pytest
+import ttkbootstrap as ttkb
+
+import src.hexo_helper.service.modules  # noqa
+from src.hexo_helper.common.component import (
+    ServiceRequestProducer,
+    command_bus,
+    service_request_bus,
+)
+from src.hexo_helper.core.event import EventBus
+from src.hexo_helper.core.recorder import EventRecorder, EventReplayer
+from src.hexo_helper.i18n import setup_translations
+from src.hexo_helper.service.constants import (
+    CLOSE_WINDOW_CLICKED,
+    MAIN_SETTINGS_APPLY_CLICKED,
+    MAIN_SETTINGS_CLICKED,
+    MAIN_SETTINGS_LANGUAGE_SELECTED,
+    MAIN_SETTINGS_THEME_SELECTED,
+    MODULE_MAIN,
+    MODULE_MAIN_SETTINGS,
+)
+from src.hexo_helper.service.enum import ServiceName
+from src.hexo_helper.service.services.blackboard import BlackboardService
+from src.hexo_helper.service.services.command import CommandService
+from src.hexo_helper.service.services.config import ConfigService
+from src.hexo_helper.service.services.module import ModuleService
+from src.hexo_helper.service.services.resource import ResourceService
+from src.hexo_helper.services_manager import ServiceManager
+from src.hexo_helper.settings import DEFAULT_SETTINGS
+
+
+class TestResolveBus:
+    @pytest.fixture
+    def module_service(self, mocker):
+        settings = mocker.Mock(children={})
+        main = mocker.Mock(children={"settings": settings})
+        main.get_id.return_value = MODULE_MAIN
+        service = ModuleService(mocker.Mock())
+        service.activated_tree = main
+        return service, main, settings
+
+    def test_module_and_shared_buses(self, module_service):
+        service, main, settings = module_service
+
+        assert service.resolve_bus(MODULE_MAIN) is main.internal_bus
+        assert service.resolve_bus(MODULE_MAIN_SETTINGS) is settings.internal_bus
+        assert service.resolve_bus(service_request_bus.name) is service_request_bus
+        assert service.resolve_bus(command_bus.name) is command_bus
+
+    def test_inactive_modules_resolve_to_none(self, module_service):
+        service, _, _ = module_service
+
+        assert service.resolve_bus(f"{MODULE_MAIN}.logs") is None
+        assert service.resolve_bus("other.settings") is None
+        service.activated_tree = None
+        assert service.resolve_bus(MODULE_MAIN) is None
+
+
+class TestReplaySettingsSession:
+    """records a settings session on a withdrawn root, then replays it against the live module tree"""
+
+    @pytest.fixture
+    def app(self, tmp_path, mocker):
+        try:
+            root = ttkb.Window()
+        except tk.TclError:
+            pytest.skip("no display")
+        root.withdraw()
+        mocker.patch("src.hexo_helper.service.services.blackboard.SETTINGS_FILE_PATH", tmp_path / "settings.json")
+
+        manager = ServiceManager()
+        ServiceRequestProducer.bind_dispatcher(manager)
+        manager.register_factory(
+            BlackboardService.get_name(), lambda: BlackboardService(write_behind_delay=None), eager=True
+        )
+        manager.register_factory(ResourceService.get_name(), ResourceService)
+        manager.register_factory(ConfigService.get_name(), ConfigService, eager=True)
+        manager.register_factory(ModuleService.get_name(), lambda: ModuleService(root), eager=True)
+        manager.register_factory(CommandService.get_name(), CommandService)
+        manager.start_up()
+        root.update()
+        yield root, manager
+
+        EventBus.set_recorder(None)
+        module_service = manager.get_service(ServiceName.MODULE.value)
+        if module_service.activated_tree is not None:
+            # destroys the root
+            module_service.deactivate(MODULE_MAIN)
+        manager.shutdown()
+        ServiceRequestProducer.unbind_dispatcher(manager)
+        setup_translations(DEFAULT_SETTINGS["language"])
+
+    def _session(self, root, module_service):
+        def click(instance_id, event_name, **kwargs):
+            module_service.resolve_bus(instance_id).emit(event_name, **kwargs)
+            # runs the coalesced selections like the Tk loop would
+            root.update()
+
+        click(MODULE_MAIN, MAIN_SETTINGS_CLICKED)
+        click(MODULE_MAIN_SETTINGS, MAIN_SETTINGS_LANGUAGE_SELECTED, lang_code="zh-cn")
+        click(MODULE_MAIN_SETTINGS, MAIN_SETTINGS_THEME_SELECTED, theme_code="darkly")
+        click(MODULE_MAIN_SETTINGS, MAIN_SETTINGS_APPLY_CLICKED)
+        click(MODULE_MAIN_SETTINGS, CLOSE_WINDOW_CLICKED)
+
+    def test_record_and_replay(self, app):
+        root, manager = app
+        module_service = manager.get_service(ServiceName.MODULE.value)
+        stream = io.StringIO()
+        EventBus.set_recorder(EventRecorder(stream))
+        self._session(root, module_service)
+        EventBus.set_recorder(None)
+        # back to the settings the session started from, so the replay changes them again
+        manager.dispatch(ServiceName.BLACKBOARD.value, "update", {"data": dict(DEFAULT_SETTINGS)})
+        root.update()
+
+        replayer = EventReplayer([json.loads(line) for line in stream.getvalue().splitlines()])
+        stats = replayer.replay(module_service.resolve_bus, step=root.update)
+
+        assert [record["event"] for record in replayer.top_level_records()] == [
+            MAIN_SETTINGS_CLICKED,
+            MAIN_SETTINGS_LANGUAGE_SELECTED,
+            MAIN_SETTINGS_THEME_SELECTED,
+            MAIN_SETTINGS_APPLY_CLICKED,
+            CLOSE_WINDOW_CLICKED,
+        ]
+        # the settings module opened by the replay received the recorded events
+        assert stats[f"{MAIN_SETTINGS_LANGUAGE_SELECTED}.SettingsController._on_language_selected"]["count"] == 1
+        assert stats[f"{MAIN_SETTINGS_APPLY_CLICKED}.SettingsController._on_apply_clicked"]["count"] == 1
+        assert manager.dispatch(ServiceName.BLACKBOARD.value, "read", {"key": "language"}) == "zh-cn"
+        assert module_service.resolve_bus(MODULE_MAIN_SETTINGS) is None